@@ -0,0 +1,100 @@
+"""
+Batch Benchmark - Post scoring and folding throughput of the process pool as workers are added
+Builds a seeded corpus of post code arrays (Zipfian topics over a year of
+timestamps) with encoded post text (lexicon words, top keywords and filler
+tokens), scores and folds it with batch.fold_posts at each worker count,
+checks the result against the single-process run and reports posts/s and
+speedup. Text is generated as token IDs, so tokenizing (done once, in the
+parent) is not part of the timings. Speedup is bounded by the CPUs
+available; the run prints how many there are.
+
+Usage:
+    python scripts/benchmark_batch.py --posts 20000000 --topics 20000 --workers 1 2 4 8
+    python scripts/benchmark_batch.py --no-text    # Fold the sentiment column only
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'src'))
+
+from batch import default_workers, fold_posts
+from scoring import TextScorer
+from text import Tokenizer, TokenizedCorpus
+
+AS_OF = 1734393600    # 2024-12-17 00:00 UTC
+SPAN = 365 * 86400
+KEYWORDS = ('Communication', 'Emotional intelligence', 'Active listening', 'Confidence', 'Humor', 'Direct communication')
+FILLER_TOKENS = 5_000          # Distinct non-lexicon tokens posts are padded with
+TOKENS_PER_POST = (8, 24)      # Post length range
+
+
+def make_corpus(posts, topics, seed):
+    """(timestamps, topic codes, segment codes, sentiments) for a synthetic corpus"""
+    rng = np.random.default_rng(seed)
+    popularity = np.cumsum(1.0 / np.arange(1, topics + 1))
+    return (
+        AS_OF - rng.integers(0, SPAN, posts),
+        np.searchsorted(popularity, rng.random(posts) * popularity[-1]).astype(np.int32),
+        rng.integers(0, 2, posts, dtype=np.int8),
+        rng.normal(0.3, 0.3, posts).clip(-1, 1),
+    )
+
+
+def make_text(posts, seed):
+    """(TokenizedCorpus, TextScorer) for `posts` posts drawn straight as token IDs"""
+    rng = np.random.default_rng(seed)
+    scorer = TextScorer(Tokenizer().vocabulary, KEYWORDS)
+    scorer.vocabulary.extend(f"w{i}" for i in range(FILLER_TOKENS))
+    vocabulary = len(scorer.vocabulary)
+    offsets = np.zeros(posts + 1, dtype=np.int64)
+    np.cumsum(rng.integers(*TOKENS_PER_POST, posts), out=offsets[1:])
+    ids = rng.integers(0, vocabulary, int(offsets[-1])).astype(np.int32)
+    return TokenizedCorpus(ids, offsets), scorer
+
+
+def same_result(left, right):
+    (store_a, activity_a, keywords_a), (store_b, activity_b, keywords_b) = left, right
+    for name, tier in store_a.tiers.items():
+        other = store_b.tiers[name]
+        if not (np.array_equal(tier.counts, other.counts) and np.allclose(tier.sentiment, other.sentiment)):
+            return False
+    return np.array_equal(activity_a.counts, activity_b.counts) and np.array_equal(keywords_a.counts, keywords_b.counts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--posts', type=int, default=10_000_000)
+    parser.add_argument('--topics', type=int, default=2_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per worker count (best is reported)")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--no-text', action='store_true', help="Skip text scoring and fold the sentiment column")
+    args = parser.parse_args(argv)
+
+    corpus = make_corpus(args.posts, args.topics, args.seed)
+    topics = [f"topic-{i}" for i in range(args.topics)]
+    tokens, scorer = (None, None) if args.no_text else make_text(args.posts, args.seed)
+    text = "" if tokens is None else f" ({len(tokens.ids):,} tokens)"
+    print(f"{args.posts:,} posts{text} over {args.topics:,} topics, {default_workers()} CPU(s) available")
+
+    baseline, reference = None, None
+    for workers in args.workers:
+        best, result = float('inf'), None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = fold_posts(*corpus, topics, workers=workers, tokens=tokens, scorer=scorer)
+            best = min(best, time.perf_counter() - start)
+        if reference is None:
+            reference, baseline = result, best
+        status = "ok" if same_result(result, reference) else "MISMATCH"
+        print(f"  {workers:>3} worker(s): {best:7.2f}s  {args.posts / best / 1e6:7.1f}M posts/s  "
+              f"x{baseline / best:4.2f}  [{status}]")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Text Benchmark - Throughput of the shared normalizer and tokenizer in MB/s
+Builds a seeded corpus of synthetic posts from the curated datasets' wording
+(plus URLs, emoji and elongated words) and times each stage over it.
+
+Usage:
+    python scripts/benchmark_text.py --posts 200000 --repeat 3
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'src'))
+
+from text import TOKEN_RE, Tokenizer, normalize, tokenize
+
+FLOURISHES = ['😍', '🔥', '👍🏽', '❤️', 'sooooo', 'yesss', 'https://example.com/p/123?ref=feed', 'www.dating.tips/guide', '10,000']
+
+
+def corpus_words():
+    """Words drawn from every string in the curated datasets"""
+    words = []
+
+    def walk(value):
+        if isinstance(value, str):
+            words.extend(value.split())
+        elif isinstance(value, dict):
+            for item in value.values():
+                walk(item)
+        elif isinstance(value, list):
+            for item in value:
+                walk(item)
+
+    for path in sorted((REPO_ROOT / 'data').glob('*.json')):
+        walk(json.loads(path.read_text()))
+    return words
+
+
+def make_posts(count, seed=2024):
+    """Seeded synthetic posts of 5-40 words, about a quarter of them repeated"""
+    rng = random.Random(seed)
+    words = corpus_words()
+    posts = []
+    for _ in range(count):
+        if posts and rng.random() < 0.25:
+            posts.append(rng.choice(posts))
+            continue
+        body = rng.choices(words, k=rng.randint(5, 40))
+        for _ in range(rng.randint(0, 3)):
+            body.insert(rng.randrange(len(body) + 1), rng.choice(FLOURISHES))
+        posts.append(' '.join(body))
+    return posts
+
+
+def measure(label, fn, megabytes, repeat):
+    """Best-of-`repeat` wall time for fn(); prints and returns MB/s"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    rate = megabytes / best
+    print(f"  {label:<36} {best * 1000:9.1f} ms   {rate:8.1f} MB/s")
+    return rate
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--posts', type=int, default=200_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=2024)
+    args = parser.parse_args(argv)
+
+    posts = make_posts(args.posts, args.seed)
+    megabytes = sum(len(post.encode('utf-8')) for post in posts) / 1e6
+    print(f"📝 {len(posts):,} posts, {megabytes:.1f} MB of UTF-8 text")
+
+    measure("normalize (per post)", lambda: [normalize(post) for post in posts], megabytes, args.repeat)
+    measure("tokenize() to strings (per post)", lambda: [tokenize(post) for post in posts], megabytes, args.repeat)
+    normalized = [normalize(post) for post in posts]
+    measure("split only (pre-normalized)", lambda: [TOKEN_RE.findall(text) for text in normalized], megabytes, args.repeat)
+
+    def encode_each():
+        tokenizer = Tokenizer()
+        return [tokenizer.encode(post) for post in posts]
+
+    measure("encode (per post, cold cache)", encode_each, megabytes, args.repeat)
+    measure("encode_batch (cold cache)", lambda: Tokenizer().encode_batch(posts), megabytes, args.repeat)
+
+    tokenizer = Tokenizer()
+    corpus = tokenizer.encode_batch(posts)
+    measure("encode_batch (warm cache)", lambda: tokenizer.encode_batch(posts), megabytes, args.repeat)
+
+    info = tokenizer.cache_info()
+    print(f"🔤 {len(corpus.ids):,} tokens, vocabulary {info['vocabulary']:,}, "
+          f"{info['size']:,} distinct posts cached")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Build Snapshot - Compile data/ into the binary snapshot the dashboard serves
+Validates the curated JSON, reads the post log and prepares every derived
+structure the tabs and the API load, then writes snapshots/<version>.snap and
+atomically repoints snapshots/CURRENT at it. Run from the repo root:
+
+    python scripts/build_snapshot.py --workers 8
+    DASHBOARD_ENV=production streamlit run src/app.py
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'src'))
+
+# The build always reads data/ directly, whatever the serving environment
+os.environ['DASHBOARD_ENV'] = 'development'
+
+from streamlit.logger import get_logger
+
+# Loaders are decorated and run without a Streamlit runtime here; that's expected
+for name in ('cache_data_api', 'cache_resource_api'):
+    get_logger(f'streamlit.runtime.caching.{name}').setLevel(logging.ERROR)
+
+import datasets
+from batch import default_workers
+from rollups import WINDOWS
+from snapshot import new_snapshot, read_snapshot, write_snapshot
+
+
+def prepare_parts():
+    """
+    Everything the datasets loaders serve, keyed by snapshot part name
+    Post-derived parts are built for the trend topics in TrendTable order,
+    which is what every caller passes.
+    """
+    trends = datasets.load_trends()
+    topics = tuple(trends.topics)
+    catalogs = {name: datasets.load_catalog(name) for name in ('attraction_research', 'social_skills')}
+    rollups = datasets.load_rollups(topics)
+    for tier in rollups.tiers.values():
+        tier.cumulative()    # Ship the window prefix sums too
+    return {
+        'documents': {name: datasets.load_dataset(name) for name in datasets.DATASET_PATHS},
+        'digests': {name: datasets.dataset_version(name) for name in datasets.DATASET_PATHS},
+        'trends': trends,
+        'catalogs': catalogs,
+        'tip_rankers': datasets.load_tip_rankers(),
+        'posts_version': datasets.posts_version(),
+        'activity': datasets.load_activity(topics),
+        'keywords': datasets.load_keywords(topics),
+        'peak_times': datasets.load_peak_times(topics),
+        'rollups': rollups,
+        'sparklines': datasets.load_sparklines(topics),
+        'spike_detector': datasets.load_spike_detector(topics),
+        'related': datasets.load_related(topics),
+        'participants': datasets.load_participants(topics),
+        'intervals': datasets.load_intervals(topics),
+        'cubes': {window: datasets.load_cube(topics, window) for window in WINDOWS},
+        'post_index': datasets.load_post_index(topics),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', default=datasets.SNAPSHOT_DIR, help="Snapshot directory (default: snapshots)")
+    parser.add_argument('--workers', type=int, default=default_workers(),
+                        help="Processes scoring and folding the post log into rollups (default: every CPU)")
+    args = parser.parse_args(argv)
+
+    os.chdir(REPO_ROOT)
+    datasets.BATCH_WORKERS = args.workers
+
+    start = time.perf_counter()
+    parts = prepare_parts()
+    sources = {path: datasets.dataset_version(name) for name, path in datasets.DATASET_PATHS.items()}
+    sources[datasets.POSTS_PATH] = parts['posts_version']
+    snapshot = new_snapshot(sources, parts)
+    path = write_snapshot(snapshot, args.output)
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    read_snapshot(path)
+    loaded = time.perf_counter() - start
+    print(f"📦 {path} ({os.path.getsize(path) / 1e6:.2f} MB), version {snapshot.version}")
+    print(f"   built in {built:.2f}s, loads in {loaded * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
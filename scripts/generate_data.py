@@ -0,0 +1,378 @@
+"""
+Synthetic Data - Seeded, schema-compatible datasets at any scale for load tests
+Writes mock_trends.json, attraction_research.json, social_skills.json and a
+mock_posts.csv stream shaped like the curated data: Zipfian topic popularity,
+day-part diurnal cycles, per-topic weekly growth and gender-skewed interest.
+Each post carries a short text: lexicon words whose polarity gives its
+sentiment (scoring.score_chunk reproduces the sentiment column exactly) and,
+often, one of the top keywords of the author's gender.
+Scale 1 matches the curated sizes (20 topics, ~10k posts); every section and
+the post volume grow linearly, up to 100000x.
+
+Posts are generated and written one hour at a time, and the trend figures
+(volume, sentiment, velocity) are tallied from the posts as they stream, so
+memory stays O(topics) however many posts are written. The same seed and
+scale always produce byte-identical files.
+
+Usage:
+    python scripts/generate_data.py --scale 100 --output data/synthetic/scale-100
+    DASHBOARD_DATA_DIR=data/synthetic/scale-100 streamlit run src/app.py
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'src'))
+
+from activity import DAY_PARTS, HOURS_PER_DAY, HOURS_PER_WEEK, hour_of_week, peak_hours
+from scoring import NEGATIVE_WORDS, POSITIVE_WORDS
+
+MAX_SCALE = 100_000
+POSTS_PER_SCALE = 10_000        # Posts written at scale 1 (the curated log's size)
+AUTHORS_PER_SCALE = 3_000
+TOPIC_ZIPF_EXPONENT = 1.0       # Topic rank r gets a share proportional to 1 / r^s
+AUTHOR_ZIPF_EXPONENT = 0.8      # Same for authors (below 1, so sampled by inverse CDF)
+SENTIMENT_SPREAD = 0.3          # Per-post sentiment around the topic mean
+SENTIMENT_WORDS = 8             # Lexicon words per post; each is positive with probability (1 + sentiment) / 2
+KEYWORD_SHARE = 0.6             # Posts that mention one of the top keywords
+PEAK_BOOST = 3.5                # Rate multiplier in a topic's peak day part
+AS_OF = 1734393600              # 2024-12-17 00:00 UTC, end of the curated log
+WEEKS = 12
+
+# Relative posts per hour of day across all topics (UTC)
+DIURNAL = np.array([3, 2, 1, 1, 1, 1, 2, 4, 6, 7, 7, 8, 8, 8, 7, 7, 8, 9, 10, 11, 12, 12, 11, 6], dtype=np.float64)
+
+# Curated section -> field made unique per copy, and the numeric field perturbed per copy
+VARIANT_FIELDS = {
+    'attraction_research': {
+        'physical_factors': ('factor', None),
+        'behavioral_factors': ('trait', 'attractiveness_score'),
+        'interaction_patterns': ('pattern', 'effectiveness'),
+        'key_insights': ('insight', None),
+    },
+    'social_skills': {
+        'communication_tips': ('category', 'effectiveness'),
+        'body_language': ('signal', None),
+        'common_mistakes': ('mistake', None),
+        'escalation_tips': ('stage', None),
+    },
+}
+
+
+def load_curated(name):
+    with open(REPO_ROOT / 'data' / f"{name}.json") as f:
+        return json.load(f)
+
+
+def variant_name(name, copy):
+    """Copy 0 keeps the curated name; later copies are numbered"""
+    return name if copy == 0 else f"{name} #{copy + 1}"
+
+
+def csv_field(value):
+    """Quote a CSV field only when it needs it (as csv.writer does)"""
+    if any(c in value for c in ',"\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def write_document(path, sections):
+    """
+    Stream a JSON document section by section
+    Args:
+        sections: Dict of key -> value; iterators are written as JSON arrays
+            item by item, so list sections never have to be held in memory
+    """
+    with open(path, 'w') as f:
+        f.write('{')
+        for i, (key, value) in enumerate(sections.items()):
+            f.write(f"{',' if i else ''}\n  {json.dumps(key)}: ")
+            if isinstance(value, (dict, list, str, int, float)):
+                f.write(json.dumps(value))
+                continue
+            f.write('[')
+            for j, item in enumerate(value):
+                f.write(f"{',' if j else ''}\n    {json.dumps(item)}")
+            f.write('\n  ]')
+        f.write('\n}\n')
+
+
+class TopicModel:
+    """
+    Per-topic generation parameters
+    Topic i copies curated trend i % 20 with jittered sentiment, interest,
+    growth and (sometimes) peak day part; popularity follows its rank.
+    """
+
+    def __init__(self, base_trends, scale, rng):
+        n_base = len(base_trends)
+        n = n_base * scale
+        base = np.arange(n) % n_base
+        copy = np.arange(n) // n_base
+        jitter = copy > 0
+        parts = list(DAY_PARTS)
+
+        def column(field):
+            return np.array([trend[field] for trend in base_trends], dtype=np.float64)[base]
+
+        self.names = [variant_name(base_trends[b]['topic'], c) for b, c in zip(base, copy)]
+        self.popularity = 1.0 / np.arange(1, n + 1) ** TOPIC_ZIPF_EXPONENT
+        self.popularity /= self.popularity.sum()
+        self.sentiment = np.clip(column('sentiment') + jitter * rng.normal(0, 0.15, n), -0.95, 0.95)
+        self.growth = np.maximum(column('velocity') + jitter * rng.normal(0, 8, n), -50)
+        women = column('women_interest') + jitter * rng.normal(0, 6, n)
+        men = column('men_interest') + jitter * rng.normal(0, 6, n)
+        self.women_interest = np.clip(np.rint(women), 1, 100).astype(np.int64)
+        self.men_interest = np.clip(np.rint(men), 1, 100).astype(np.int64)
+        self.p_women = self.women_interest / (self.women_interest + self.men_interest)
+
+        base_part = np.array([parts.index(trend['peak_time']) for trend in base_trends])[base]
+        reassign = jitter & (rng.random(n) < 0.3)
+        self.part = np.where(reassign, rng.integers(0, len(parts), n), base_part)
+
+        # Hour-of-day profile per day part, each summing to 24 so rates stay per-hour
+        self.profiles = np.empty((len(parts), HOURS_PER_DAY))
+        for p, hours in enumerate(DAY_PARTS.values()):
+            profile = DIURNAL.copy()
+            profile[list(hours)] *= PEAK_BOOST
+            self.profiles[p] = profile * HOURS_PER_DAY / profile.sum()
+
+    def __len__(self):
+        return len(self.names)
+
+    def weekly_rates(self, week, posts):
+        """
+        Mean posts per hour for each topic in one week
+        Growth compounds weekly; totals are normalized so the whole log
+        holds about `posts` posts.
+        """
+        weeks = np.arange(WEEKS)
+        growth = (1 + self.growth[:, None] / 100) ** weeks
+        share = growth[:, week] / growth.sum(axis=1)
+        return posts * self.popularity * share / HOURS_PER_WEEK
+
+
+def sample_authors(rng, count, pool):
+    """Author numbers 1..pool with P(n) proportional to 1 / n^AUTHOR_ZIPF_EXPONENT (inverse CDF)"""
+    keep = 1 - AUTHOR_ZIPF_EXPONENT
+    u = rng.random(count)
+    n = (1 + u * ((pool + 1) ** keep - 1)) ** (1 / keep)
+    return np.minimum(n.astype(np.int64), pool)
+
+
+def post_texts(rng, topic_names, sentiment, keywords):
+    """
+    Text for a batch of posts, and the sentiment it scores as
+    Args:
+        topic_names: Topic name per post
+        sentiment: Target sentiment per post
+        keywords: Keyword per post, None for posts that mention none
+    Returns:
+        (texts, sentiment); the sentiment is the mean polarity of the lexicon
+        words drawn, so it is a multiple of 1 / SENTIMENT_WORDS
+    """
+    count = len(topic_names)
+    positive = rng.random((count, SENTIMENT_WORDS)) < (1 + sentiment[:, None]) / 2
+    words = np.where(
+        positive,
+        np.array(POSITIVE_WORDS)[rng.integers(0, len(POSITIVE_WORDS), positive.shape)],
+        np.array(NEGATIVE_WORDS)[rng.integers(0, len(NEGATIVE_WORDS), positive.shape)],
+    )
+    texts = [
+        f"{name.lower()}: {' '.join(row)}" + (f" - all about {keyword.lower()}" if keyword else "")
+        for name, row, keyword in zip(topic_names, words.tolist(), keywords)
+    ]
+    return texts, (2 * positive.sum(axis=1) - SENTIMENT_WORDS) / SENTIMENT_WORDS
+
+
+def sample_keywords(rng, women, top_keywords):
+    """A top keyword of each author's gender for KEYWORD_SHARE of posts (rank r weighted 1 / r), else None"""
+    keywords = np.full(len(women), None, dtype=object)
+    mentions = rng.random(len(women)) < KEYWORD_SHARE
+    draws = rng.random(len(women))
+    for segment, members in (('women', women), ('men', ~women)):
+        options = np.array(top_keywords[segment], dtype=object)
+        weights = np.cumsum(1.0 / np.arange(1, len(options) + 1))
+        rows = mentions & members
+        keywords[rows] = options[np.minimum(np.searchsorted(weights, draws[rows] * weights[-1]), len(options) - 1)]
+    return keywords
+
+
+def generate_posts(path, model, scale, rng, top_keywords):
+    """
+    Write the post log hour by hour, in timestamp order
+    Within each hour, one Poisson draw per day part sets how many posts its
+    topics get, and topics are picked by their share of that part's rate.
+    Sentiment is drawn around the topic mean and then expressed as post text.
+    Returns:
+        Per-topic tallies (volume, sentiment sum, last-week and prior-week
+        counts) and the hour-of-week histogram of all posts
+    """
+    n = len(model)
+    posts = POSTS_PER_SCALE * scale
+    pool = AUTHORS_PER_SCALE * scale
+    width = max(5, len(str(pool)))
+    names = [csv_field(name) for name in model.names]
+    topic_names = np.array(model.names, dtype=object)
+    start = AS_OF - WEEKS * HOURS_PER_WEEK * 3600
+    volume = np.zeros(n, dtype=np.int64)
+    sentiment_sum = np.zeros(n)
+    last_week = np.zeros(n, dtype=np.int64)
+    prior_week = np.zeros(n, dtype=np.int64)
+    week_hours = np.zeros(HOURS_PER_WEEK, dtype=np.int64)
+    part_topics = [np.flatnonzero(model.part == p) for p in range(len(DAY_PARTS))]
+    next_id = 1
+
+    with open(path, 'w', newline='') as f:
+        f.write('id,timestamp,topic,author,gender,sentiment,text\n')
+        for week in range(WEEKS):
+            rates = model.weekly_rates(week, posts)
+            cumulative = [np.cumsum(rates[topics]) for topics in part_topics]
+            for hour in range(HOURS_PER_WEEK):
+                hour_start = start + (week * HOURS_PER_WEEK + hour) * 3600
+                hour_of_day = (hour_start // 3600) % HOURS_PER_DAY
+                picks = []
+                for p, topics in enumerate(part_topics):
+                    if len(topics) == 0:
+                        continue
+                    total = cumulative[p][-1]
+                    count = rng.poisson(total * model.profiles[p, hour_of_day])
+                    slots = np.searchsorted(cumulative[p], rng.random(count) * total, side='right')
+                    picks.append(topics[np.minimum(slots, len(topics) - 1)])
+                topics = np.concatenate(picks)
+                count = len(topics)
+                if count == 0:
+                    continue
+
+                timestamps = hour_start + rng.integers(0, 3600, count)
+                order = np.argsort(timestamps, kind='stable')
+                timestamps, topics = timestamps[order], topics[order]
+                women = rng.random(count) < model.p_women[topics]
+                sentiment = np.clip(rng.normal(model.sentiment[topics], SENTIMENT_SPREAD), -1, 1)
+                authors = sample_authors(rng, count, pool)
+                texts, sentiment = post_texts(rng, topic_names[topics], sentiment,
+                                              sample_keywords(rng, women, top_keywords))
+
+                volume += np.bincount(topics, minlength=n)
+                sentiment_sum += np.bincount(topics, weights=sentiment, minlength=n)
+                if week == WEEKS - 1:
+                    last_week += np.bincount(topics, minlength=n)
+                elif week == WEEKS - 2:
+                    prior_week += np.bincount(topics, minlength=n)
+                week_hours[hour_of_week(hour_start)] += count
+
+                ids = np.arange(next_id, next_id + count)
+                next_id += count
+                f.writelines(
+                    f"{i},{t},{names[c]},"
+                    f"u{a:0{width}d},{'women' if w else 'men'},{s:.2f},{csv_field(x)}\n"
+                    for i, t, c, a, w, s, x in zip(ids.tolist(), timestamps.tolist(), topics.tolist(),
+                                                   authors.tolist(), women.tolist(), sentiment.tolist(), texts)
+                )
+    return volume, sentiment_sum, last_week, prior_week, week_hours
+
+
+def percent_change(current, previous):
+    return np.where(previous > 0, (current - previous) / np.maximum(previous, 1) * 100, 0.0)
+
+
+def trend_items(model, volume, sentiment_sum, velocity):
+    """Trend entries, highest volume first, built from the post tallies"""
+    parts = list(DAY_PARTS)
+    sentiment = np.where(volume > 0, sentiment_sum / np.maximum(volume, 1), model.sentiment)
+    for i in np.argsort(-volume, kind='stable').tolist():
+        yield {
+            'topic': model.names[i],
+            'volume': int(volume[i]),
+            'sentiment': round(float(sentiment[i]), 2),
+            'velocity': round(float(velocity[i]), 1),
+            'women_interest': int(model.women_interest[i]),
+            'men_interest': int(model.men_interest[i]),
+            'peak_time': parts[model.part[i]],
+        }
+
+
+def section_items(records, scale, title_field, score_field, rng):
+    """Records copied `scale` times; copies get numbered titles and jittered scores"""
+    for copy in range(scale):
+        jitter = rng.normal(0, 0.4, len(records)) if score_field else None
+        for i, record in enumerate(records):
+            item = dict(record)
+            item[title_field] = variant_name(record[title_field], copy)
+            if score_field and copy:
+                item[score_field] = round(float(np.clip(record[score_field] + jitter[i], 0, 10)), 1)
+            yield item
+
+
+def catalog_sections(name, scale, rng):
+    document = load_curated(name)
+    sections = {}
+    for key, value in document.items():
+        if key in VARIANT_FIELDS[name]:
+            title_field, score_field = VARIANT_FIELDS[name][key]
+            sections[key] = section_items(value, scale, title_field, score_field, rng)
+        else:
+            sections[key] = value
+    return sections
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=int, default=1, help=f"Multiple of the curated sizes, 1-{MAX_SCALE} (default: 1)")
+    parser.add_argument('--seed', type=int, default=2024)
+    parser.add_argument('--output', help="Output directory (default: data/synthetic/scale-<scale>)")
+    parser.add_argument('--no-posts', action='store_true', help="Skip mock_posts.csv (trend figures then come from the model alone)")
+    args = parser.parse_args(argv)
+    if not 1 <= args.scale <= MAX_SCALE:
+        parser.error(f"--scale must be between 1 and {MAX_SCALE}")
+
+    output = Path(args.output or REPO_ROOT / 'data' / 'synthetic' / f"scale-{args.scale}")
+    output.mkdir(parents=True, exist_ok=True)
+    # Independent streams per file, so skipping the posts doesn't change the catalogs
+    model_rng, posts_rng, research_rng, skills_rng = (np.random.default_rng(s) for s in np.random.SeedSequence(args.seed).spawn(4))
+
+    base = load_curated('mock_trends')
+    model = TopicModel(base['trends'], args.scale, model_rng)
+
+    start = time.perf_counter()
+    if args.no_posts:
+        posts = POSTS_PER_SCALE * args.scale
+        weekly = np.stack([model.weekly_rates(week, posts) * HOURS_PER_WEEK for week in range(WEEKS)], axis=1)
+        volume = np.rint(weekly.sum(axis=1)).astype(np.int64)
+        sentiment_sum = model.sentiment * volume
+        last_week, prior_week = weekly[:, -1], weekly[:, -2]
+        week_hours = None
+    else:
+        volume, sentiment_sum, last_week, prior_week, week_hours = generate_posts(
+            output / 'mock_posts.csv', model, args.scale, posts_rng, base['top_keywords'])
+    velocity = percent_change(last_week, prior_week)
+
+    total, total_sentiment = int(volume.sum()), float(sentiment_sum.sum())
+    stats = dict(base['engagement_stats'])
+    stats['total_discussions'] = int(stats['total_discussions']) * args.scale
+    stats['avg_sentiment'] = round(total_sentiment / total, 2) if total else stats['avg_sentiment']
+    if week_hours is not None:
+        stats['peak_hours'] = peak_hours(week_hours)
+    stats['weekly_growth'] = round(float(percent_change(last_week.sum(), prior_week.sum())), 1)
+
+    write_document(output / 'mock_trends.json', {
+        'trends': trend_items(model, volume, sentiment_sum, velocity),
+        'top_keywords': base['top_keywords'],
+        'engagement_stats': stats,
+    })
+    write_document(output / 'attraction_research.json', catalog_sections('attraction_research', args.scale, research_rng))
+    write_document(output / 'social_skills.json', catalog_sections('social_skills', args.scale, skills_rng))
+    elapsed = time.perf_counter() - start
+
+    size = sum(path.stat().st_size for path in output.iterdir() if path.is_file())
+    print(f"🧪 Scale {args.scale}: {len(model):,} topics, {total:,} posts -> {output} ({size / 1e6:.1f} MB)")
+    print(f"   generated in {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,361 @@
+"""
+Load Test - Drive concurrent simulated sessions against the dashboard
+Starts the app locally (or targets --url), logs each session in through the
+access gate, then keeps it busy changing widgets until --duration elapses.
+
+Usage:
+    python scripts/loadtest.py --sessions 50 --duration 60 --output report.json
+    python scripts/loadtest.py --compare baseline.json report.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.request import urlopen
+
+import numpy as np
+import toml
+from tornado.httpclient import AsyncHTTPClient
+from tornado.websocket import websocket_connect
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Labels used by auth.show_login_screen()
+ACCESS_CODE_LABEL = "Enter Access Code"
+LOGIN_BUTTON_LABEL = "🚀 Access Dashboard"
+
+# Widgets a simulated user changes; tabs and expanders are browser-side and never rerun
+INTERACTIVE_WIDGETS = ('selectbox', 'radio')
+TRACKED_WIDGETS = INTERACTIVE_WIDGETS + ('text_input', 'button')
+
+# Metrics shown by --compare: (report path, label, higher is better)
+COMPARED_METRICS = [
+    (('throughput_rps',), "Throughput (reruns/s)", True),
+    (('latency_ms', 'p50'), "Rerun latency p50 (ms)", False),
+    (('latency_ms', 'p95'), "Rerun latency p95 (ms)", False),
+    (('latency_ms', 'p99'), "Rerun latency p99 (ms)", False),
+    (('event_loop_lag_ms', 'p99'), "Event-loop lag p99 (ms)", False),
+    (('rss_mb', 'per_session_kb'), "RSS growth per session (KB)", False),
+    (('errors',), "Errors", False),
+]
+
+
+def percentiles(samples_ms):
+    """p50/p95/p99/max summary of a list of millisecond samples"""
+    if not samples_ms:
+        return {'p50': None, 'p95': None, 'p99': None, 'max': None, 'count': 0}
+    values = np.asarray(samples_ms)
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        'p50': round(float(p50), 2),
+        'p95': round(float(p95), 2),
+        'p99': round(float(p99), 2),
+        'max': round(float(values.max()), 2),
+        'count': int(values.size),
+    }
+
+
+def read_rss_kb(pid):
+    """Resident set size of a process in KB (Linux only; None elsewhere)"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def default_access_code():
+    """ACCESS_CODE from the environment, falling back to .streamlit/secrets.toml"""
+    if os.environ.get('ACCESS_CODE'):
+        return os.environ['ACCESS_CODE']
+    secrets = REPO_ROOT / '.streamlit' / 'secrets.toml'
+    if secrets.exists():
+        return toml.load(secrets).get('ACCESS_CODE')
+    return None
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class SimulatedSession:
+    """
+    One browser session speaking Streamlit's websocket protocol
+    Each rerun sends a BackMsg and waits for the session to go idle,
+    recording the widgets emitted along the way so later reruns can target them.
+    """
+
+    def __init__(self, base_url, rng):
+        self.ws_url = base_url.replace('http', 'ws', 1) + '/_stcore/stream'
+        self.rng = rng
+        self.ws = None
+        self.widgets = {}
+
+    async def connect(self):
+        self.ws = await websocket_connect(self.ws_url, max_message_size=64 * 1024 * 1024)
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+    async def rerun(self, widget_states=()):
+        """
+        Request a script run and wait for the session to go idle
+        A run that calls st.rerun() is followed by another run, so completion is
+        the first "not running" status after a script_finished; widgets are
+        kept from the last run only.
+        Returns:
+            Seconds from request to the session going idle
+        """
+        back = BackMsg()
+        back.rerun_script.query_string = ''
+        back.rerun_script.page_script_hash = ''
+        back.rerun_script.widget_states.widgets.extend(widget_states)
+
+        started = time.perf_counter()
+        await self.ws.write_message(back.SerializeToString(), binary=True)
+        self.widgets = {}
+        finished = False
+        while True:
+            payload = await self.ws.read_message()
+            if payload is None:
+                raise ConnectionError("websocket closed mid-run")
+            msg = ForwardMsg()
+            msg.ParseFromString(payload)
+            kind = msg.WhichOneof('type')
+            if kind == 'delta' and msg.delta.WhichOneof('type') == 'new_element':
+                if finished:
+                    self.widgets = {}
+                    finished = False
+                self._track_widget(msg.delta.new_element)
+            elif kind == 'script_finished':
+                if msg.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise RuntimeError("app failed to compile")
+                finished = True
+            elif kind == 'session_status_changed' and finished and not msg.session_status_changed.script_is_running:
+                return time.perf_counter() - started
+
+    def _track_widget(self, element):
+        element_type = element.WhichOneof('type')
+        if element_type in TRACKED_WIDGETS:
+            widget = getattr(element, element_type)
+            options = list(getattr(widget, 'options', []))
+            self.widgets[widget.label] = (element_type, widget.id, options)
+
+    async def login(self, access_code):
+        """Fill in the access gate and press the login button"""
+        _, input_id, _ = self.widgets[ACCESS_CODE_LABEL]
+        _, button_id, _ = self.widgets[LOGIN_BUTTON_LABEL]
+        code = WidgetState(id=input_id, string_value=access_code)
+        press = WidgetState(id=button_id, trigger_value=True)
+        elapsed = await self.rerun([code, press])
+        if LOGIN_BUTTON_LABEL in self.widgets:
+            raise PermissionError("access code rejected")
+        return elapsed
+
+    async def interact(self):
+        """Change a random selectbox/radio to a random option, or plain rerun if none exist"""
+        choices = [w for w in self.widgets.values() if w[0] in INTERACTIVE_WIDGETS and w[2]]
+        if not choices:
+            return await self.rerun()
+        _, widget_id, options = self.rng.choice(choices)
+        return await self.rerun([WidgetState(id=widget_id, int_value=self.rng.randrange(len(options)))])
+
+
+class LoadTest:
+    """Runs the sessions and collects the measurements for the report"""
+
+    def __init__(self, args, server_pid):
+        self.args = args
+        self.server_pid = server_pid
+        self.latencies_ms = []
+        self.login_latencies_ms = []
+        self.lag_ms = []
+        self.errors = []
+        self.stopping = False
+
+    async def run_session(self, index):
+        rng = random.Random(self.args.seed * 100003 + index)
+        session = SimulatedSession(self.args.url, rng)
+        await asyncio.sleep(self.args.ramp * index / max(self.args.sessions, 1))
+        try:
+            await session.connect()
+            await session.rerun()
+            self.login_latencies_ms.append(await session.login(self.args.access_code) * 1000)
+            while not self.stopping:
+                await asyncio.sleep(rng.expovariate(1 / self.args.think_time))
+                if self.stopping:
+                    break
+                self.latencies_ms.append(await session.interact() * 1000)
+        except Exception as e:  # Keep the other sessions running; report the failure
+            self.errors.append(f"session {index}: {type(e).__name__}: {e}")
+        finally:
+            session.close()
+
+    async def probe_event_loop(self):
+        """
+        Health-endpoint round trips while under load
+        The handler does no work, so its latency is time spent queued behind
+        the server's event loop.
+        """
+        client = AsyncHTTPClient()
+        while not self.stopping:
+            started = time.perf_counter()
+            await client.fetch(self.args.url + '/_stcore/health', raise_error=False)
+            self.lag_ms.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(self.args.probe_interval)
+
+    async def run(self):
+        rss_before = read_rss_kb(self.server_pid) if self.server_pid else None
+        started = time.perf_counter()
+        tasks = [asyncio.ensure_future(self.run_session(i)) for i in range(self.args.sessions)]
+        probe = asyncio.ensure_future(self.probe_event_loop())
+        await asyncio.sleep(self.args.ramp + self.args.duration)
+        rss_loaded = read_rss_kb(self.server_pid) if self.server_pid else None
+        self.stopping = True
+        await asyncio.gather(*tasks)
+        await probe
+        elapsed = time.perf_counter() - started
+        return self.report(elapsed, rss_before, rss_loaded)
+
+    def report(self, elapsed, rss_before, rss_loaded):
+        rss = {'before': None, 'loaded': None, 'per_session_kb': None}
+        if rss_before is not None and rss_loaded is not None:
+            rss = {
+                'before': round(rss_before / 1024, 1),
+                'loaded': round(rss_loaded / 1024, 1),
+                'per_session_kb': round((rss_loaded - rss_before) / max(self.args.sessions, 1), 1),
+            }
+        return {
+            'commit': git_commit(),
+            'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'config': {
+                'sessions': self.args.sessions,
+                'duration_s': self.args.duration,
+                'ramp_s': self.args.ramp,
+                'think_time_s': self.args.think_time,
+                'seed': self.args.seed,
+            },
+            'reruns': len(self.latencies_ms),
+            'throughput_rps': round(len(self.latencies_ms) / elapsed, 2),
+            'latency_ms': percentiles(self.latencies_ms),
+            'login_latency_ms': percentiles(self.login_latencies_ms),
+            'event_loop_lag_ms': percentiles(self.lag_ms),
+            'rss_mb': rss,
+            'errors': len(self.errors),
+            'error_samples': self.errors[:10],
+        }
+
+
+def start_server(port):
+    """Launch `streamlit run src/app.py` and wait until it answers health checks"""
+    command = [
+        sys.executable, '-m', 'streamlit', 'run', 'src/app.py',
+        '--server.port', str(port),
+        '--server.headless', 'true',
+        '--browser.gatherUsageStats', 'false',
+    ]
+    server = subprocess.Popen(command, cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://localhost:{port}"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("streamlit exited during startup")
+        try:
+            with urlopen(url + '/_stcore/health', timeout=1) as response:
+                if response.status == 200:
+                    return server, url
+        except OSError:
+            time.sleep(0.25)
+    server.terminate()
+    raise RuntimeError("streamlit did not become healthy within 60s")
+
+
+def get_metric(report, path):
+    value = report
+    for key in path:
+        value = value.get(key) if isinstance(value, dict) else None
+    return value
+
+
+def compare(baseline_path, candidate_path):
+    """Print a side-by-side table of two reports"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    with open(candidate_path) as f:
+        candidate = json.load(f)
+    if baseline['config'] != candidate['config']:
+        print("⚠️  Reports were recorded with different configs; deltas are not like-for-like")
+    print(f"{'Metric':<32}{baseline.get('commit') or 'baseline':>12}{candidate.get('commit') or 'candidate':>12}{'Change':>12}")
+    for path, label, higher_is_better in COMPARED_METRICS:
+        old, new = get_metric(baseline, path), get_metric(candidate, path)
+        change = ''
+        if old not in (None, 0) and new is not None:
+            pct = (new - old) / old * 100
+            worse = pct < 0 if higher_is_better else pct > 0
+            change = f"{pct:+.1f}%" + (' ⚠️' if worse and abs(pct) >= 10 else '')
+        print(f"{label:<32}{str(old):>12}{str(new):>12}{change:>12}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=20, help="Concurrent simulated sessions")
+    parser.add_argument('--duration', type=float, default=30, help="Seconds of steady load after ramp-up")
+    parser.add_argument('--ramp', type=float, default=5, help="Seconds over which sessions connect")
+    parser.add_argument('--think-time', type=float, default=2.0, help="Mean seconds between a session's actions")
+    parser.add_argument('--probe-interval', type=float, default=0.1, help="Seconds between event-loop probes")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--url', help="Target an already running server instead of starting one")
+    parser.add_argument('--pid', type=int, help="Server PID for RSS sampling when using --url")
+    parser.add_argument('--port', type=int, default=8599, help="Port for the locally started server")
+    parser.add_argument('--access-code', default=default_access_code())
+    parser.add_argument('--output', help="Write the JSON report here")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CANDIDATE'), help="Compare two reports and exit")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.compare:
+        compare(*args.compare)
+        return 0
+    if not args.access_code:
+        print("❌ No access code: set ACCESS_CODE or create .streamlit/secrets.toml")
+        return 1
+
+    server = None
+    if args.url is None:
+        server, args.url = start_server(args.port)
+    try:
+        server_pid = server.pid if server else args.pid
+        report = asyncio.run(LoadTest(args, server_pid).run())
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + '\n')
+    return 1 if report['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Replay - Record the post stream to a log and play it back into the live aggregates
+`record` writes a post CSV (data/mock_posts.csv by default, or a generated
+set from scripts/generate_data.py) to a memory-mappable append-only log.
+`play` replays a log at a multiple of real time, or as fast as possible,
+into the rollups, spike detector and activity histogram behind the Trends
+tab, and reports sustained throughput and event-to-publish lag.
+
+Usage:
+    python scripts/replay.py record --posts data/mock_posts.csv --log posts.log
+    python scripts/replay.py play --log posts.log --speed 100 --duration 30
+    python scripts/replay.py play --log posts.log --speed max --output replay.json
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'src'))
+
+from replay import EventLog, LivePipeline, record_posts, replay
+
+
+def parse_speed(value):
+    """'max' or a positive multiple of real time"""
+    if value == 'max':
+        return None
+    speed = float(value.rstrip('x'))
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive or 'max'")
+    return speed
+
+
+def record(args):
+    start = time.perf_counter()
+    posts = pd.read_csv(args.posts, dtype={'id': 'int64', 'timestamp': 'int64'})
+    count = record_posts(posts, args.log)
+    elapsed = time.perf_counter() - start
+    print(f"⏺️  Recorded {len(posts):,} posts to {args.log} ({count:,} events in log) in {elapsed:.2f}s")
+
+
+def play(args):
+    log = EventLog(args.log)
+    pipeline = LivePipeline(log.topics)
+    label = 'max' if args.speed is None else f"{args.speed:g}x"
+    print(f"▶️  Replaying {len(log):,} events over {len(log.topics):,} topics at {label}")
+    summary = replay(log, pipeline, speed=args.speed, duration=args.duration).summary()
+    summary['speed'] = label
+
+    lags = summary['oldest_lag_ms']
+    print(f"   {summary['events']:,} events in {summary['elapsed_s']:.2f}s "
+          f"({summary['throughput_eps'] or 0:,.0f} events/s, {summary['publishes']:,} publishes)")
+    print(f"   lag to publish: mean {summary['mean_lag_ms']} ms, oldest event p50 {lags['p50']} / "
+          f"p95 {lags['p95']} / p99 {lags['p99']} / max {lags['max']} ms")
+    if args.output:
+        Path(args.output).write_text(json.dumps(summary, indent=2))
+        print(f"   report written to {args.output}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    recorder = commands.add_parser('record', help="Append a post CSV to a log")
+    recorder.add_argument('--posts', default=str(REPO_ROOT / 'data' / 'mock_posts.csv'))
+    recorder.add_argument('--log', required=True)
+    recorder.set_defaults(run=record)
+
+    player = commands.add_parser('play', help="Replay a log into the live aggregates")
+    player.add_argument('--log', required=True)
+    player.add_argument('--speed', type=parse_speed, default=None, help="1, 10, 100... or 'max' (default: max)")
+    player.add_argument('--duration', type=float, help="Stop after this many seconds")
+    player.add_argument('--output', help="Write the JSON summary here")
+    player.set_defaults(run=play)
+
+    args = parser.parse_args(argv)
+    args.run(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Serve - Run the dashboard with a warm-up phase and a readiness endpoint
+Starts Streamlit on src/app.py and, in the same process, warms it up:
+module imports, dataset loading and validation, the shared aggregates and
+the common figures (see src/warmup.py), so the first users on a fresh worker
+don't pay for them. GET /ready on --ready-port answers 503 with progress
+until warm-up has finished and 200 afterwards; point the load balancer's
+readiness check at it (Streamlit's /_stcore/health only says the server is up).
+GET /cache/stats on the same port reports the dashboard's query cache
+counters, for tuning its budget and TTL.
+
+Usage:
+    python scripts/serve.py
+    python scripts/serve.py --ready-port 8503 -- --server.port 8501
+    curl -i http://localhost:8503/ready
+    curl http://localhost:8503/cache/stats
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import threading
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'src'))
+
+import tornado.web
+from streamlit.logger import get_logger
+from streamlit.web import cli as streamlit_cli
+
+from warmup import Readiness, ReadinessHandler, start_warm_up
+
+# Threads this launcher starts, which use the cached loaders outside any script run on purpose
+OPERATOR_THREADS = ('warm-up', 'readiness')
+
+# Loggers that warn when st.* caching runs outside a script run
+QUIET_LOGGERS = (
+    'streamlit.runtime.scriptrunner.script_run_context',
+    'streamlit.runtime.caching.cache_data_api',
+    'streamlit.runtime.caching.cache_resource_api',
+)
+
+
+class _SkipOperatorWarnings(logging.Filter):
+    """Drops warnings logged from OPERATOR_THREADS (a filter, as Streamlit resets logger levels on start)"""
+
+    def filter(self, record):
+        return record.threadName not in OPERATOR_THREADS or record.levelno > logging.WARNING
+
+
+class QueryCacheStatsHandler(tornado.web.RequestHandler):
+    """Counters of the process-wide query cache every dashboard session shares"""
+
+    def get(self):
+        from datasets import load_query_cache
+        self.set_header('Cache-Control', 'no-store')
+        self.write(load_query_cache().stats())
+
+
+def serve_readiness(readiness, port, address):
+    """Serve GET /ready and /cache/stats from their own thread and event loop, independent of Streamlit's"""
+    async def run():
+        from datasets import attach_cache_context
+        attach_cache_context()      # So /cache/stats sees the cache the sessions share
+        app = tornado.web.Application([
+            (r'/ready', ReadinessHandler, {'readiness': readiness}),
+            (r'/cache/stats', QueryCacheStatsHandler),
+        ])
+        app.listen(port, address)
+        await asyncio.Event().wait()
+
+    thread = threading.Thread(target=asyncio.run, args=(run(),), name='readiness', daemon=True)
+    thread.start()
+    return thread
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ready-port', type=int, default=8503)
+    parser.add_argument('--ready-address', default='0.0.0.0')
+    parser.add_argument('streamlit_args', nargs='*', help="Passed to `streamlit run` (after --)")
+    args = parser.parse_args(argv)
+
+    os.chdir(REPO_ROOT)     # Data and snapshot paths are relative to the repo root
+    for name in QUIET_LOGGERS:
+        get_logger(name).addFilter(_SkipOperatorWarnings())
+    readiness = Readiness()
+    serve_readiness(readiness, args.ready_port, args.ready_address)
+    start_warm_up(readiness)
+    print(f"🩺 Readiness on http://{args.ready_address}:{args.ready_port}/ready")
+
+    sys.argv = ['streamlit', 'run', str(REPO_ROOT / 'src' / 'app.py'), *args.streamlit_args]
+    streamlit_cli.main()
+
+
+if __name__ == '__main__':
+    main()
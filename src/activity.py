@@ -0,0 +1,116 @@
+"""
+Activity Histograms - Hour-of-week post counts for peak-hour detection
+"""
+import numpy as np
+
+HOURS_PER_DAY = 24
+DAYS_PER_WEEK = 7
+HOURS_PER_WEEK = HOURS_PER_DAY * DAYS_PER_WEEK
+
+# The Unix epoch fell on a Thursday; shift so hour 0 of the week is Monday 00:00 UTC
+EPOCH_HOUR_OFFSET = 3 * HOURS_PER_DAY
+
+DAY_LABELS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+# Day-part buckets used for the per-topic "Peak Time" column
+DAY_PARTS = {
+    'Morning': range(5, 12),
+    'Afternoon': range(12, 17),
+    'Evening': range(17, 21),
+    'Night': [21, 22, 23, 0, 1, 2, 3, 4],
+}
+
+
+def hour_of_week(timestamps):
+    """
+    Bucket epoch timestamps into hour-of-week slots
+    Args:
+        timestamps: Array-like of epoch seconds (UTC)
+    Returns:
+        int64 array of slots in [0, 168), Monday 00:00 = 0
+    """
+    ts = np.asarray(timestamps, dtype=np.int64)
+    return (ts // 3600 + EPOCH_HOUR_OFFSET) % HOURS_PER_WEEK
+
+
+class ActivityHistogram:
+    """
+    Hour-of-week post counts, kept per topic and globally.
+    Counts are accumulated with np.bincount so new batches of timestamps
+    can be folded in incrementally without revisiting earlier posts.
+    """
+
+    def __init__(self, topics):
+        self.topics = list(topics)
+        self._index = {topic: i for i, topic in enumerate(self.topics)}
+        self.counts = np.zeros((len(self.topics), HOURS_PER_WEEK), dtype=np.int64)
+
+    def add(self, timestamps, topic_codes):
+        """
+        Fold a batch of posts into the histogram
+        Args:
+            timestamps: Epoch seconds per post
+            topic_codes: Topic index per post (position in self.topics)
+        """
+        codes = np.asarray(topic_codes, dtype=np.int64)
+        slots = codes * HOURS_PER_WEEK + hour_of_week(timestamps)
+        self.counts += np.bincount(slots, minlength=self.counts.size).reshape(self.counts.shape)
+
+    def topic_counts(self, topic):
+        """Hour-of-week counts for a single topic"""
+        return self.counts[self._index[topic]]
+
+    @property
+    def total(self):
+        """Hour-of-week counts across all topics"""
+        return self.counts.sum(axis=0)
+
+
+def hour_of_day(week_counts):
+    """Fold a 168-slot hour-of-week histogram into 24 hour-of-day totals"""
+    return np.asarray(week_counts).reshape(DAYS_PER_WEEK, HOURS_PER_DAY).sum(axis=0)
+
+
+def peak_window(counts, width):
+    """
+    Busiest contiguous window in a cyclic histogram
+    Args:
+        counts: 1-D histogram (hour-of-day or hour-of-week); wraps around
+        width: Window length in slots
+    Returns:
+        (start_slot, window_total)
+    """
+    counts = np.asarray(counts)
+    wrapped = np.concatenate([counts, counts[:width - 1]])
+    sums = np.convolve(wrapped, np.ones(width, dtype=counts.dtype), mode='valid')
+    start = int(np.argmax(sums))
+    return start, int(sums[start])
+
+
+def format_hour_range(start, width):
+    """
+    Human-readable clock range (e.g., 20, 3 -> "8-11 PM")
+    """
+    def clock(hour):
+        hour %= HOURS_PER_DAY
+        return hour % 12 or 12, 'AM' if hour < 12 else 'PM'
+
+    (h1, m1), (h2, m2) = clock(start), clock(start + width)
+    if m1 == m2:
+        return f"{h1}-{h2} {m2}"
+    return f"{h1} {m1}-{h2} {m2}"
+
+
+def peak_hours(week_counts, width=3):
+    """Busiest daily clock window for an hour-of-week histogram (e.g., "8-11 PM")"""
+    start, _ = peak_window(hour_of_day(week_counts), width)
+    return format_hour_range(start, width)
+
+
+def peak_day_part(week_counts):
+    """Day-part label (Morning/Afternoon/Evening/Night) with the highest hourly post rate (None if no posts)"""
+    if not week_counts.sum():
+        return None
+    daily = hour_of_day(week_counts)
+    totals = {part: daily[list(hours)].mean() for part, hours in DAY_PARTS.items()}
+    return max(totals, key=totals.get)
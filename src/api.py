@@ -0,0 +1,328 @@
+"""
+Read-only JSON API - Third-party access to the dashboard datasets
+Serves the same cached datasets and derived aggregates the tabs use.
+Responses carry version-based ETags (If-None-Match -> 304), are gzip-compressed,
+and lists are cursor-paginated. Run it next to the dashboard from the repo root:
+
+    python src/api.py --port 8502
+
+Endpoints (all GET):
+    /api/v1/trends                  Trending topics (?limit=, ?cursor=)
+    /api/v1/trends/summary          Engagement stats and derived aggregates
+    /api/v1/trends/activity         Hour-of-week histogram (?topic= for one topic)
+    /api/v1/research/<section>      attraction_research.json sections
+    /api/v1/skills/<section>        social_skills.json sections
+    /api/v1/cache/stats             Response cache hit/miss/eviction counters
+    /api/v1/ready                   200 once warm-up has finished, 503 with progress until then
+    /api/v1/export/trends.<fmt>     Full trends export, csv or parquet (?window=, default 7d)
+    /api/v1/export/research/<section>.<fmt>, /api/v1/export/skills/<section>.<fmt>
+                                    One catalog section as csv or parquet
+
+Exports are streamed chunk by chunk, so they never sit in memory whole.
+At start-up the datasets and aggregates are warmed on a background thread
+(see warmup.py); route traffic once /api/v1/ready answers 200.
+"""
+import abc
+import argparse
+import base64
+import binascii
+import hashlib
+import json
+import logging
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+import tornado.ioloop
+import tornado.web
+
+from activity import HOURS_PER_WEEK, peak_hours
+from datasets import (
+    attach_cache_context, dataset_version, load_activity, load_catalog_export, load_dataset, load_peak_times, load_trend_export, load_trends,
+    posts_version
+)
+from exports import FORMATS, stream
+from records import CATALOG_RECORDS
+from rollups import WINDOWS
+from warmup import Readiness, ReadinessHandler, start_warm_up
+from query_cache import QueryCache
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Shared caches may keep a response this long before revalidating with the ETag
+CACHE_MAX_AGE = 60
+
+# Serialized bodies keyed by (handler, uri, version); a new version makes old keys unreachable
+BODY_CACHE_BYTES = 32 * 1024 * 1024
+_bodies = QueryCache(max_bytes=BODY_CACHE_BYTES)
+
+CATALOG_ROUTES = {
+    'research': 'attraction_research',
+    'skills': 'social_skills',
+}
+
+
+def encode_cursor(version, offset):
+    """Opaque cursor for the next page, tied to the dataset version it was issued for"""
+    raw = json.dumps({'v': version[:16], 'o': offset}, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, version):
+    """
+    Offset encoded in a cursor
+    Raises:
+        tornado.web.HTTPError 400 for malformed cursors, 410 if the dataset changed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        fields = json.loads(base64.urlsafe_b64decode(padded))
+        cursor_version, offset = fields['v'], int(fields['o'])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise tornado.web.HTTPError(400, reason="Malformed cursor")
+    if cursor_version != version[:16]:
+        raise tornado.web.HTTPError(410, reason="Dataset changed; restart pagination")
+    return offset
+
+
+class ApiHandler(tornado.web.RequestHandler, metaclass=abc.ABCMeta):
+    """
+    Base handler: subclasses implement version() and payload()
+    The ETag is derived from the dataset version and the request URI, so
+    revalidation is answered with a 304 before any payload is built.
+    """
+
+    def set_default_headers(self):
+        self.set_header('Content-Type', 'application/json; charset=utf-8')
+        self.set_header('Cache-Control', f'public, max-age={CACHE_MAX_AGE}')
+        self.set_header('Access-Control-Allow-Origin', '*')
+
+    @abc.abstractmethod
+    def version(self, *args):
+        """Version of the data behind this route (ETag and body cache key)"""
+
+    @abc.abstractmethod
+    def payload(self, *args):
+        """JSON-serializable response body"""
+
+    def compute_etag(self):
+        return self._etag
+
+    def get(self, *args):
+        version = self.version(*args)
+        digest = hashlib.sha1(f"{version}:{self.request.uri}".encode()).hexdigest()[:20]
+        self._etag = f'"{digest}"'
+        self.set_etag_header()
+        if self.check_etag_header():
+            self.set_status(304)
+            return
+        body = _bodies.get(type(self).__name__, {'uri': self.request.uri}, version,
+                           lambda: json.dumps(self.payload(*args), separators=(',', ':')))
+        self.write(body)
+
+    def head(self, *args):
+        self.get(*args)
+
+    def page_params(self):
+        """(limit, cursor) from the query string"""
+        try:
+            limit = int(self.get_query_argument('limit', DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise tornado.web.HTTPError(400, reason="limit must be an integer")
+        return max(1, min(limit, MAX_PAGE_SIZE)), self.get_query_argument('cursor', None)
+
+    def paginate(self, items, version):
+        """Slice a list into a page plus the cursor for the next one"""
+        limit, cursor = self.page_params()
+        offset = decode_cursor(cursor, version) if cursor else 0
+        page = items[offset:offset + limit]
+        next_offset = offset + len(page)
+        return {
+            'data': page,
+            'next_cursor': encode_cursor(version, next_offset) if next_offset < len(items) else None,
+            'total': len(items),
+        }
+
+    def write_error(self, status_code, **kwargs):
+        self.set_header('Cache-Control', 'no-store')
+        self.finish({'error': {'status': status_code, 'message': self._reason}})
+
+
+def trends_version():
+    return dataset_version('mock_trends') + posts_version()
+
+
+def trend_activity():
+    return load_activity(tuple(load_trends().topics))
+
+
+class TrendsHandler(ApiHandler):
+    def version(self):
+        return trends_version()
+
+    def payload(self):
+        trends = load_trends()
+        peak_times = load_peak_times(tuple(trends.topics))
+        rows = [
+            {
+                'rank': rank,
+                'topic': topic,
+                'volume': int(volume),
+                'sentiment': round(float(sentiment), 2),
+                'velocity': round(float(velocity), 1),
+                'women_interest': int(women),
+                'men_interest': int(men),
+                'peak_time': peak_time,
+            }
+            for rank, (topic, volume, sentiment, velocity, women, men, peak_time) in enumerate(zip(
+                trends.topics, trends['volume'], trends['sentiment'], trends['velocity'],
+                trends['women_interest'], trends['men_interest'], peak_times,
+            ), 1)
+        ]
+        return self.paginate(rows, self.version())
+
+
+class SummaryHandler(ApiHandler):
+    def version(self):
+        return trends_version()
+
+    def payload(self):
+        document, trends, activity = load_dataset('mock_trends'), load_trends(), trend_activity()
+        volume = trends['volume'].astype('int64')
+        return {
+            'engagement_stats': document['engagement_stats'],
+            'topics': len(trends),
+            'total_volume': int(volume.sum()),
+            'volume_weighted_sentiment': round(float((trends['sentiment'] * volume).sum() / max(volume.sum(), 1)), 3),
+            'peak_hours': peak_hours(activity.total) if activity.total.sum() else None,
+            'top_keywords': document['top_keywords'],
+        }
+
+
+class ActivityHandler(ApiHandler):
+    def version(self):
+        return trends_version()
+
+    def payload(self):
+        activity = trend_activity()
+        topic = self.get_query_argument('topic', None)
+        if topic is None:
+            counts = activity.total
+        elif topic in activity.topics:
+            counts = activity.topic_counts(topic)
+        else:
+            raise tornado.web.HTTPError(404, reason="Unknown topic")
+        return {
+            'topic': topic,
+            'slots': HOURS_PER_WEEK,
+            'slot_origin': 'Monday 00:00 UTC',
+            'counts': counts.tolist(),
+            'peak_hours': peak_hours(counts) if counts.sum() else None,     # No posts: no peak
+        }
+
+
+class CatalogHandler(ApiHandler):
+    def dataset(self, route, section):
+        name = CATALOG_ROUTES[route]
+        if section not in load_dataset(name):
+            raise tornado.web.HTTPError(404, reason=f"Unknown section '{section}'")
+        return name
+
+    def version(self, route, section):
+        return dataset_version(self.dataset(route, section))
+
+    def payload(self, route, section):
+        name = self.dataset(route, section)
+        value = load_dataset(name)[section]
+        if isinstance(value, list):
+            return self.paginate(value, self.version(route, section))
+        return {'data': value}
+
+
+class ExportHandler(tornado.web.RequestHandler):
+    """Streams an export, flushing after every chunk so other requests are served in between"""
+
+    def set_default_headers(self):
+        self.set_header('Cache-Control', 'no-store')
+        self.set_header('Access-Control-Allow-Origin', '*')
+
+    def compute_etag(self):
+        return None
+
+    def export(self, route, *args):
+        """(export, format) for the route, or 404/400"""
+        if route == 'trends':
+            fmt, = args
+            window = self.get_query_argument('window', '7d')
+            if window not in WINDOWS:
+                raise tornado.web.HTTPError(400, reason=f"window must be one of {', '.join(WINDOWS)}")
+            return load_trend_export(window)[0], fmt
+        section, fmt = args
+        name = CATALOG_ROUTES[route]
+        if section not in CATALOG_RECORDS[name]:
+            raise tornado.web.HTTPError(404, reason=f"Unknown section '{section}'")
+        return load_catalog_export(name, section)[0], fmt
+
+    async def get(self, *args):
+        export, fmt = self.export(*args)
+        self.set_header('Content-Type', FORMATS[fmt][0])
+        self.set_header('Content-Disposition', f'attachment; filename="{export.name}.{fmt}"')
+        for block in stream(fmt, export.chunks()):
+            self.write(block)
+            await self.flush()
+
+    async def head(self, *args):
+        export, fmt = self.export(*args)
+        self.set_header('Content-Type', FORMATS[fmt][0])
+
+
+class CacheStatsHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.set_header('Cache-Control', 'no-store')
+        self.write(_bodies.stats())
+
+
+def make_app(readiness):
+    catalogs = '|'.join(CATALOG_ROUTES)
+    formats = '|'.join(FORMATS)
+    return tornado.web.Application(
+        [
+            (r'/api/v1/ready', ReadinessHandler, {'readiness': readiness}),
+            (r'/api/v1/trends', TrendsHandler),
+            (r'/api/v1/trends/summary', SummaryHandler),
+            (r'/api/v1/trends/activity', ActivityHandler),
+            (rf'/api/v1/({catalogs})/(\w+)', CatalogHandler),
+            (r'/api/v1/cache/stats', CacheStatsHandler),
+            (rf'/api/v1/export/(trends)\.({formats})', ExportHandler),
+            (rf'/api/v1/export/({catalogs})/(\w+)\.({formats})', ExportHandler),
+        ],
+        compress_response=True,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Read-only JSON API for the dashboard datasets")
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('--address', default='0.0.0.0')
+    args = parser.parse_args(argv)
+
+    # The dataset caches run without a Streamlit session here; that's expected
+    logging.getLogger('streamlit.runtime.caching').setLevel(logging.ERROR)
+    # Handlers run on this thread; without a context the loaders would rebuild on every request
+    attach_cache_context()
+
+    # Listen right away so the readiness check can report progress, and warm up meanwhile
+    readiness = Readiness()
+    start_warm_up(readiness, ui=False)
+    app = make_app(readiness)
+    # HTTP/1.1 keep-alive is on by default; idle connections are closed after 75s
+    app.listen(args.port, args.address, idle_connection_timeout=75, xheaders=True)
+    print(f"📡 API listening on http://{args.address}:{args.port}/api/v1/")
+    tornado.ioloop.IOLoop.current().start()
+
+
+if __name__ == '__main__':
+    main()
@@ -13,6 +13,7 @@ sys.path.insert(0, str(src_path))
 from auth import check_access
 from tabs import tab1_trends, tab2_attraction, tab3_skills
 from design_system import COLORS
+from static_assets import stylesheet_tag
 
 
 # Page configuration
@@ -26,12 +27,8 @@ st.set_page_config(
     }
 )
 
-# Load custom CSS
-try:
-    with open('assets/custom.css') as f:
-        st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
-except FileNotFoundError:
-    pass  # CSS is optional
+# Load custom CSS (minified and fingerprinted once per asset version; optional)
+st.markdown(stylesheet_tag(), unsafe_allow_html=True)
 
 # Check access gate
 check_access()
@@ -0,0 +1,207 @@
+"""
+Batch Folding - Multi-core backfills of the post aggregates behind the Trends tab
+The post corpus is factorized once into flat code arrays (timestamps, topic
+and segment codes, sentiment) placed in shared memory. When the posts carry
+text, their token-ID arrays (text.TokenizedCorpus) and the scorer's lookup
+tables go into shared memory too, and each worker scores its chunk
+(scoring.score_chunk) before folding it, so sentiment comes from the text.
+Workers fold a contiguous chunk into rollups, an activity histogram aligned
+to the same head bucket and keyword mentions per topic, and write the raw
+arrays into their own slab of a shared result block. The parent sums the
+slabs. Nothing but a small spec of block names, shapes and dtypes is pickled
+per task.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+import numpy as np
+from activity import HOURS_PER_WEEK, ActivityHistogram
+from rollups import SEGMENTS, RollupStore
+from scoring import KeywordMentions, score_chunk
+
+MIN_POSTS_PER_WORKER = 250_000     # Smaller corpora are folded in-process; pool start-up would dominate
+
+
+def default_workers():
+    """CPUs this process may run on"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class SharedArrays:
+    """
+    NumPy arrays backed by named shared-memory blocks
+    The owner creates and finally unlinks the blocks; workers attach() by
+    spec and only close them. Pool processes share the owner's resource
+    tracker (spawn passes it on), so attaching doesn't register them twice.
+    """
+
+    def __init__(self):
+        self.blocks = {}
+        self.arrays = {}
+
+    def create(self, name, shape, dtype, source=None):
+        """New zeroed block (or a copy of `source`) exposed as arrays[name]"""
+        dtype = np.dtype(dtype)
+        size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+        block = shared_memory.SharedMemory(create=True, size=size)
+        self.blocks[name] = block
+        array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        if source is None:
+            array[...] = 0
+        else:
+            array[...] = source
+        self.arrays[name] = array
+        return array
+
+    @property
+    def spec(self):
+        """Picklable {name: (block name, shape, dtype)} for attach()"""
+        return {name: (self.blocks[name].name, array.shape, array.dtype.str)
+                for name, array in self.arrays.items()}
+
+    @classmethod
+    def attach(cls, spec):
+        """Map blocks created in another process"""
+        shared = cls()
+        for name, (block_name, shape, dtype) in spec.items():
+            block = shared_memory.SharedMemory(name=block_name)
+            shared.blocks[name] = block
+            shared.arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        return shared
+
+    def close(self, unlink=False):
+        self.arrays.clear()    # Drop the views before closing their buffers
+        for block in self.blocks.values():
+            block.close()
+            if unlink:
+                block.unlink()
+        self.blocks.clear()
+
+
+def fold_chunk(timestamps, topic_codes, segment_codes, sentiments, topics, segments, latest):
+    """
+    Rollups and activity for one chunk, with every tier's head at `latest`
+    Posts with an unknown segment (code -1) count towards activity only.
+    Returns:
+        (RollupStore, ActivityHistogram)
+    """
+    store = RollupStore(topics, segments)
+    store.align(latest)
+    known = np.asarray(segment_codes) >= 0
+    store.add(timestamps[known], topic_codes[known], segment_codes[known], sentiments[known])
+    histogram = ActivityHistogram(topics)
+    histogram.add(timestamps, topic_codes)
+    return store, histogram
+
+
+def _fold_worker(spec, part, start, stop, n_topics, segments, latest):
+    """Pool task: score (if there is text) and fold posts [start, stop) into slab `part` of the result blocks"""
+    shared = SharedArrays.attach(spec)
+    try:
+        arrays = shared.arrays
+        topic_codes = arrays['topic_codes'][start:stop]
+        if 'ids' in arrays:
+            offsets = arrays['offsets'][start:stop + 1]
+            sentiments, mentions = score_chunk(arrays['ids'][offsets[0]:offsets[-1]], offsets,
+                                               arrays['polarity'], arrays['phrases'])
+            arrays['sentiments'][start:stop] = sentiments
+            keywords = KeywordMentions(range(n_topics), range(mentions.shape[1]))
+            keywords.add(topic_codes, mentions)
+            arrays['keywords'][part] = keywords.counts
+        store, histogram = fold_chunk(
+            arrays['timestamps'][start:stop], topic_codes,
+            arrays['segment_codes'][start:stop], arrays['sentiments'][start:stop],
+            range(n_topics), segments, latest,
+        )
+        for name, tier in store.tiers.items():
+            arrays[f'{name}_counts'][part] = tier.counts
+            arrays[f'{name}_sentiment'][part] = tier.sentiment
+        arrays['activity'][part] = histogram.counts
+    finally:
+        shared.close()
+
+
+def fold_posts(timestamps, topic_codes, segment_codes, sentiments, topics, segments=SEGMENTS, workers=None,
+               tokens=None, scorer=None):
+    """
+    Fold a post corpus into rollups, an activity histogram and keyword mentions using a process pool
+    Results match RollupStore.add / ActivityHistogram.add over the whole corpus.
+    Args:
+        timestamps: Epoch seconds per post
+        topic_codes: Topic index per post (position in `topics`)
+        segment_codes: Segment index per post (position in `segments`, -1 if unknown)
+        sentiments: Sentiment per post (ignored when `tokens` is given)
+        topics: Topic names
+        workers: Processes to use (default: every available CPU); corpora too
+            small to be worth a pool are folded in-process
+        tokens: Encoded post text (TokenizedCorpus aligned with the posts) to
+            score for sentiment and keyword mentions
+        scorer: scoring.TextScorer over the vocabulary `tokens` was encoded with
+    Returns:
+        (RollupStore, ActivityHistogram, KeywordMentions); mentions are empty without `tokens`
+    """
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    topic_codes, segment_codes = np.asarray(topic_codes), np.asarray(segment_codes)
+    n_posts, n_topics = len(timestamps), len(topics)
+    scored = tokens is not None
+    if scored:
+        polarity, phrases = scorer.polarity(), scorer.phrases()
+        keywords = KeywordMentions(topics, scorer.keywords)
+    else:
+        sentiments = np.asarray(sentiments, dtype=np.float64)
+        keywords = KeywordMentions(topics)
+    workers = max(1, min(workers or default_workers(), n_posts // MIN_POSTS_PER_WORKER))
+    if n_posts == 0:
+        return RollupStore(topics, segments), ActivityHistogram(topics), keywords
+    latest = int(timestamps.max())
+    if workers == 1:
+        if scored:
+            sentiments, mentions = score_chunk(tokens.ids, tokens.offsets, polarity, phrases)
+            keywords.add(topic_codes, mentions)
+        return fold_chunk(timestamps, topic_codes, segment_codes, sentiments, topics, segments, latest) + (keywords,)
+
+    store = RollupStore(topics, segments)
+    store.align(latest)
+    histogram = ActivityHistogram(topics)
+    shared = SharedArrays()
+    try:
+        shared.create('timestamps', (n_posts,), np.int64, timestamps)
+        shared.create('topic_codes', (n_posts,), np.int32, topic_codes)
+        shared.create('segment_codes', (n_posts,), np.int8, segment_codes)
+        if scored:
+            shared.create('ids', tokens.ids.shape, np.int32, tokens.ids)
+            shared.create('offsets', tokens.offsets.shape, np.int64, tokens.offsets)
+            shared.create('polarity', polarity.shape, np.int8, polarity)
+            shared.create('phrases', phrases.shape, np.int32, phrases)
+            shared.create('sentiments', (n_posts,), np.float64)    # Filled in by the workers
+            shared.create('keywords', (workers,) + keywords.counts.shape, np.int64)
+        else:
+            shared.create('sentiments', (n_posts,), np.float64, sentiments)
+        for name, tier in store.tiers.items():
+            shared.create(f'{name}_counts', (workers,) + tier.counts.shape, np.int64)
+            shared.create(f'{name}_sentiment', (workers,) + tier.sentiment.shape, np.float64)
+        shared.create('activity', (workers, n_topics, HOURS_PER_WEEK), np.int64)
+
+        bounds = np.linspace(0, n_posts, workers + 1).astype(np.int64)
+        spec = shared.spec
+        # spawn rather than fork: the Streamlit server is multi-threaded
+        with ProcessPoolExecutor(workers, mp_context=get_context('spawn')) as pool:
+            tasks = [pool.submit(_fold_worker, spec, part, int(bounds[part]), int(bounds[part + 1]),
+                                 n_topics, tuple(segments), latest)
+                     for part in range(workers)]
+            for task in tasks:
+                task.result()
+
+        arrays = shared.arrays
+        for name, tier in store.tiers.items():
+            arrays[f'{name}_counts'].sum(axis=0, out=tier.counts)
+            arrays[f'{name}_sentiment'].sum(axis=0, out=tier.sentiment)
+        arrays['activity'].sum(axis=0, out=histogram.counts)
+        if scored:
+            arrays['keywords'].sum(axis=0, out=keywords.counts)
+    finally:
+        shared.close(unlink=True)
+    return store, histogram, keywords
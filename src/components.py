@@ -2,8 +2,22 @@
 Reusable UI Components - Polymarket-style design
 """
 import streamlit as st
+import numpy as np
 import plotly.graph_objects as go
+from activity import DAY_LABELS, DAYS_PER_WEEK, HOURS_PER_DAY
 from design_system import COLORS, get_plotly_layout
+from exports import BACKGROUND_ROWS, FORMATS, stream
+from intervals import SENTIMENT_CALLS, sentiment_calls
+
+
+def inline_html(fragment):
+    """
+    Collapse an HTML fragment onto one line
+    Fragments joined into one st.markdown call must not contain blank or
+    indented lines: Markdown ends the HTML block at a blank line and renders
+    what follows an indented one as an escaped code block.
+    """
+    return " ".join(line.strip() for line in fragment.splitlines() if line.strip())
 
 
 def metric_card(label, value, change_value, change_label, is_positive=True):
@@ -135,7 +149,7 @@ def probability_bar(label, yes_prob):
     """, unsafe_allow_html=True)
 
 
-def gender_comparison_chart(categories, women_values, men_values, title):
+def gender_comparison_chart(categories, women_values, men_values, title, women_intervals=None, men_intervals=None):
     """
     Side-by-side gender comparison bar chart
     Args:
@@ -143,24 +157,42 @@ def gender_comparison_chart(categories, women_values, men_values, title):
         women_values: List of values for women
         men_values: List of values for men
         title: Chart title
+        women_intervals: Optional (lows, highs) confidence bounds per category, drawn as error bars
+        men_intervals: Same for men
     """
     fig = go.Figure()
     
-    fig.add_trace(go.Bar(
-        name='Women',
-        x=categories,
-        y=women_values,
-        marker_color=COLORS['women_blue'],
-        hovertemplate='<b>Women</b><br>%{x}: %{y}%<extra></extra>'
-    ))
-    
-    fig.add_trace(go.Bar(
-        name='Men',
-        x=categories,
-        y=men_values,
-        marker_color=COLORS['men_red'],
-        hovertemplate='<b>Men</b><br>%{x}: %{y}%<extra></extra>'
-    ))
+    for name, values, intervals, color in (
+        ('Women', women_values, women_intervals, COLORS['women_blue']),
+        ('Men', men_values, men_intervals, COLORS['men_red']),
+    ):
+        values = np.asarray(values, dtype=float)
+        error_y = None
+        hovertemplate = f'<b>{name}</b><br>%{{x}}: %{{y}}%<extra></extra>'
+        if intervals is not None:
+            lows, highs = (np.asarray(bound, dtype=float) for bound in intervals)
+            error_y = {
+                'type': 'data',
+                'symmetric': False,
+                'array': highs - values,
+                'arrayminus': values - lows,
+                'color': COLORS['text_secondary'],
+                'thickness': 1.5,
+                'width': 4
+            }
+            hovertemplate = (
+                f'<b>{name}</b><br>%{{x}}: %{{y}}%'
+                '<br>CI %{customdata[0]:.0f}–%{customdata[1]:.0f}%<extra></extra>'
+            )
+        fig.add_trace(go.Bar(
+            name=name,
+            x=categories,
+            y=values,
+            error_y=error_y,
+            customdata=np.column_stack(intervals) if intervals is not None else None,
+            marker_color=color,
+            hovertemplate=hovertemplate
+        ))
     
     layout = get_plotly_layout()
     layout.update({
@@ -190,6 +222,56 @@ def gender_comparison_chart(categories, women_values, men_values, title):
     return fig
 
 
+def trait_radar_chart(traits, scores, title):
+    """
+    Radar chart of 0-10 scores per trait
+    Args:
+        traits: List of trait labels
+        scores: List of scores (0-10)
+        title: Chart title
+    """
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatterpolar(
+        r=scores,
+        theta=traits,
+        fill='toself',
+        fillcolor=f"rgba(0, 230, 118, 0.15)",
+        line=dict(color=COLORS['green_primary'], width=3),
+        marker=dict(size=8, color=COLORS['green_primary']),
+        name='Attractiveness Score',
+        hovertemplate='<b>%{theta}</b><br>Score: %{r}/10<extra></extra>'
+    ))
+    
+    layout = get_plotly_layout()
+    layout.update({
+        'polar': {
+            'bgcolor': COLORS['bg_card'],
+            'radialaxis': {
+                'visible': True,
+                'range': [0, 10],
+                'gridcolor': COLORS['border_default'],
+                'tickfont': {'color': COLORS['text_secondary'], 'size': 10}
+            },
+            'angularaxis': {
+                'gridcolor': COLORS['border_default'],
+                'tickfont': {'color': COLORS['text_primary'], 'size': 11}
+            }
+        },
+        'showlegend': False,
+        'title': {
+            'text': title,
+            'font': {'size': 18, 'color': COLORS['text_primary']},
+            'x': 0.5,
+            'xanchor': 'center'
+        },
+        'height': 500
+    })
+    
+    fig.update_layout(**layout)
+    return fig
+
+
 def trend_line_chart(data_x, data_y, title, color=None):
     """
     Smooth line chart for trend analysis
@@ -230,26 +312,174 @@ def trend_line_chart(data_x, data_y, title, color=None):
     return fig
 
 
-def sentiment_indicator(sentiment_score):
+def activity_heatmap(week_counts, title):
+    """
+    Day x hour heatmap of an hour-of-week activity histogram
+    Args:
+        week_counts: 168 post counts, Monday 00:00 UTC first
+        title: Chart title
+    """
+    grid = np.asarray(week_counts).reshape(DAYS_PER_WEEK, HOURS_PER_DAY)
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Heatmap(
+        z=grid,
+        x=list(range(HOURS_PER_DAY)),
+        y=DAY_LABELS,
+        colorscale=[[0, COLORS['bg_card']], [1, COLORS['green_primary']]],
+        showscale=False,
+        hovertemplate='<b>%{y} %{x}:00</b><br>Posts: %{z}<extra></extra>'
+    ))
+    
+    layout = get_plotly_layout()
+    layout.update({
+        'title': {
+            'text': title,
+            'font': {'size': 18, 'color': COLORS['text_primary']},
+            'x': 0.05
+        },
+        'hovermode': 'closest',
+        'height': 320
+    })
+    layout['xaxis'] = {**layout['xaxis'], 'title': 'Hour (UTC)', 'dtick': 2}
+    layout['yaxis'] = {**layout['yaxis'], 'autorange': 'reversed'}
+    
+    fig.update_layout(**layout)
+    return fig
+
+
+# Gender skew colorscale: men (-100) red, balanced purple, women (+100) blue
+SKEW_COLORSCALE = [[0, COLORS['men_red']], [0.5, COLORS['neutral']], [1, COLORS['women_blue']]]
+
+
+def _log_volume_ticks(low, high):
+    """Tick positions (log10) and labels for a log-scale volume axis"""
+    decades = np.arange(np.floor(low), np.ceil(high) + 1)
+    return decades.tolist(), [f"{10 ** d:,.0f}" for d in decades]
+
+
+def topic_landscape_chart(topics, volume, sentiment, skew, title):
+    """
+    WebGL scatter of topics: volume (log) vs sentiment, colored by gender skew
+    Args:
+        topics: Topic labels (hover text)
+        volume, sentiment, skew: Per-topic columns
+        title: Chart title
+    """
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scattergl(
+        x=volume,
+        y=sentiment,
+        text=topics,
+        customdata=skew,
+        mode='markers',
+        marker=dict(
+            size=7 if len(volume) < 1000 else 3,
+            color=skew,
+            colorscale=SKEW_COLORSCALE,
+            cmin=-100,
+            cmax=100,
+            opacity=0.85,
+            colorbar=dict(title='Skew', tickvals=[-100, 0, 100], ticktext=['Men', 'Even', 'Women'])
+        ),
+        hovertemplate='<b>%{text}</b><br>Volume: %{x:,}<br>Sentiment: %{y:+.2f}<br>Skew: %{customdata:+d}<extra></extra>'
+    ))
+    
+    layout = get_plotly_layout()
+    layout.update({
+        'title': {
+            'text': title,
+            'font': {'size': 18, 'color': COLORS['text_primary']},
+            'x': 0.05
+        },
+        'hovermode': 'closest',
+        'showlegend': False,
+        'height': 450
+    })
+    layout['xaxis'] = {**layout['xaxis'], 'title': 'Volume (posts)', 'type': 'log'}
+    layout['yaxis'] = {**layout['yaxis'], 'title': 'Sentiment', 'range': [-1.05, 1.05]}
+    
+    fig.update_layout(**layout)
+    return fig
+
+
+def topic_landscape_density(grid, title):
+    """
+    Density heatmap of a binned topic landscape
+    Args:
+        grid: landscape.LandscapeGrid
+        title: Chart title
+    """
+    x_centers = (grid.volume_edges[:-1] + grid.volume_edges[1:]) / 2
+    y_centers = (grid.sentiment_edges[:-1] + grid.sentiment_edges[1:]) / 2
+    tickvals, ticktext = _log_volume_ticks(grid.volume_edges[0], grid.volume_edges[-1])
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Heatmap(
+        z=np.where(grid.counts > 0, grid.counts, np.nan).T,
+        x=x_centers,
+        y=y_centers,
+        customdata=np.stack([10 ** np.broadcast_to(x_centers, grid.counts.T.shape), grid.skew.T], axis=-1),
+        colorscale=[[0, COLORS['bg_card_hover']], [1, COLORS['green_primary']]],
+        colorbar=dict(title='Topics'),
+        hoverongaps=False,
+        hovertemplate='<b>~%{customdata[0]:,.0f} posts, %{y:+.2f}</b><br>Topics: %{z:,}<br>Mean skew: %{customdata[1]:+.0f}<extra></extra>'
+    ))
+    
+    layout = get_plotly_layout()
+    layout.update({
+        'title': {
+            'text': title,
+            'font': {'size': 18, 'color': COLORS['text_primary']},
+            'x': 0.05
+        },
+        'hovermode': 'closest',
+        'height': 450
+    })
+    layout['xaxis'] = {**layout['xaxis'], 'title': 'Volume (posts)', 'tickvals': tickvals, 'ticktext': ticktext}
+    layout['yaxis'] = {**layout['yaxis'], 'title': 'Sentiment'}
+    
+    fig.update_layout(**layout)
+    return fig
+
+
+# Sentiment call (intervals.SENTIMENT_CALLS) -> (color, emoji)
+SENTIMENT_STYLES = {
+    'Positive': (COLORS['green_primary'], "😊"),
+    'Neutral': (COLORS['neutral'], "😐"),
+    'Negative': (COLORS['red_primary'], "😟"),
+    'Uncertain': (COLORS['warning'], "🤔"),
+}
+
+
+def sentiment_call(sentiment_score, interval=None):
+    """
+    Positive/Neutral/Negative at ±0.3, or Uncertain when the interval straddles a threshold
+    Args:
+        sentiment_score: Float between -1 and 1
+        interval: Optional (low, high) confidence interval around the score
+    """
+    low, high = interval if interval is not None else (sentiment_score, sentiment_score)
+    return SENTIMENT_CALLS[int(sentiment_calls(low, high))]
+
+
+def sentiment_indicator(sentiment_score, interval=None):
     """
     Display sentiment with colored indicator
     Args:
         sentiment_score: Float between -1 and 1
+        interval: Optional (low, high) confidence interval, shown next to the score
     Returns:
         HTML for sentiment display
     """
-    if sentiment_score > 0.3:
-        color = COLORS['green_primary']
-        label = "Positive"
-        emoji = "😊"
-    elif sentiment_score < -0.3:
-        color = COLORS['red_primary']
-        label = "Negative"
-        emoji = "😟"
-    else:
-        color = COLORS['neutral']
-        label = "Neutral"
-        emoji = "😐"
+    label = sentiment_call(sentiment_score, interval)
+    color, emoji = SENTIMENT_STYLES[label]
+    detail = f"{sentiment_score:+.2f}"
+    if interval is not None:
+        detail += f", CI {interval[0]:+.2f} to {interval[1]:+.2f}"
     
     return f"""
     <span style="
@@ -260,7 +490,7 @@ def sentiment_indicator(sentiment_score):
         font-size: 12px;
         font-weight: 600;
     ">
-        {emoji} {label} ({sentiment_score:+.2f})
+        {emoji} {label} ({detail})
     </span>
     """
 
@@ -302,3 +532,84 @@ def info_card(title, content, icon="ℹ️"):
         </p>
     </div>
     """, unsafe_allow_html=True)
+
+
+def disclosure_list(items, title, summary, key, item_keys=None):
+    """
+    Titles and summaries up front, details rendered only for opened items
+    Unlike st.expander, whose body is built and sent whether or not it is
+    opened, each row has a toggle and the caller renders the detail body only
+    for toggled rows - so payload scales with what users open.
+    Args:
+        items: Sequence of records
+        title: Function giving an item's title (markdown)
+        summary: Function giving an item's one-line summary
+        key: Widget key prefix, unique per list
+        item_keys: Stable id per item for its toggle's key (default: position);
+            pass one for reorderable lists so an opened row follows its item
+    Yields:
+        Each opened item, right after its row, so the caller can render its details
+    """
+    if item_keys is None:
+        item_keys = range(len(items))
+    for item_key, item in zip(item_keys, items):
+        col1, col2 = st.columns([6, 1])
+        with col1:
+            st.markdown(title(item))
+            st.caption(summary(item))
+        with col2:
+            opened = st.toggle("Details", key=f"{key}_{item_key}")
+        if opened:
+            yield item
+
+
+def export_panel(export, version, jobs, key):
+    """
+    CSV/Parquet export controls, built only when opened
+    Exports up to exports.BACKGROUND_ROWS rows are encoded on request and
+    handed to the browser; larger ones are queued on the background writer,
+    so a rerun never waits on them, and the finished file's path is shown.
+    Args:
+        export: exports.TrendExport or exports.CatalogExport
+        version: Data version the export reflects (jobs are keyed by it)
+        jobs: exports.ExportJobs
+        key: Widget key prefix, unique per panel
+    """
+    if not st.toggle(f"⬇️ Export {export.rows:,} rows", key=f"{key}_open"):
+        return
+    
+    fmt = st.radio(
+        "Format",
+        list(FORMATS),
+        format_func=str.upper,
+        horizontal=True,
+        key=f"{key}_format"
+    )
+    filename = f"{export.name}.{fmt}"
+    
+    if export.rows <= BACKGROUND_ROWS:
+        if st.button("Prepare download", key=f"{key}_prepare"):
+            st.download_button(
+                f"💾 Download {filename}",
+                b"".join(stream(fmt, export.chunks())),
+                file_name=filename,
+                mime=FORMATS[fmt][0],
+                key=f"{key}_download"
+            )
+        return
+    
+    job = jobs.find(export, fmt, version)
+    if job is None:
+        if not st.button("Export in background", key=f"{key}_submit"):
+            st.caption(f"Exports over {BACKGROUND_ROWS:,} rows are written to disk by a background worker")
+            return
+        job = jobs.submit(export, fmt, version)
+    
+    if job.status == 'done':
+        st.success(f"✅ {filename} written to `{job.path}` ({job.size / 1e6:.1f} MB)")
+    elif job.status == 'failed':
+        st.error(f"❌ Export failed: {job.error}")
+        st.button("Retry", key=f"{key}_retry", on_click=jobs.submit, args=(export, fmt, version))
+    else:
+        st.progress(job.progress, text=f"Writing {filename}: {job.written:,} of {job.rows:,} rows")
+        st.button("🔄 Refresh", key=f"{key}_refresh")
@@ -0,0 +1,120 @@
+"""
+Trend Cube - Pre-aggregated measures over the Trends tab's slicing dimensions
+Every topic falls in one cell of a small dense cube (gender skew x peak time x
+sentiment band x velocity band). Measures are summed per cell once per
+snapshot, so any combination of filters is a handful of array reductions over
+at most a few hundred cells, independent of the number of topics or posts.
+"""
+import numpy as np
+from activity import DAY_PARTS
+
+NO_POSTS = 'No posts'    # Peak-time band of topics without any posts
+
+# Dimension -> band labels, in cube axis order
+DIMENSIONS = {
+    'gender_skew': ('Women-leaning', 'Balanced', 'Men-leaning'),
+    'peak_time': tuple(DAY_PARTS) + (NO_POSTS,),
+    'sentiment': ('Negative', 'Neutral', 'Positive'),
+    'velocity': ('New', 'Declining', 'Steady', 'Rising', 'Surging'),
+}
+
+SKEW_BALANCED = 10                       # |women - men| interest points counted as balanced
+SENTIMENT_THRESHOLD = 0.3                # Matches components.sentiment_indicator
+VELOCITY_EDGES = (-10.0, 10.0, 50.0)     # Declining | Steady | Rising | Surging (% change)
+
+# Summed per cell
+MEASURES = (
+    'topics',
+    'active',
+    'previous_active',
+    'volume',
+    'previous_volume',
+    'sentiment_sum',
+    'previous_sentiment_sum',
+    'women_interest',
+    'men_interest',
+)
+
+
+def skew_band(women_interest, men_interest):
+    """Band code per topic: 0 women-leaning, 1 balanced, 2 men-leaning"""
+    skew = women_interest.astype(np.int16) - men_interest.astype(np.int16)
+    return np.where(skew >= SKEW_BALANCED, 0, np.where(skew <= -SKEW_BALANCED, 2, 1))
+
+
+def peak_time_band(peak_times):
+    """Band code per topic: position in DAY_PARTS, or NO_POSTS for topics without a peak (None)"""
+    labels = list(DIMENSIONS['peak_time'])
+    return np.array([labels.index(NO_POSTS if label is None else label) for label in peak_times])
+
+
+def sentiment_band(sentiment):
+    """Band code per topic: 0 negative, 1 neutral, 2 positive (no posts counts as neutral)"""
+    sentiment = np.nan_to_num(sentiment, nan=0.0)
+    return np.where(sentiment > SENTIMENT_THRESHOLD, 2, np.where(sentiment < -SENTIMENT_THRESHOLD, 0, 1))
+
+
+def velocity_band(growth):
+    """Band code per topic: 0 new (no previous posts), then declining..surging"""
+    return np.where(np.isnan(growth), 0, 1 + np.digitize(np.nan_to_num(growth), VELOCITY_EDGES))
+
+
+class TrendCube:
+    """
+    Dense per-cell measure sums plus each topic's cell
+    A selection maps dimension name -> iterable of band labels; missing or
+    empty dimensions mean "all bands".
+    """
+    __slots__ = ('shape', 'measures', 'topic_cells')
+
+    def __init__(self, shape, measures, topic_cells):
+        self.shape = shape
+        self.measures = measures          # (len(MEASURES),) + shape
+        self.topic_cells = topic_cells    # Flat cell index per topic
+
+    @classmethod
+    def build(cls, codes, values):
+        """
+        Aggregate per-topic measures into the cube
+        Args:
+            codes: Dict of dimension -> band code per topic
+            values: Dict of measure -> value per topic
+        """
+        shape = tuple(len(labels) for labels in DIMENSIONS.values())
+        topic_cells = np.ravel_multi_index([codes[name] for name in DIMENSIONS], shape)
+        size = int(np.prod(shape))
+        measures = np.stack([
+            np.bincount(topic_cells, weights=np.asarray(values[name], dtype=np.float64), minlength=size)
+            for name in MEASURES
+        ]).reshape((len(MEASURES),) + shape)
+        return cls(shape, measures, topic_cells)
+
+    def _index(self, selection):
+        """np.ix_ index selecting the chosen bands on every axis"""
+        axes = []
+        for name, labels in DIMENSIONS.items():
+            chosen = (selection or {}).get(name)
+            axes.append([labels.index(label) for label in chosen] if chosen else range(len(labels)))
+        return np.ix_(*axes)
+
+    def cell_mask(self, selection):
+        """Boolean cube of the selected cells"""
+        mask = np.zeros(self.shape, dtype=bool)
+        mask[self._index(selection)] = True
+        return mask
+
+    def totals(self, selection=None):
+        """Sum of every measure over the selected cells"""
+        cells = self.measures[(slice(None),) + self._index(selection)]
+        return dict(zip(MEASURES, cells.reshape(len(MEASURES), -1).sum(axis=1)))
+
+    def marginal(self, dimension, measure='topics', selection=None):
+        """Measure per band of one dimension, under the other dimensions' filters"""
+        others = {name: labels for name, labels in (selection or {}).items() if name != dimension}
+        cells = self.measures[MEASURES.index(measure)][self._index(others)]
+        axis = list(DIMENSIONS).index(dimension)
+        return cells.sum(axis=tuple(i for i in range(cells.ndim) if i != axis))
+
+    def topic_mask(self, selection):
+        """Topics that fall in the selected cells"""
+        return self.cell_mask(selection).ravel()[self.topic_cells]
@@ -0,0 +1,625 @@
+"""
+Datasets - Cached loaders for the files under data/
+In development every loader reads data/ directly. In production
+(DASHBOARD_ENV=production) they serve the prepared objects of the current
+snapshot built by scripts/build_snapshot.py, and data/ is never read.
+"""
+import hashlib
+import json
+import os
+import streamlit as st
+import numpy as np
+import pandas as pd
+from streamlit.runtime.memory_uploaded_file_manager import MemoryUploadedFileManager
+from streamlit.runtime.scriptrunner import ScriptRunContext, add_script_run_ctx
+from streamlit.runtime.state import SafeSessionState, SessionState
+from activity import peak_day_part
+from batch import fold_posts
+from cube import TrendCube, peak_time_band, sentiment_band, skew_band, velocity_band
+from exports import CatalogExport, ExportJobs, TrendExport
+from hll import ParticipantSketches
+from intervals import TopicIntervals
+from landscape import bin_landscape, gender_skew
+from records import TrendTable, build_catalog
+from ranking import SIGNAL_FIELDS, TIP_FIELDS, TfidfIndex
+from post_index import PostIndex
+from query_cache import QueryCache
+from related import build_related
+from rollups import SEGMENTS
+from scoring import TextScorer
+from sparklines import Sparklines
+from spikes import SpikeDetector
+from text import Tokenizer
+from schema import SchemaError, validate
+from snapshot import POINTER_NAME, current_path, read_snapshot
+
+# Point DASHBOARD_DATA_DIR at generated data (scripts/generate_data.py) for scaling tests
+DATA_DIR = os.environ.get('DASHBOARD_DATA_DIR', 'data')
+
+DATASET_PATHS = {
+    'mock_trends': os.path.join(DATA_DIR, 'mock_trends.json'),
+    'attraction_research': os.path.join(DATA_DIR, 'attraction_research.json'),
+    'social_skills': os.path.join(DATA_DIR, 'social_skills.json'),
+}
+
+POSTS_PATH = os.path.join(DATA_DIR, 'mock_posts.csv')
+
+SNAPSHOT_DIR = 'snapshots'
+QUERY_CACHE_BYTES = 64 * 1024 * 1024
+DEVELOPMENT = os.environ.get('DASHBOARD_ENV', 'development') == 'development'
+
+# Processes used to fold the post log into rollups (scripts/build_snapshot.py --workers)
+BATCH_WORKERS = int(os.environ.get('DASHBOARD_BATCH_WORKERS', '1'))
+
+
+def _file_version(path):
+    """(mtime, size) pair used to notice edits without re-reading the file"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def attach_cache_context(thread=None):
+    """
+    Let a thread outside any script run share the cached loaders' results
+    st.cache_resource and st.cache_data neither read nor store results
+    without a ScriptRunContext, so warm-up, API and operator threads would
+    rebuild everything on every call. This attaches an empty, session-less
+    context (no widgets; any messages are dropped).
+    Args:
+        thread: Thread to attach to, before it starts (default: the current thread)
+    """
+    ctx = ScriptRunContext(
+        session_id='loaders',
+        _enqueue=lambda msg: None,
+        query_string='',
+        session_state=SafeSessionState(SessionState(), lambda: None),
+        uploaded_file_mgr=MemoryUploadedFileManager('/_stcore/upload_file'),
+        page_script_hash='',
+        user_info={'email': None},
+    )
+    add_script_run_ctx(thread, ctx)
+
+
+def load_snapshot():
+    """
+    Current snapshot, or None in development
+    Only the CURRENT pointer is stat()ed per call; a new snapshot is mapped
+    when the pointer changes.
+    Raises:
+        FileNotFoundError in production if no snapshot has been built
+    """
+    if DEVELOPMENT:
+        return None
+    pointer = os.path.join(SNAPSHOT_DIR, POINTER_NAME)
+    try:
+        version = _file_version(pointer)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"No snapshot in {SNAPSHOT_DIR}/ - run `python scripts/build_snapshot.py`") from None
+    return _read_snapshot(*version)
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _read_snapshot(mtime_ns, size):
+    return read_snapshot(current_path(SNAPSHOT_DIR))
+
+
+def _snapshot_part(name, path=POSTS_PATH):
+    """Prepared object from the current snapshot (None in development or for another post log)"""
+    snapshot = load_snapshot()
+    if snapshot is None or path != POSTS_PATH:
+        return None
+    return snapshot[name]
+
+
+@st.cache_resource(show_spinner=False)
+def load_query_cache():
+    """Process-wide query result cache shared by every session"""
+    return QueryCache(max_bytes=QUERY_CACHE_BYTES)
+
+
+@st.cache_resource(show_spinner=False)
+def load_export_jobs():
+    """Process-wide background writer for large exports"""
+    return ExportJobs()
+
+
+def data_version():
+    """Version of everything derived from the trends and the post log (query cache key)"""
+    snapshot = load_snapshot()
+    if snapshot is not None:
+        return snapshot.version
+    return _file_version(DATASET_PATHS['mock_trends']), _file_version(POSTS_PATH)
+
+
+@st.cache_resource(show_spinner=False)
+def load_tokenizer():
+    """Process-wide tokenizer, so every stage shares one vocabulary and encoding cache"""
+    return Tokenizer()
+
+
+def load_dataset(name):
+    """
+    Load and validate a JSON dataset
+    Only a stat() runs per rerun; the file is re-read when its mtime or size
+    changes, and re-validated only when its content hash changes. A failure
+    is cached the same way, so a bad file isn't re-read until it changes.
+    The document is shared across sessions - treat it as read-only.
+    Args:
+        name: Dataset name (key in DATASET_PATHS)
+    Raises:
+        schema.SchemaError if the document does not match its schema
+    """
+    documents = _snapshot_part('documents')
+    if documents is not None:
+        return documents[name]
+    document, _ = _current_dataset(name)
+    return document
+
+
+def dataset_version(name):
+    """Content hash (sha256 hex) of the current version of a JSON dataset"""
+    digests = _snapshot_part('digests')
+    if digests is not None:
+        return digests[name]
+    _, digest = _current_dataset(name)
+    return digest
+
+
+def _current_dataset(name):
+    """(document, digest) of the file on disk; raises SchemaError, cached per file version, if it is invalid"""
+    path = DATASET_PATHS[name]
+    document, digest, errors = _read_dataset(name, path, *_file_version(path))
+    if errors:
+        raise SchemaError(path, errors)
+    return document, digest
+
+
+@st.cache_resource(show_spinner=False)
+def _read_dataset(name, path, mtime_ns, size):
+    """(document, digest, validation errors); failures are returned rather than raised so they are cached too"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    try:
+        document = json.loads(raw)
+    except json.JSONDecodeError as e:
+        return None, digest, [f"invalid JSON: {e}"]
+    try:
+        validate(name, document, digest, source=path)
+    except SchemaError as e:
+        return None, digest, e.errors
+    return document, digest, []
+
+
+def load_trends():
+    """Trending topics as a column-wise TrendTable, by curated volume (shared, read-only)"""
+    trends = _snapshot_part('trends')
+    if trends is not None:
+        return trends
+    path = DATASET_PATHS['mock_trends']
+    return _build_trends(*_file_version(path))
+
+
+@st.cache_resource(show_spinner=False)
+def _build_trends(mtime_ns, size):
+    trends = TrendTable.from_records(load_dataset('mock_trends')['trends'])
+    return trends.take(np.argsort(-trends['volume'], kind='stable'))
+
+
+def _trends_key():
+    """Cache key for structures derived from the trends alone"""
+    snapshot = load_snapshot()
+    return snapshot.version if snapshot is not None else _file_version(DATASET_PATHS['mock_trends'])
+
+
+def load_landscape_grid(volume_range, sentiment_range):
+    """
+    Binned topic landscape for one view (zoom level)
+    Grids are cached per dataset version and view, so returning to a view is free.
+    Args:
+        volume_range: (low, high) posts
+        sentiment_range: (low, high) sentiment
+    """
+    return _build_landscape_grid(volume_range, sentiment_range, _trends_key())
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _build_landscape_grid(volume_range, sentiment_range, trends_key):
+    trends = load_trends()
+    skew = gender_skew(trends['women_interest'], trends['men_interest'])
+    return bin_landscape(trends['volume'], trends['sentiment'], skew, volume_range, sentiment_range)
+
+
+def load_catalog(name):
+    """
+    Research or skills dataset with list sections converted to __slots__ records
+    Args:
+        name: 'attraction_research' or 'social_skills'
+    """
+    catalogs = _snapshot_part('catalogs')
+    if catalogs is not None:
+        return catalogs[name]
+    return _build_catalog(name, *_file_version(DATASET_PATHS[name]))
+
+
+@st.cache_resource(show_spinner=False)
+def _build_catalog(name, mtime_ns, size):
+    return build_catalog(name, load_dataset(name))
+
+
+def load_tip_rankers():
+    """
+    TF-IDF indexes for the ranked social_skills sections
+    Rebuilt only when social_skills.json changes.
+    Returns:
+        Dict of section -> ranking.TfidfIndex
+    """
+    rankers = _snapshot_part('tip_rankers')
+    if rankers is not None:
+        return rankers
+    return _build_tip_rankers(*_file_version(DATASET_PATHS['social_skills']))
+
+
+@st.cache_resource(show_spinner=False)
+def _build_tip_rankers(mtime_ns, size):
+    data, tokenizer = load_catalog('social_skills'), load_tokenizer()
+    return {
+        'communication_tips': TfidfIndex.build(data['communication_tips'], TIP_FIELDS, tokenizer, 'effectiveness'),
+        'body_language': TfidfIndex.build(data['body_language'], SIGNAL_FIELDS, tokenizer),
+    }
+
+
+def posts_version(path=POSTS_PATH):
+    """Content hash (sha256 hex) of the current post log"""
+    digest = _snapshot_part('posts_version', path)
+    if digest is not None:
+        return digest
+    return _file_digest(path, *_file_version(path))
+
+
+@st.cache_resource(show_spinner=False)
+def _file_digest(path, mtime_ns, size):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@st.cache_data(show_spinner=False)
+def load_posts(path=POSTS_PATH):
+    """
+    Post log behind the trending topics (one row per post)
+    Columns: id, timestamp (epoch seconds, UTC), topic, author, gender, sentiment,
+    and optionally text (scored for sentiment and keywords, see load_keywords)
+    """
+    return pd.read_csv(path, dtype={'id': 'int64', 'timestamp': 'int64'})
+
+
+def load_activity(topics, path=POSTS_PATH):
+    """
+    Hour-of-week activity histogram for the given topics (shared, read-only)
+    Args:
+        topics: Tuple of topic names (posts for other topics are ignored)
+        path: Post log to bucket
+    """
+    activity = _snapshot_part('activity', path)
+    if activity is not None:
+        return activity
+    return _build_aggregates(topics, _keywords(), path, *_file_version(path))[1]
+
+
+def load_keywords(topics, path=POSTS_PATH):
+    """
+    Mentions of the top keywords per topic, scored from the post text (shared, read-only)
+    Empty (no keywords) when the post log has no text column.
+    Args:
+        topics: Tuple of topic names (posts for other topics are ignored)
+    """
+    keywords = _snapshot_part('keywords', path)
+    if keywords is not None:
+        return keywords
+    return _build_aggregates(topics, _keywords(), path, *_file_version(path))[2]
+
+
+def _keywords():
+    """Top keywords of the trends document, women's then men's, without repeats"""
+    top_keywords = load_dataset('mock_trends')['top_keywords']
+    return tuple(dict.fromkeys(top_keywords['women'] + top_keywords['men']))
+
+
+@st.cache_resource(show_spinner=False)
+def _build_aggregates(topics, keywords, path, mtime_ns, size):
+    """
+    Rollups, activity histogram and keyword mentions in one pass over the log (see batch.fold_posts)
+    Posts with text are tokenized with the shared tokenizer and scored in the
+    pool, so their sentiment comes from the text rather than the sentiment column.
+    """
+    posts = load_posts(path)
+    topic_codes = pd.Categorical(posts['topic'], categories=topics).codes
+    known = topic_codes >= 0
+    tokens = scorer = None
+    if 'text' in posts:
+        tokenizer = load_tokenizer()
+        scorer = TextScorer(tokenizer.vocabulary, keywords)
+        tokens = tokenizer.encode_batch(posts['text'].fillna('').to_numpy()[known])
+    return fold_posts(
+        posts['timestamp'].to_numpy()[known],
+        topic_codes[known],
+        pd.Categorical(posts['gender'], categories=SEGMENTS).codes[known],
+        posts['sentiment'].to_numpy()[known],
+        topics,
+        workers=BATCH_WORKERS,
+        tokens=tokens,
+        scorer=scorer,
+    )
+
+
+def load_peak_times(topics, path=POSTS_PATH):
+    """Peak day-part label (Morning/Afternoon/Evening/Night, None if no posts) per topic, from the activity histogram"""
+    labels = _snapshot_part('peak_times', path)
+    if labels is not None:
+        return labels
+    return _build_peak_times(topics, path, *_file_version(path))
+
+
+@st.cache_resource(show_spinner=False)
+def _build_peak_times(topics, path, mtime_ns, size):
+    activity = load_activity(topics, path)
+    return tuple(peak_day_part(activity.topic_counts(topic)) for topic in topics)
+
+
+def load_rollups(topics, path=POSTS_PATH):
+    """
+    Hourly/daily/weekly rollups of the post log for the given topics
+    Built once per post-log version and shared across sessions (read-only).
+    Args:
+        topics: Tuple of topic names (posts for other topics are ignored)
+    """
+    rollups = _snapshot_part('rollups', path)
+    if rollups is not None:
+        return rollups
+    return _build_aggregates(topics, _keywords(), path, *_file_version(path))[0]
+
+
+def load_sparklines(topics, path=POSTS_PATH):
+    """Per-topic sparkline series for every time window (shared, read-only)"""
+    sparklines = _snapshot_part('sparklines', path)
+    if sparklines is not None:
+        return sparklines
+    return _build_sparklines(topics, path, *_file_version(path))
+
+
+@st.cache_resource(show_spinner=False)
+def _build_sparklines(topics, path, mtime_ns, size):
+    return Sparklines(load_rollups(topics, path))
+
+
+def load_spike_detector(topics, path=POSTS_PATH):
+    """Spike detector fed with the post log in time order (shared, read-only)"""
+    detector = _snapshot_part('spike_detector', path)
+    if detector is not None:
+        return detector
+    return _build_spike_detector(topics, path, *_file_version(path))
+
+
+@st.cache_resource(show_spinner=False)
+def _build_spike_detector(topics, path, mtime_ns, size):
+    posts = load_posts(path).sort_values('timestamp', kind='stable')
+    detector = SpikeDetector(topics)
+    topic_codes = pd.Categorical(posts['topic'], categories=detector.topics).codes
+    known = topic_codes >= 0
+    detector.observe(posts['timestamp'].to_numpy()[known], topic_codes[known])
+    return detector
+
+
+def load_cube(topics, window, path=POSTS_PATH):
+    """
+    Trend cube for one time window, rebuilt when the trends or the post log change
+    Args:
+        topics: Tuple of topic names, in TrendTable order
+        window: Key of rollups.WINDOWS
+    """
+    cubes = _snapshot_part('cubes', path)
+    if cubes is not None:
+        return cubes[window]
+    return _build_cube(topics, window, path, _file_version(path), _trends_key())
+
+
+@st.cache_resource(show_spinner=False)
+def _build_cube(topics, window, path, posts_version, trends_key):
+    trends = load_trends()
+    comparison = load_rollups(topics, path).compare(window)
+    previous_volume = comparison.previous_volume()
+    codes = {
+        'gender_skew': skew_band(trends['women_interest'], trends['men_interest']),
+        'peak_time': peak_time_band(load_peak_times(topics, path)),
+        'sentiment': sentiment_band(comparison.topic_sentiment()),
+        'velocity': velocity_band(comparison.growth()),
+    }
+    values = {
+        'topics': np.ones(len(topics)),
+        'active': comparison.volume() > 0,
+        'previous_active': previous_volume > 0,
+        'volume': comparison.volume(),
+        'previous_volume': previous_volume,
+        'sentiment_sum': comparison.sentiment.sum(axis=1),
+        'previous_sentiment_sum': comparison.previous_sentiment.sum(axis=1),
+        'women_interest': trends['women_interest'],
+        'men_interest': trends['men_interest'],
+    }
+    return TrendCube.build(codes, values)
+
+
+def load_participants(topics, path=POSTS_PATH):
+    """Distinct-author HyperLogLog sketches per window, topic and segment (shared, read-only)"""
+    sketches = _snapshot_part('participants', path)
+    if sketches is not None:
+        return sketches
+    return _build_participants(topics, path, *_file_version(path))
+
+
+@st.cache_resource(show_spinner=False)
+def _build_participants(topics, path, mtime_ns, size):
+    posts = load_posts(path)
+    topic_codes = pd.Categorical(posts['topic'], categories=topics).codes
+    known = topic_codes >= 0
+    timestamps = posts['timestamp'].to_numpy()[known]
+    sketches = ParticipantSketches(len(topics), int(timestamps.max()) if len(timestamps) else 0)
+    sketches.add(
+        timestamps,
+        topic_codes[known],
+        pd.Categorical(posts['gender'], categories=SEGMENTS).codes[known],
+        pd.util.hash_array(posts['author'].to_numpy()[known]),
+    )
+    return sketches
+
+
+def load_intervals(topics, path=POSTS_PATH):
+    """
+    Sentiment and interest confidence intervals per topic, rebuilt when the trends or the post log change
+    Args:
+        topics: Tuple of topic names, in TrendTable order
+    """
+    intervals = _snapshot_part('intervals', path)
+    if intervals is not None:
+        return intervals
+    return _build_intervals(topics, path, _file_version(path), _trends_key())
+
+
+@st.cache_resource(show_spinner=False)
+def _build_intervals(topics, path, posts_version, trends_key):
+    trends = load_trends()
+    posts = load_posts(path)
+    topic_codes = pd.Categorical(posts['topic'], categories=topics).codes
+    known = topic_codes >= 0
+    return TopicIntervals.build(
+        posts['timestamp'].to_numpy()[known],
+        topic_codes[known],
+        pd.Categorical(posts['gender'], categories=SEGMENTS).codes[known],
+        posts['sentiment'].to_numpy()[known],
+        {segment: trends[f'{segment}_interest'] for segment in SEGMENTS},
+    )
+
+
+def load_related(topics, path=POSTS_PATH):
+    """Top-k related topics by shared authors, rebuilt per post-log version (shared, read-only)"""
+    related = _snapshot_part('related', path)
+    if related is not None:
+        return related
+    return _build_related(topics, path, *_file_version(path))
+
+
+@st.cache_resource(show_spinner=False)
+def _build_related(topics, path, mtime_ns, size):
+    posts = load_posts(path)
+    topic_codes = pd.Categorical(posts['topic'], categories=topics).codes
+    known = topic_codes >= 0
+    author_codes, _ = pd.factorize(posts['author'][known])
+    return build_related(author_codes, topic_codes[known], topics)
+
+
+def load_post_index(topics, path=POSTS_PATH):
+    """Per-topic covering indexes over the post log, for the drill-down view (shared, read-only)"""
+    index = _snapshot_part('post_index', path)
+    if index is not None:
+        return index
+    return _build_post_index(topics, path, *_file_version(path))
+
+
+@st.cache_resource(show_spinner=False)
+def _build_post_index(topics, path, mtime_ns, size):
+    posts = load_posts(path)
+    topic_codes = pd.Categorical(posts['topic'], categories=topics).codes
+    known = topic_codes >= 0
+    posts = posts[known]
+    author_codes, author_names = pd.factorize(posts['author'])
+    gender_codes, gender_names = pd.factorize(posts['gender'])
+    return PostIndex.build(
+        posts['id'].to_numpy(), posts['timestamp'].to_numpy(), posts['sentiment'].to_numpy(),
+        topic_codes[known], topics, author_codes, author_names, gender_codes, gender_names,
+    )
+
+
+def query_trends_view(window, selection, limit):
+    """
+    Everything the Trends tab derives from one window + filter combination
+    Served from the process-wide query cache, so sessions asking for the same
+    combination share one computation. The result is shared: read-only.
+    Args:
+        window: Key of rollups.WINDOWS
+        selection: Cube selection (dimension -> band labels)
+        limit: Rows in the top-topics table
+    Returns:
+        Dict with 'totals' (cube measures), 'selected' (topic mask),
+        'activity' (hour-of-week counts of the selected topics),
+        'participants' (distinct-author estimates), 'order' (table rows as
+        topic indices) and 'rows' (table columns, with sentiment confidence bounds)
+    """
+    params = {'window': window, 'selection': selection, 'limit': limit}
+    return load_query_cache().get('trends_view', params, data_version(),
+                                  lambda: _trends_view(window, selection, limit))
+
+
+def _trends_view(window, selection, limit):
+    topics = tuple(load_trends().topics)
+    comparison = load_rollups(topics).compare(window)
+    volume, growth = comparison.volume(), comparison.growth()
+    cube = load_cube(topics, window)
+    selected = cube.topic_mask(selection)
+    participants = load_participants(topics)
+
+    # Top filtered topics by window volume, ties broken by growth
+    candidates = np.flatnonzero(selected)
+    order = candidates[np.lexsort((-np.nan_to_num(growth[candidates], nan=-np.inf), -volume[candidates]))][:limit]
+    volume_history, sentiment_history = load_sparklines(topics).rows(window, order)
+    peak_times = load_peak_times(topics)
+    keywords = load_keywords(topics)
+    sentiment_low, sentiment_high = load_intervals(topics).sentiment[window]
+    return {
+        'totals': cube.totals(selection),
+        'selected': selected,
+        'activity': load_activity(topics).counts[selected].sum(axis=0),
+        'participants': {
+            'current': participants.count(window, selected),
+            'previous': participants.count(window, selected, previous=True),
+            'segments': [participants.count(window, selected, segment=i) for i in range(len(SEGMENTS))],
+            'relative_error': participants.relative_error,
+        },
+        'keywords_scored': bool(keywords.keywords),
+        'order': order,
+        'rows': {
+            'volume': volume[order],
+            'participants': np.rint(participants.topic_counts(window)[order]).astype(int),
+            'sentiment': comparison.topic_sentiment()[order],
+            'sentiment_low': sentiment_low[order],
+            'sentiment_high': sentiment_high[order],
+            'growth': growth[order],
+            'volume_history': volume_history,
+            'sentiment_history': sentiment_history,
+            'peak_time': [peak_times[i] for i in order],
+            'keyword': keywords.top(order),
+        },
+    }
+
+
+def load_trend_export(window):
+    """
+    Full trends export for one time window (see exports.TrendExport)
+    Reads the shared trend table and rollups; nothing is built until its chunks are read.
+    Returns:
+        (TrendExport, version for ExportJobs)
+    """
+    trends = load_trends()
+    topics = tuple(trends.topics)
+    export = TrendExport(trends, load_rollups(topics), load_peak_times(topics), window)
+    return export, data_version()
+
+
+def load_catalog_export(name, section):
+    """
+    Export of one list section of a research/skills catalog
+    Returns:
+        (CatalogExport, version for ExportJobs)
+    """
+    return CatalogExport(name, section, load_catalog(name)[section]), dataset_version(name)
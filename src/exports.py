@@ -0,0 +1,285 @@
+"""
+Exports - Chunked CSV/Parquet writers for the trends store and the catalogs
+An export yields DataFrames of at most EXPORT_CHUNK_ROWS rows, read straight
+from the shared in-memory structures, and each format turns that into a
+stream of byte blocks, so memory stays flat whatever the export's size: the
+same stream is written to disk, handed to the browser, or sent by the API.
+
+Exports above BACKGROUND_ROWS are written to EXPORT_DIR by ExportJobs on a
+worker thread, so building them never holds up an interactive rerun.
+"""
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from records import CATALOG_RECORDS
+from rollups import WINDOWS
+
+EXPORT_CHUNK_ROWS = 10_000
+BACKGROUND_ROWS = 50_000        # Larger exports go to a background worker instead of the browser
+EXPORT_DIR = 'exports'
+MAX_JOBS = 32                   # Finished job records kept (their files stay on disk)
+
+# History column label per rollup tier
+BUCKET_LABELS = {
+    'hour': '%Y-%m-%dT%H:00Z',
+    'day': '%Y-%m-%d',
+    'week': '%Y-%m-%d',
+}
+
+
+def csv_stream(chunks):
+    """UTF-8 CSV blocks for a sequence of DataFrames with the same columns (header once)"""
+    header = True
+    for frame in chunks:
+        # An explicit float format also sidesteps pandas' NaN-to-str cast warning
+        yield frame.to_csv(index=False, header=header, float_format='%.10g').encode('utf-8')
+        header = False
+
+
+class _Blocks:
+    """Write-only file object that hands back what was written since the last drain"""
+
+    def __init__(self):
+        self.blocks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        self.blocks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data, self.blocks = b''.join(self.blocks), []
+        return data
+
+
+def parquet_stream(chunks):
+    """Parquet file blocks, one row group per DataFrame (schema fixed by the first)"""
+    sink = _Blocks()
+    writer = None
+    for frame in chunks:
+        table = pa.Table.from_pandas(frame, schema=writer.schema if writer else None, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(sink, table.schema)
+        writer.write_table(table)
+        yield sink.drain()
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
+
+
+# Format -> (content type, stream function)
+FORMATS = {
+    'csv': ('text/csv', csv_stream),
+    'parquet': ('application/vnd.apache.parquet', parquet_stream),
+}
+
+
+def stream(fmt, chunks):
+    """Byte blocks of `chunks` encoded as a key of FORMATS"""
+    return FORMATS[fmt][1](chunks)
+
+
+def write_export(path, fmt, chunks, progress=None):
+    """
+    Write an export to disk through a temporary file, replacing `path` atomically
+    Args:
+        path: Destination file
+        fmt: Key of FORMATS
+        chunks: Iterable of DataFrames
+        progress: Called with the rows written so far after each chunk
+    Returns:
+        Size of the file in bytes
+    """
+    def counted(chunks):
+        rows = 0
+        for frame in chunks:
+            yield frame
+            rows += len(frame)
+            if progress is not None:
+                progress(rows)
+
+    partial = f"{path}.part"
+    try:
+        with open(partial, 'wb') as f:
+            for block in stream(fmt, counted(chunks)):
+                f.write(block)
+    except BaseException:
+        os.remove(partial)
+        raise
+    os.replace(partial, path)
+    return os.path.getsize(path)
+
+
+def _chunk_bounds(rows, chunk_rows):
+    """(start, stop) per chunk; an empty export still gets one (empty) chunk so headers are written"""
+    for start in range(0, max(rows, 1), chunk_rows):
+        yield start, min(start + chunk_rows, rows)
+
+
+class TrendExport:
+    """
+    Every trending topic for one time window, one row per topic
+    Columns: the curated fields, window volume/sentiment overall and per
+    segment, growth vs the previous window, then one volume_<bucket> and one
+    sentiment_<bucket> column per rollup bucket in the window.
+    """
+
+    def __init__(self, trends, rollups, peak_times, window):
+        self.trends = trends
+        self.rollups = rollups
+        self.peak_times = peak_times
+        self.window = window
+        self.name = f"trends-{window}"
+        self.rows = len(trends)
+
+    def chunks(self, chunk_rows=EXPORT_CHUNK_ROWS):
+        """DataFrames of up to `chunk_rows` topics, in trend-table order"""
+        trends, window = self.trends, self.window
+        comparison = self.rollups.compare(window)
+        growth = comparison.growth()
+        labels = pd.to_datetime(self.rollups.bucket_starts(window), unit='s').strftime(BUCKET_LABELS[WINDOWS[window][0]])
+        for start, stop in _chunk_bounds(self.rows, chunk_rows):
+            columns = trends.columns[start:stop]
+            counts = comparison.counts[start:stop]
+            sentiment_sums = comparison.sentiment[start:stop]
+            volume = counts.sum(axis=1)
+            frame = {
+                'topic': trends.topics[start:stop],
+                'volume': columns['volume'].astype(np.int64),
+                'sentiment': columns['sentiment'].astype(np.float64).round(3),
+                'velocity': columns['velocity'].astype(np.float64).round(2),
+                'women_interest': columns['women_interest'].astype(np.int64),
+                'men_interest': columns['men_interest'].astype(np.int64),
+                # String dtype: a chunk of topics without posts is all nulls, not a null-typed column
+                'peak_time': pd.array(self.peak_times[start:stop], dtype='string'),
+                'window': window,
+                'window_volume': volume,
+                'previous_volume': comparison.previous_counts[start:stop].sum(axis=1),
+                'growth_pct': growth[start:stop].round(2),
+                'window_sentiment': _mean(sentiment_sums.sum(axis=1), volume),
+            }
+            for i, segment in enumerate(self.rollups.segments):
+                frame[f'{segment}_volume'] = counts[:, i]
+                frame[f'{segment}_sentiment'] = _mean(sentiment_sums[:, i], counts[:, i])
+            history_counts, history_sums = self.rollups.history(window, slice(start, stop))
+            yield pd.concat([
+                pd.DataFrame(frame),
+                pd.DataFrame(history_counts, columns=[f'volume_{label}' for label in labels]),
+                pd.DataFrame(_mean(history_sums, history_counts), columns=[f'sentiment_{label}' for label in labels]),
+            ], axis=1)
+
+
+def _mean(sums, counts):
+    """Mean sentiment rounded for export (NaN, i.e. an empty cell, where there are no posts)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(counts > 0, sums / counts, np.nan).round(3)
+
+
+class CatalogExport:
+    """One list section of a research/skills catalog, one row per record"""
+
+    def __init__(self, name, section, records):
+        self.fields = CATALOG_RECORDS[name][section].__slots__
+        self.records = records
+        self.name = f"{name}-{section}"
+        self.rows = len(records)
+
+    def chunks(self, chunk_rows=EXPORT_CHUNK_ROWS):
+        for start, stop in _chunk_bounds(self.rows, chunk_rows):
+            values = [[getattr(record, field) for field in self.fields] for record in self.records[start:stop]]
+            yield pd.DataFrame(values, columns=list(self.fields))
+
+
+class ExportJob:
+    """Progress of one background export"""
+    __slots__ = ('name', 'format', 'rows', 'path', 'status', 'written', 'size', 'error', 'started', 'finished')
+
+    def __init__(self, export, fmt, path):
+        self.name = export.name
+        self.format = fmt
+        self.rows = export.rows
+        self.path = path
+        self.status = 'queued'      # queued -> running -> done | failed
+        self.written = 0
+        self.size = None
+        self.error = None
+        self.started = time.time()
+        self.finished = None
+
+    @property
+    def progress(self):
+        return min(self.written / self.rows, 1.0) if self.rows else 1.0
+
+
+class ExportJobs:
+    """
+    Process-wide background writer for large exports
+    Jobs are keyed by (export name, format, data version): asking again for an
+    export that is queued, running or done returns the existing job, so every
+    session sees the same file and nothing is written twice.
+    """
+
+    def __init__(self, directory=EXPORT_DIR, workers=1):
+        self.directory = directory
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='export')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def _key(self, export, fmt, version):
+        return export.name, fmt, version
+
+    def find(self, export, fmt, version):
+        """Existing job for an export, or None"""
+        with self._lock:
+            return self._jobs.get(self._key(export, fmt, version))
+
+    def submit(self, export, fmt, version):
+        """
+        Queue an export (or return the job already writing it; failed jobs are retried)
+        Returns:
+            ExportJob
+        """
+        key = self._key(export, fmt, version)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.status != 'failed':
+                return job
+            digest = hashlib.sha1(repr(key).encode()).hexdigest()[:12]
+            job = self._jobs[key] = ExportJob(export, fmt, os.path.join(self.directory, f"{export.name}-{digest}.{fmt}"))
+            self._prune()
+        self._executor.submit(self._run, job, export)
+        return job
+
+    def _prune(self):
+        finished = [key for key, job in self._jobs.items() if job.finished is not None]
+        for key in finished[:max(len(self._jobs) - MAX_JOBS, 0)]:
+            del self._jobs[key]
+
+    def _run(self, job, export):
+        job.status = 'running'
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            job.size = write_export(job.path, job.format, export.chunks(),
+                                    progress=lambda rows: setattr(job, 'written', rows))
+            job.status = 'done'
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = 'failed'
+        job.finished = time.time()
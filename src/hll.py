@@ -0,0 +1,132 @@
+"""
+HyperLogLog - Distinct-author estimates in fixed memory
+A sketch is 2^p one-byte registers; each author hash sets one register to
+the max of its rank (leading zeros + 1), so adding an author twice changes
+nothing and two sketches merge by elementwise max. The estimate's relative
+standard error is 1.04 / sqrt(2^p), whatever the number of authors.
+
+ParticipantSketches keeps one sketch per (period, topic, segment) for every
+time window, where period 0 is the window ending at the newest rollup bucket
+and period 1 the window before it. Any filtered set of topics, segments or
+periods is a max-reduction over its sketches, and sketches built over
+different parts of the log (e.g. by separate workers) merge the same way.
+"""
+import numpy as np
+from rollups import SEGMENTS, TIERS, WINDOWS
+
+PRECISION = 8        # 256 registers: +/-6.5% standard error, 256 bytes per sketch
+PERIODS = 2          # Current window and the one before it
+
+
+def relative_error(precision=PRECISION):
+    """Relative standard error of an estimate"""
+    return 1.04 / np.sqrt(2 ** precision)
+
+
+def _bit_length(values):
+    """Bit length of each uint64 (0 for 0)"""
+    lengths = np.zeros(len(values), dtype=np.int64)
+    nonzero = values > 0
+    lengths[nonzero] = np.floor(np.log2(values[nonzero].astype(np.float64))).astype(np.int64) + 1
+    # float64 rounding can push values just below a power of two up to it
+    over = nonzero & ((values >> np.maximum(lengths - 1, 0).astype(np.uint64)) == 0)
+    lengths[over] -= 1
+    return lengths
+
+
+def register_ranks(hashes, precision=PRECISION):
+    """
+    Register and rank for each 64-bit hash
+    The top `precision` bits pick the register; the rank is the position of
+    the first set bit in the rest.
+    Returns:
+        (register index int64, rank uint8)
+    """
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    bits = 64 - precision
+    registers = (hashes >> np.uint64(bits)).astype(np.int64)
+    rest = hashes & np.uint64((1 << bits) - 1)
+    return registers, (bits - _bit_length(rest) + 1).astype(np.uint8)
+
+
+def estimate(registers):
+    """
+    Cardinality estimate per sketch (registers along the last axis)
+    Small cardinalities use linear counting over empty registers.
+    """
+    registers = np.asarray(registers)
+    m = registers.shape[-1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.sum(np.exp2(-registers.astype(np.float64)), axis=-1)
+    zeros = np.sum(registers == 0, axis=-1)
+    with np.errstate(divide='ignore'):
+        linear = m * np.log(m / np.maximum(zeros, 1))
+    return np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+
+
+class ParticipantSketches:
+    """
+    Distinct-author sketches per window, period, topic and segment
+    Windows are anchored at `latest` (epoch seconds), matching the rollups
+    built from the same log.
+    """
+    __slots__ = ('latest', 'precision', 'registers')
+
+    def __init__(self, n_topics, latest, segments=SEGMENTS, precision=PRECISION):
+        self.latest = latest
+        self.precision = precision
+        shape = (PERIODS, n_topics, len(segments), 2 ** precision)
+        self.registers = {window: np.zeros(shape, dtype=np.uint8) for window in WINDOWS}
+
+    def add(self, timestamps, topic_codes, segment_codes, author_hashes):
+        """
+        Fold a batch of posts into every window's sketches
+        Args:
+            timestamps: Epoch seconds per post
+            topic_codes: Topic index per post
+            segment_codes: Segment index per post (-1 if unknown; skipped)
+            author_hashes: 64-bit hash of each post's author
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        topic_codes = np.asarray(topic_codes, dtype=np.int64)
+        segment_codes = np.asarray(segment_codes, dtype=np.int64)
+        index, rank = register_ranks(author_hashes, self.precision)
+        for window, (tier, buckets) in WINDOWS.items():
+            width = TIERS[tier][0]
+            registers = self.registers[window]
+            _, n_topics, n_segments, m = registers.shape
+            period = (self.latest // width - timestamps // width) // buckets
+            keep = (period >= 0) & (period < PERIODS) & (segment_codes >= 0)
+            cells = ((period * n_topics + topic_codes) * n_segments + segment_codes) * m + index
+            np.maximum.at(registers.reshape(-1), cells[keep], rank[keep])
+
+    def merge(self, other):
+        """Fold in sketches built over other posts (same topics, anchor and precision)"""
+        for window, registers in self.registers.items():
+            np.maximum(registers, other.registers[window], out=registers)
+
+    def count(self, window, topics=None, segment=None, previous=False):
+        """
+        Estimated distinct authors
+        Args:
+            window: Key of rollups.WINDOWS
+            topics: Boolean mask or indices of topics to union (default: all)
+            segment: Segment index (default: every segment)
+            previous: Count the window before the current one
+        """
+        registers = self.registers[window][1 if previous else 0]
+        if topics is not None:
+            registers = registers[topics]
+        if segment is not None:
+            registers = registers[:, segment:segment + 1]
+        if registers.size == 0:
+            return 0.0
+        return float(estimate(registers.max(axis=(0, 1))))
+
+    def topic_counts(self, window, previous=False):
+        """Estimated distinct authors per topic, across segments"""
+        return estimate(self.registers[window][1 if previous else 0].max(axis=1))
+
+    @property
+    def relative_error(self):
+        return relative_error(self.precision)
@@ -0,0 +1,182 @@
+"""
+Confidence Intervals - Per-topic uncertainty for sentiment and gender interest
+Mean sentiment intervals are computed for every topic at once. Topics with
+few posts in a window, where the normal approximation is poor, get percentile
+bootstrap intervals from one resampling matrix per block of topics (draws x
+posts, reduced per topic with np.add.reduceat); larger topics use the normal
+interval from per-topic sums and sums of squares. Interest shares use the
+Wilson score interval, with the topic's posts from each segment as the
+sample size.
+"""
+from statistics import NormalDist
+import numpy as np
+from rollups import SEGMENTS, TIERS, WINDOWS
+
+CONFIDENCE = 0.95
+SENTIMENT_THRESHOLD = 0.3       # Matches components.sentiment_indicator and cube.SENTIMENT_THRESHOLD
+BOOTSTRAP_RESAMPLES = 1000
+BOOTSTRAP_MAX_POSTS = 30        # Topics with more posts in a window use the normal interval (CLT rule of thumb)
+BLOCK_DRAWS = 1 << 22           # Resampling matrix cells per block (bounds memory)
+MIN_POSTS = 2                   # Fewer posts than this: the interval is the whole scale
+ALL_TIME = 'all'                # Interval key for the whole post log, next to the WINDOWS keys
+
+# Sentiment call per topic; 'Uncertain' when the interval straddles a threshold
+SENTIMENT_CALLS = ('Negative', 'Neutral', 'Positive', 'Uncertain')
+
+
+def z_score(confidence=CONFIDENCE):
+    """Two-sided standard normal critical value"""
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def sentiment_calls(low, high, threshold=SENTIMENT_THRESHOLD):
+    """
+    Index into SENTIMENT_CALLS per interval
+    A point estimate is an interval with low == high, which never straddles.
+    """
+    low, high = np.asarray(low), np.asarray(high)
+    return np.where(low > threshold, 2,
+                    np.where(high < -threshold, 0,
+                             np.where((low >= -threshold) & (high <= threshold), 1, 3)))
+
+
+def wilson_intervals(share, n, confidence=CONFIDENCE):
+    """
+    Wilson score interval per proportion
+    Args:
+        share: Proportions in [0, 1]
+        n: Sample size per proportion (0 gives [0, 1])
+    Returns:
+        (low, high) arrays
+    """
+    share = np.asarray(share, dtype=np.float64)
+    n = np.asarray(n, dtype=np.float64)
+    z2 = z_score(confidence) ** 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        center = (share + z2 / (2 * n)) / (1 + z2 / n)
+        half = z2 ** 0.5 / (1 + z2 / n) * np.sqrt(share * (1 - share) / n + z2 / (4 * n * n))
+    empty = n <= 0
+    return np.where(empty, 0.0, np.clip(center - half, 0, 1)), np.where(empty, 1.0, np.clip(center + half, 0, 1))
+
+
+def _normal_intervals(values, topic_codes, n_topics, confidence):
+    """Mean +/- z * standard error per topic, from sums and sums of squares"""
+    counts = np.bincount(topic_codes, minlength=n_topics).astype(np.float64)
+    sums = np.bincount(topic_codes, weights=values, minlength=n_topics)
+    squares = np.bincount(topic_codes, weights=values * values, minlength=n_topics)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = sums / counts
+        variance = np.maximum(squares - counts * mean * mean, 0) / (counts - 1)
+        half = z_score(confidence) * np.sqrt(variance / counts)
+    return mean - half, mean + half
+
+
+def _bootstrap_intervals(values, counts, confidence, resamples, rng):
+    """
+    Percentile bootstrap interval of the mean for topics laid out contiguously
+    Args:
+        values: Observations grouped by topic (topic i owns counts[i] consecutive values)
+        counts: Observations per topic (all >= 1)
+    Returns:
+        (low, high) per topic
+    """
+    starts = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=starts[1:])
+    quantiles = (0.5 - confidence / 2, 0.5 + confidence / 2)
+    low, high = np.empty(len(counts)), np.empty(len(counts))
+
+    # Blocks of whole topics whose matrix (resamples x posts) fits in BLOCK_DRAWS cells
+    block_posts = max(BLOCK_DRAWS // resamples, int(counts.max(initial=1)))
+    first = 0
+    while first < len(counts):
+        last = int(np.searchsorted(starts, starts[first] + block_posts, side='right')) - 1
+        last = max(last, first + 1)
+        block_counts = counts[first:last]
+        offsets = starts[first:last] - starts[first]
+        # Each row resamples every topic in the block: a draw for a topic's slot picks one of its posts
+        sizes = np.repeat(block_counts, block_counts)
+        draws = (rng.random((resamples, len(sizes))) * sizes).astype(np.int64)
+        np.minimum(draws, sizes - 1, out=draws)     # Guards the rare round-up of u * n to n
+        draws += np.repeat(offsets, block_counts)
+        sample = values[starts[first]:starts[last]][draws]
+        means = np.add.reduceat(sample, offsets, axis=1) / block_counts
+        low[first:last], high[first:last] = np.quantile(means, quantiles, axis=0)
+        first = last
+    return low, high
+
+
+def mean_intervals(values, topic_codes, n_topics, confidence=CONFIDENCE, resamples=BOOTSTRAP_RESAMPLES,
+                   seed=0):
+    """
+    Confidence interval of the mean per topic
+    Args:
+        values: Observation per post
+        topic_codes: Topic index per post
+        n_topics: Number of topics
+        seed: Bootstrap RNG seed (intervals are reproducible per dataset)
+    Returns:
+        (low, high) arrays; [-1, 1] for topics with fewer than MIN_POSTS posts
+    """
+    values = np.asarray(values, dtype=np.float64)
+    topic_codes = np.asarray(topic_codes, dtype=np.int64)
+    counts = np.bincount(topic_codes, minlength=n_topics)
+    low, high = _normal_intervals(values, topic_codes, n_topics, confidence)
+
+    small = (counts >= MIN_POSTS) & (counts <= BOOTSTRAP_MAX_POSTS)
+    if small.any():
+        in_small = small[topic_codes]
+        order = np.argsort(topic_codes[in_small], kind='stable')
+        low[small], high[small] = _bootstrap_intervals(values[in_small][order], counts[small], confidence,
+                                                       resamples, np.random.default_rng(seed))
+
+    too_few = counts < MIN_POSTS
+    low[too_few], high[too_few] = -1.0, 1.0
+    return np.clip(low, -1, 1), np.clip(high, -1, 1)
+
+
+class TopicIntervals:
+    """
+    Sentiment and interest confidence intervals for every topic
+    `sentiment` maps each WINDOWS key (anchored like the rollups, at the
+    newest post) and ALL_TIME to (low, high) float32 arrays; `interest` maps
+    each segment to (low, high) interest in percentage points.
+    """
+    __slots__ = ('confidence', 'sentiment', 'interest')
+
+    def __init__(self, confidence, sentiment, interest):
+        self.confidence = confidence
+        self.sentiment = sentiment
+        self.interest = interest
+
+    @classmethod
+    def build(cls, timestamps, topic_codes, segment_codes, sentiments, interest, confidence=CONFIDENCE):
+        """
+        Args:
+            timestamps: Epoch seconds per post
+            topic_codes: Topic index per post
+            segment_codes: Segment index per post (-1 if unknown)
+            sentiments: Sentiment per post
+            interest: Dict of segment -> curated interest per topic (0-100)
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        topic_codes = np.asarray(topic_codes, dtype=np.int64)
+        segment_codes = np.asarray(segment_codes, dtype=np.int64)
+        sentiments = np.asarray(sentiments, dtype=np.float64)
+        n_topics = len(next(iter(interest.values())))
+        latest = int(timestamps.max()) if len(timestamps) else 0
+
+        windows = {ALL_TIME: np.ones(len(timestamps), dtype=bool)}
+        for window, (tier, buckets) in WINDOWS.items():
+            width = TIERS[tier][0]
+            windows[window] = latest // width - timestamps // width < buckets
+        sentiment = {}
+        for window, in_window in windows.items():
+            low, high = mean_intervals(sentiments[in_window], topic_codes[in_window], n_topics, confidence)
+            sentiment[window] = (low.astype(np.float32), high.astype(np.float32))
+
+        intervals = {}
+        for i, segment in enumerate(SEGMENTS):
+            n = np.bincount(topic_codes[segment_codes == i], minlength=n_topics)
+            low, high = wilson_intervals(np.asarray(interest[segment]) / 100, n, confidence)
+            intervals[segment] = ((low * 100).astype(np.float32), (high * 100).astype(np.float32))
+        return cls(confidence, sentiment, intervals)
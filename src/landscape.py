@@ -0,0 +1,87 @@
+"""
+Topic Landscape - Volume vs sentiment across the whole topic population
+Up to WEBGL_POINT_LIMIT topics in view are drawn as individual WebGL points.
+Above that the view is binned server-side into a fixed-size density grid,
+so the browser receives the same payload however many topics there are.
+"""
+import numpy as np
+
+WEBGL_POINT_LIMIT = 100_000
+GRID_SHAPE = (96, 64)    # (volume bins, sentiment bins)
+
+SENTIMENT_RANGE = (-1.0, 1.0)
+
+
+def volume_stops(max_volume):
+    """1-2-5 volume stops from 1 up to the first stop covering max_volume (zoom slider options)"""
+    stops = []
+    decade = 1
+    while not stops or stops[-1] < max_volume:
+        stops.extend(step * decade for step in (1, 2, 5))
+        decade *= 10
+    return stops[:next(i for i, stop in enumerate(stops) if stop >= max_volume) + 1]
+
+
+def gender_skew(women_interest, men_interest):
+    """Women minus men interest in points (-100 = all men, +100 = all women)"""
+    return women_interest.astype(np.int16) - men_interest.astype(np.int16)
+
+
+def in_view(volume, sentiment, volume_range, sentiment_range):
+    """Boolean mask of topics inside a (volume, sentiment) view"""
+    return (
+        (volume >= volume_range[0]) & (volume <= volume_range[1])
+        & (sentiment >= sentiment_range[0]) & (sentiment <= sentiment_range[1])
+    )
+
+
+class LandscapeGrid:
+    """
+    Topic counts and mean gender skew per (log volume, sentiment) cell
+    Edges are in log10(volume) and sentiment; arrays are shaped GRID_SHAPE.
+    """
+    __slots__ = ('volume_edges', 'sentiment_edges', 'counts', 'skew')
+
+    def __init__(self, volume_edges, sentiment_edges, counts, skew):
+        self.volume_edges = volume_edges
+        self.sentiment_edges = sentiment_edges
+        self.counts = counts
+        self.skew = skew
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+
+def bin_landscape(volume, sentiment, skew, volume_range, sentiment_range, shape=GRID_SHAPE):
+    """
+    2D-bin the topics inside a view
+    Bin indices are computed arithmetically and counted with one bincount,
+    which is linear in the number of topics (np.histogram2d binary-searches
+    every edge).
+    Args:
+        volume, sentiment, skew: Per-topic columns
+        volume_range: (low, high) posts, binned on a log scale
+        sentiment_range: (low, high) sentiment
+        shape: (volume bins, sentiment bins)
+    Returns:
+        LandscapeGrid
+    """
+    nx, ny = shape
+    x_low, x_high = np.log10(max(volume_range[0], 1)), np.log10(max(volume_range[1], 1))
+    y_low, y_high = sentiment_range
+    x_edges = np.linspace(x_low, x_high, nx + 1)
+    y_edges = np.linspace(y_low, y_high, ny + 1)
+
+    mask = in_view(volume, sentiment, volume_range, sentiment_range)
+    x = np.log10(np.maximum(volume[mask], 1))
+    y = sentiment[mask]
+    ix = np.clip(((x - x_low) / max(x_high - x_low, 1e-9) * nx).astype(np.int64), 0, nx - 1)
+    iy = np.clip(((y - y_low) / max(y_high - y_low, 1e-9) * ny).astype(np.int64), 0, ny - 1)
+    cells = ix * ny + iy
+
+    counts = np.bincount(cells, minlength=nx * ny).reshape(shape)
+    skew_sum = np.bincount(cells, weights=skew[mask], minlength=nx * ny).reshape(shape)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_skew = np.where(counts > 0, skew_sum / counts, np.nan)
+    return LandscapeGrid(x_edges, y_edges, counts, mean_skew)
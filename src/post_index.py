@@ -0,0 +1,158 @@
+"""
+Post Index - Covering indexes for paging through one topic's posts
+Each sort order keeps its own copy of the displayed columns, laid out by
+(topic, sort key), so a topic's posts are one contiguous range and a page is
+a contiguous slice: no lookups back into the post table. Pages are addressed
+by keyset cursors (the sort key of the last row shown) rather than offsets;
+seeking to a cursor is a binary search per key column inside the topic's
+range, so any page of any topic costs O(log n + page size).
+"""
+import numpy as np
+
+# Sort order -> (index, read backwards)
+SORTS = {
+    'Newest': ('recency', False),
+    'Oldest': ('recency', True),
+    'Most positive': ('sentiment', False),
+    'Most negative': ('sentiment', True),
+}
+
+# Index -> key columns, each stored ascending (descending keys are negated); (timestamp, id) breaks ties
+INDEX_KEYS = {
+    'recency': ('-timestamp', '-id'),
+    'sentiment': ('-sentiment', '-timestamp', '-id'),
+}
+
+
+def _seek(columns, lo, hi, cursor, after):
+    """
+    Position of a cursor in lexicographically sorted key columns within [lo, hi)
+    Returns:
+        First row after the cursor (after=True) or first row at or after it
+    """
+    for column, value in zip(columns, cursor):
+        left = lo + int(np.searchsorted(column[lo:hi], value, side='left'))
+        right = lo + int(np.searchsorted(column[lo:hi], value, side='right'))
+        if left == right:
+            return left
+        lo, hi = left, right
+    return hi if after else lo
+
+
+class PostPage:
+    """One page of posts and the cursor that continues after it"""
+    __slots__ = ('rows', 'next_cursor', 'has_more')
+
+    def __init__(self, rows, next_cursor, has_more):
+        self.rows = rows                # List of dicts: id, timestamp, author, gender, sentiment
+        self.next_cursor = next_cursor  # Pass to page() for the following page
+        self.has_more = has_more
+
+
+class CoveringIndex:
+    """Key and display columns for every post, ordered by (topic, key)"""
+    __slots__ = ('keys', 'ids', 'timestamps', 'sentiments', 'authors', 'genders')
+
+    def __init__(self, keys, ids, timestamps, sentiments, authors, genders):
+        self.keys = keys
+        self.ids = ids
+        self.timestamps = timestamps
+        self.sentiments = sentiments
+        self.authors = authors
+        self.genders = genders
+
+
+class PostIndex:
+    """
+    Per-topic post ranges under each sort order
+    """
+    __slots__ = ('topics', 'positions', 'offsets', 'sentiment_sums', 'author_names', 'gender_names', 'indexes')
+
+    def __init__(self, topics, offsets, sentiment_sums, author_names, gender_names, indexes):
+        self.topics = list(topics)
+        self.positions = {topic: i for i, topic in enumerate(self.topics)}
+        self.offsets = offsets                # Topic i's posts are rows offsets[i]:offsets[i + 1]
+        self.sentiment_sums = sentiment_sums
+        self.author_names = author_names
+        self.gender_names = gender_names
+        self.indexes = indexes
+
+    @classmethod
+    def build(cls, ids, timestamps, sentiments, topic_codes, topics, author_codes, author_names,
+              gender_codes, gender_names):
+        """
+        Args:
+            ids, timestamps, sentiments: Post id, epoch seconds and sentiment per post
+            topic_codes: Topic index per post (position in `topics`)
+            topics: Topic names
+            author_codes, author_names: Author index per post, and the names indexed
+            gender_codes, gender_names: Same for gender
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        sentiments = np.asarray(sentiments, dtype=np.float32)
+        topic_codes = np.asarray(topic_codes, dtype=np.int64)
+        author_codes = np.asarray(author_codes, dtype=np.int32)
+        gender_codes = np.asarray(gender_codes, dtype=np.int8)
+        n = len(topics)
+
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(topic_codes, minlength=n), out=offsets[1:])
+        sentiment_sums = np.bincount(topic_codes, weights=sentiments, minlength=n)
+
+        columns = {'-timestamp': -timestamps, '-id': -ids, '-sentiment': -sentiments}
+        indexes = {}
+        for name, key_names in INDEX_KEYS.items():
+            keys = [columns[key] for key in key_names]
+            order = np.lexsort(tuple(reversed(keys)) + (topic_codes,))
+            indexes[name] = CoveringIndex(
+                tuple(key[order] for key in keys),
+                ids[order], timestamps[order], sentiments[order],
+                author_codes[order], gender_codes[order],
+            )
+        return cls(topics, offsets, sentiment_sums, list(author_names), list(gender_names), indexes)
+
+    def volume(self, topic):
+        i = self.positions[topic]
+        return int(self.offsets[i + 1] - self.offsets[i])
+
+    def mean_sentiment(self, topic):
+        """Mean sentiment over the topic's posts (NaN if it has none)"""
+        volume = self.volume(topic)
+        return float(self.sentiment_sums[self.positions[topic]] / volume) if volume else float('nan')
+
+    def page(self, topic, sort='Newest', cursor=None, limit=10):
+        """
+        One page of a topic's posts
+        Args:
+            topic: Topic name
+            sort: Key of SORTS
+            cursor: next_cursor of the previous page (None for the first page)
+            limit: Posts per page
+        Returns:
+            PostPage
+        """
+        index_name, backwards = SORTS[sort]
+        index = self.indexes[index_name]
+        i = self.positions[topic]
+        lo, hi = int(self.offsets[i]), int(self.offsets[i + 1])
+        if backwards:
+            end = hi if cursor is None else _seek(index.keys, lo, hi, cursor, after=False)
+            start = max(lo, end - limit)
+            rows = np.arange(end - 1, start - 1, -1)
+            has_more = start > lo
+        else:
+            start = lo if cursor is None else _seek(index.keys, lo, hi, cursor, after=True)
+            end = min(hi, start + limit)
+            rows = np.arange(start, end)
+            has_more = end < hi
+
+        page = [{
+            'id': int(index.ids[row]),
+            'timestamp': int(index.timestamps[row]),
+            'author': self.author_names[index.authors[row]],
+            'gender': self.gender_names[index.genders[row]],
+            'sentiment': round(float(index.sentiments[row]), 2),    # Stored as float32
+        } for row in rows.tolist()]
+        next_cursor = tuple(key[rows[-1]].item() for key in index.keys) if len(rows) else cursor
+        return PostPage(page, next_cursor, has_more)
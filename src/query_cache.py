@@ -0,0 +1,160 @@
+"""
+Query Cache - Process-wide results keyed by normalized parameters and data version
+Entries expire after a per-entry TTL and are evicted least-recently-used
+once their total estimated size passes a byte budget. Concurrent misses for
+the same key are coalesced: the first caller computes, the rest wait for its
+result (single flight), so a burst of identical requests costs one query.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL = 300.0     # Seconds; the data version in the key already covers dataset edits
+
+
+def normalize_params(params):
+    """
+    Hashable, order-independent form of a parameter dict
+    Lists and sets are treated as unordered filter values (sorted); None and
+    empty values are dropped, so a missing filter and an empty one share a key.
+    Tuples keep their order.
+    """
+    def normalize(value):
+        if isinstance(value, dict):
+            return tuple(sorted((key, normalize(item)) for key, item in value.items()
+                                if item is not None and item != [] and item != ()))
+        if isinstance(value, (list, set, frozenset)):
+            return tuple(sorted(normalize(item) for item in value))
+        if isinstance(value, tuple):
+            return tuple(normalize(item) for item in value)
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+
+    return normalize(params)
+
+
+def estimate_size(value):
+    """Approximate memory held by a result, in bytes (arrays by nbytes, containers recursively)"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes + sys.getsizeof(np.empty(0))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class _Flight:
+    """A computation in progress that other callers can wait on"""
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class QueryCache:
+    """
+    Thread-safe TTL + byte-bounded LRU cache with single-flight misses
+    Results are shared between callers: treat them as read-only.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()   # key -> (value, size, expires_at), least recently used first
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._counts = dict.fromkeys(('hits', 'misses', 'coalesced', 'evictions', 'expirations', 'oversized'), 0)
+
+    def get(self, name, params, version, compute, ttl=None):
+        """
+        Cached result of `compute()` for a query
+        Args:
+            name: Query name (namespaces the key)
+            params: Dict of query parameters (see normalize_params)
+            version: Data version the result depends on
+            compute: Zero-argument callable producing the result
+            ttl: Seconds this entry may be served (default: the cache's TTL)
+        Raises:
+            Whatever compute() raised; failures are not cached
+        """
+        key = (name, normalize_params(params), version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, size, expires_at = entry
+                if self.clock() < expires_at:
+                    self._entries.move_to_end(key)
+                    self._counts['hits'] += 1
+                    return value
+                self._drop(key)
+                self._counts['expirations'] += 1
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self._counts['misses'] += 1
+            else:
+                self._counts['coalesced'] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = compute()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+                if flight.error is None:
+                    self._store(key, flight.result, self.ttl if ttl is None else ttl)
+            flight.done.set()
+        return flight.result
+
+    def _store(self, key, value, ttl):
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            self._counts['oversized'] += 1
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (value, size, self.clock() + ttl)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self._counts['evictions'] += 1
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Counters and occupancy, for tuning the budget and TTL"""
+        with self._lock:
+            lookups = self._counts['hits'] + self._counts['misses'] + self._counts['coalesced']
+            return {
+                **self._counts,
+                'hit_rate': round(self._counts['hits'] / lookups, 4) if lookups else None,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'in_flight': len(self._inflight),
+            }
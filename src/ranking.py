@@ -0,0 +1,117 @@
+"""
+Tip Ranking - Scenario-matched ordering of catalog entries
+Each entry's text fields are tokenized with the shared tokenizer, hashed into
+a fixed feature space and weighted by TF-IDF, giving one sparse CSR row per
+entry. A query is hashed into a dense vector and scored against every row in
+a single sparse-dense product, then blended with the entry's effectiveness.
+Query tokens are hashed directly rather than encoded, so free-text queries
+never add to the shared vocabulary.
+"""
+import zlib
+import numpy as np
+from text import tokenize
+
+N_FEATURES = 2 ** 16
+RELEVANCE_WEIGHT = 0.8     # Remainder goes to effectiveness (0-10 scale)
+
+# Field -> weight for each ranked section
+TIP_FIELDS = {'context': 2.0, 'category': 1.5, 'do': 1.0, 'dont': 0.5}
+SIGNAL_FIELDS = {'signal': 1.5, 'meaning': 1.0, 'how_to_use': 1.0}
+
+# Scenario -> query text, phrased in the catalog's own vocabulary
+SCENARIOS = {
+    "First message": "first interactions opening lines message text communication",
+    "In person at a bar": "bars social events first interactions in person approach eye contact body posture proximity smile",
+    "First date": "early dates first date conversations active listening eye contact smile vocal tone",
+    "Between dates": "between dates text communication planning logistics",
+    "Building a connection": "emotional connection vulnerability 2nd dates rapport mirroring touch",
+    "Showing interest": "expressing interest mutual end of positive dates touch proximity",
+    "Handling rejection": "rejection interest not reciprocated",
+}
+
+
+def hash_features(tokens):
+    """Feature index per token (CRC32 of the token, so stable across processes)"""
+    return np.fromiter((zlib.crc32(token.encode('utf-8')) % N_FEATURES for token in tokens),
+                       dtype=np.int64, count=len(tokens))
+
+
+class TfidfIndex:
+    """
+    Hashed TF-IDF rows for a sequence of records, stored as CSR
+    Rows are L2-normalized, so a row-times-query product is cosine similarity.
+    """
+    __slots__ = ('indptr', 'features', 'weights', 'idf', 'effectiveness')
+
+    def __init__(self, indptr, features, weights, idf, effectiveness):
+        self.indptr = indptr
+        self.features = features
+        self.weights = weights
+        self.idf = idf
+        self.effectiveness = effectiveness
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    @classmethod
+    def build(cls, records, fields, tokenizer, effectiveness=None):
+        """
+        Args:
+            records: Catalog records
+            fields: Dict of attribute -> field weight
+            tokenizer: text.Tokenizer (shared vocabulary)
+            effectiveness: Optional attribute holding a 0-10 score
+        """
+        vocabulary = tokenizer.vocabulary
+        rows, features, counts = [], [], []
+        for row, record in enumerate(records):
+            for field, weight in fields.items():
+                ids = tokenizer.encode(getattr(record, field))
+                rows.append(np.full(len(ids), row))
+                features.append(hash_features(vocabulary.decode(ids)))
+                counts.append(np.full(len(ids), weight))
+        n = len(records)
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        features = np.concatenate(features) if features else np.empty(0, dtype=np.int64)
+        counts = np.concatenate(counts) if counts else np.empty(0)
+
+        # Sum weighted term counts per (row, feature) cell
+        cells, inverse = np.unique(rows * N_FEATURES + features, return_inverse=True)
+        tf = np.bincount(inverse, weights=counts)
+        cell_rows, cell_features = cells // N_FEATURES, cells % N_FEATURES
+
+        df = np.bincount(cell_features, minlength=N_FEATURES)
+        idf = (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+        weights = (1 + np.log(tf)) * idf[cell_features]
+        norms = np.sqrt(np.bincount(cell_rows, weights=weights * weights, minlength=n))
+        weights /= np.maximum(norms, 1e-12)[cell_rows]
+
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cell_rows, minlength=n), out=indptr[1:])
+        scores = None if effectiveness is None else np.array([getattr(r, effectiveness) for r in records], dtype=np.float32)
+        return cls(indptr, cell_features.astype(np.int32), weights.astype(np.float32), idf, scores)
+
+    def query_vector(self, text):
+        """Dense, L2-normalized TF-IDF vector for a query"""
+        features = hash_features(tokenize(text))
+        vector = np.zeros(N_FEATURES, dtype=np.float32)
+        np.add.at(vector, features, 1.0)
+        nonzero = vector > 0
+        vector[nonzero] = (1 + np.log(vector[nonzero])) * self.idf[nonzero]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def scores(self, text):
+        """
+        Relevance (cosine) per record, blended with effectiveness when present
+        """
+        vector = self.query_vector(text)
+        products = self.weights * vector[self.features]
+        relevance = np.add.reduceat(np.r_[products, 0], self.indptr[:-1]) * (np.diff(self.indptr) > 0)
+        if self.effectiveness is None:
+            return relevance
+        return RELEVANCE_WEIGHT * relevance + (1 - RELEVANCE_WEIGHT) * self.effectiveness / 10
+
+    def rank(self, text, limit=None):
+        """Record indices, best match first (stable for ties)"""
+        return np.argsort(-self.scores(text), kind='stable')[:limit]
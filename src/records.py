@@ -0,0 +1,151 @@
+"""
+Record Types - Compact in-memory representations of the curated datasets
+Trends are held column-wise in a NumPy structured array with interned topic
+strings; research and skills entries use __slots__ classes instead of dicts.
+"""
+import sys
+import numpy as np
+
+TREND_DTYPE = np.dtype([
+    ('volume', np.int32),
+    ('sentiment', np.float32),
+    ('velocity', np.float32),
+    ('women_interest', np.uint8),
+    ('men_interest', np.uint8),
+    ('peak_time', np.uint8),    # Index into TrendTable.peak_time_labels
+])
+
+
+class TrendTable:
+    """
+    Trending topics as parallel columns
+    Index a column by name (table['volume']); slicing with head() returns views.
+    """
+    __slots__ = ('topics', 'columns', 'peak_time_labels')
+
+    def __init__(self, topics, columns, peak_time_labels):
+        self.topics = topics
+        self.columns = columns
+        self.peak_time_labels = peak_time_labels
+
+    @classmethod
+    def from_records(cls, trends):
+        """
+        Build from the `trends` list of mock_trends.json
+        """
+        labels = {}
+        columns = np.empty(len(trends), dtype=TREND_DTYPE)
+        for i, trend in enumerate(trends):
+            columns[i] = (
+                trend['volume'],
+                trend['sentiment'],
+                trend['velocity'],
+                trend['women_interest'],
+                trend['men_interest'],
+                labels.setdefault(sys.intern(trend['peak_time']), len(labels)),
+            )
+        topics = [sys.intern(trend['topic']) for trend in trends]
+        return cls(topics, columns, tuple(labels))
+
+    def __len__(self):
+        return len(self.topics)
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def head(self, n):
+        """First n topics (column data is a view, not a copy)"""
+        return TrendTable(self.topics[:n], self.columns[:n], self.peak_time_labels)
+
+    def take(self, indices):
+        """Topics at the given positions, in that order"""
+        indices = np.asarray(indices)
+        return TrendTable([self.topics[i] for i in indices], self.columns[indices], self.peak_time_labels)
+
+    def peak_times(self):
+        """Curated peak-time label per topic"""
+        return [self.peak_time_labels[code] for code in self.columns['peak_time']]
+
+
+class Record:
+    """
+    Base for fixed-field catalog entries
+    Subclasses list their fields in __slots__, in the same order as the JSON keys.
+    """
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    @classmethod
+    def from_dict(cls, entry):
+        return cls(*(entry[name] for name in cls.__slots__))
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+# Attraction research entries
+class PhysicalFactor(Record):
+    __slots__ = ('factor', 'women_preference', 'men_preference', 'research', 'key_finding', 'practical_tip')
+
+
+class BehavioralFactor(Record):
+    __slots__ = ('trait', 'attractiveness_score', 'gender_difference', 'how_to_demonstrate', 'research')
+
+
+class InteractionPattern(Record):
+    __slots__ = ('pattern', 'effectiveness', 'description', 'research')
+
+
+class KeyInsight(Record):
+    __slots__ = ('insight', 'description', 'implication')
+
+
+# Social skills entries
+class CommunicationTip(Record):
+    __slots__ = ('category', 'do', 'dont', 'example_good', 'example_bad', 'effectiveness', 'context')
+
+
+class BodyLanguageSignal(Record):
+    __slots__ = ('signal', 'meaning', 'how_to_use', 'common_mistake')
+
+
+class CommonMistake(Record):
+    __slots__ = ('mistake', 'why_it_fails', 'fix')
+
+
+class EscalationTip(Record):
+    __slots__ = ('stage', 'goal', 'actions', 'green_lights')
+
+
+# Record type per list section; sections not listed are passed through unchanged
+CATALOG_RECORDS = {
+    'attraction_research': {
+        'physical_factors': PhysicalFactor,
+        'behavioral_factors': BehavioralFactor,
+        'interaction_patterns': InteractionPattern,
+        'key_insights': KeyInsight,
+    },
+    'social_skills': {
+        'communication_tips': CommunicationTip,
+        'body_language': BodyLanguageSignal,
+        'common_mistakes': CommonMistake,
+        'escalation_tips': EscalationTip,
+    },
+}
+
+
+def build_catalog(name, document):
+    """
+    Convert a research/skills document into record tuples
+    Returns:
+        Dict of section name -> tuple of records (or the raw value for other sections)
+    """
+    record_types = CATALOG_RECORDS[name]
+    return {
+        section: tuple(map(record_types[section].from_dict, value)) if section in record_types else value
+        for section, value in document.items()
+    }
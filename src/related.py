@@ -0,0 +1,133 @@
+"""
+Related Topics - Top-k cosine neighbours from shared audiences
+Topics are vectors over authors (1 if the author posted in the topic). Their
+co-occurrence (the sparse product A^T A) is accumulated in COO form, block by
+block over authors, and reduced to a fixed (topics x k) neighbour index that
+the Trends tab reads in O(k).
+Cost is bounded by capping how many topics one author contributes pairs for:
+an author active everywhere says little about any pair, and each author's
+pairs grow quadratically with their topic count.
+"""
+import numpy as np
+
+DEFAULT_NEIGHBOURS = 10
+MIN_SHARED_AUTHORS = 2           # Pairs with fewer shared authors are noise
+MAX_AUTHOR_TOPICS = 64           # Authors' topics beyond this are ignored (most-posted kept)
+BLOCK_PAIRS = 4_000_000          # Candidate pairs materialized per block
+
+
+class RelatedTopics:
+    """
+    Fixed-width neighbour index
+    Row i holds topic i's neighbours by descending cosine similarity,
+    padded with -1 / 0.0 when it has fewer than k.
+    """
+    __slots__ = ('topics', 'positions', 'neighbours', 'scores')
+
+    def __init__(self, topics, neighbours, scores):
+        self.topics = topics
+        self.positions = {topic: i for i, topic in enumerate(topics)}
+        self.neighbours = neighbours    # (topics, k) int32
+        self.scores = scores            # (topics, k) float32
+
+    def related(self, topic, limit=None):
+        """
+        Neighbours of one topic, most similar first
+        Returns:
+            List of (topic, cosine similarity)
+        """
+        i = self.positions[topic] if isinstance(topic, str) else topic
+        row, scores = self.neighbours[i, :limit], self.scores[i, :limit]
+        return [(self.topics[j], float(score)) for j, score in zip(row, scores) if j >= 0]
+
+
+def author_topic_edges(author_codes, topic_codes, n_topics, max_author_topics=MAX_AUTHOR_TOPICS):
+    """
+    Distinct (author, topic) pairs, grouped by author with topics ascending
+    Each author keeps at most `max_author_topics` topics (the ones they post in most).
+    Returns:
+        (authors, topics) int64 arrays
+    """
+    author_codes = np.asarray(author_codes, dtype=np.int64)
+    topic_codes = np.asarray(topic_codes, dtype=np.int64)
+    edges, posts = np.unique(author_codes * n_topics + topic_codes, return_counts=True)
+    authors, topics = edges // n_topics, edges % n_topics
+
+    # Rank each author's topics by post count and drop the tail
+    order = np.lexsort((-posts, authors))
+    starts = np.flatnonzero(np.r_[True, authors[order][1:] != authors[order][:-1]])
+    rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    keep = np.sort(order[rank < max_author_topics])
+    return authors[keep], topics[keep]
+
+
+def cooccurrence(authors, topics, n_topics, block_pairs=BLOCK_PAIRS):
+    """
+    Shared-author counts for every topic pair (upper triangle, COO)
+    Authors are processed in blocks of about `block_pairs` candidate pairs,
+    each reduced with np.unique before the next is generated.
+    Args:
+        authors, topics: Edges from author_topic_edges (grouped by author)
+        n_topics: Number of topics
+    Returns:
+        (pair codes lo * n_topics + hi, shared author counts)
+    """
+    if len(authors) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    starts = np.flatnonzero(np.r_[True, authors[1:] != authors[:-1]])
+    ends = np.r_[starts[1:], len(authors)]
+    # Edge p pairs with every later edge of its author
+    partners = np.repeat(ends, ends - starts) - np.arange(len(authors)) - 1
+    author_pair_ends = np.cumsum(partners)[ends - 1]
+
+    codes, counts = [], []
+    first, done = 0, 0
+    while first < len(starts):
+        # Whole authors per block, at least one, about block_pairs pairs in total
+        last = max(np.searchsorted(author_pair_ends, done + block_pairs, side='right'), first + 1)
+        lo, hi = starts[first], ends[last - 1]
+        sizes = partners[lo:hi]
+        left = np.repeat(np.arange(lo, hi), sizes)
+        right = left + 1 + np.arange(len(left)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        block_codes, block_counts = np.unique(topics[left] * n_topics + topics[right], return_counts=True)
+        codes.append(block_codes)
+        counts.append(block_counts)
+        first, done = last, author_pair_ends[last - 1]
+
+    merged, inverse = np.unique(np.concatenate(codes), return_inverse=True)
+    return merged, np.bincount(inverse, weights=np.concatenate(counts)).astype(np.int64)
+
+
+def build_related(author_codes, topic_codes, topics, k=DEFAULT_NEIGHBOURS, min_shared=MIN_SHARED_AUTHORS):
+    """
+    Neighbour index from post authorship
+    Args:
+        author_codes: Author index per post
+        topic_codes: Topic index per post (position in `topics`)
+        topics: Topic names
+        k: Neighbours kept per topic
+    Returns:
+        RelatedTopics
+    """
+    n = len(topics)
+    authors, edge_topics = author_topic_edges(author_codes, topic_codes, n)
+    audience = np.bincount(edge_topics, minlength=n).astype(np.float64)
+    codes, shared = cooccurrence(authors, edge_topics, n)
+
+    strong = shared >= min_shared
+    lo, hi, shared = codes[strong] // n, codes[strong] % n, shared[strong]
+    cosine = shared / np.sqrt(audience[lo] * audience[hi])
+
+    # Both directions, then the k best per row
+    rows, cols, values = np.r_[lo, hi], np.r_[hi, lo], np.r_[cosine, cosine]
+    order = np.lexsort((-values, rows))
+    rows, cols, values = rows[order], cols[order], values[order]
+    row_starts = np.searchsorted(rows, np.arange(n))
+    rank = np.arange(len(rows)) - row_starts[rows]
+    keep = rank < k
+
+    neighbours = np.full((n, k), -1, dtype=np.int32)
+    scores = np.zeros((n, k), dtype=np.float32)
+    neighbours[rows[keep], rank[keep]] = cols[keep]
+    scores[rows[keep], rank[keep]] = values[keep]
+    return RelatedTopics(list(topics), neighbours, scores)
@@ -0,0 +1,259 @@
+"""
+Post Replay - Record post streams to an append-only log and play them back
+The log is a 64-byte header followed by fixed-width 24-byte records, so a
+recording of any length is read with one np.memmap and replay slices it
+without parsing. Topic and author names live in append-only sidecar files
+(<log>.topics, <log>.authors; one name per line, line number = code).
+
+Playback feeds the live aggregates behind the Trends tab (rollups, spike
+detector, activity histogram) at a multiple of real time, or as fast as
+possible, and measures lag from each event's scheduled time to the moment
+its aggregate is published.
+"""
+import os
+import time
+import numpy as np
+from activity import ActivityHistogram
+from rollups import SEGMENTS, RollupStore
+from spikes import SpikeDetector
+
+MAGIC = b'SIPLOG01'
+HEADER_SIZE = 64
+
+EVENT_DTYPE = np.dtype([
+    ('timestamp', '<i8'),
+    ('topic', '<i4'),
+    ('author', '<i4'),
+    ('sentiment', '<f4'),
+    ('segment', 'i1'),      # Position in rollups.SEGMENTS, -1 if unknown
+    ('_pad', 'V3'),
+])
+
+FAST_BATCH_EVENTS = 100_000     # Events per publish when replaying as fast as possible
+TICK_SECONDS = 0.05             # Publish interval when replaying at a fixed speed
+
+
+class Dictionary:
+    """Append-only name <-> code sidecar"""
+
+    def __init__(self, path):
+        self.path = path
+        self.names = []
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.names = f.read().splitlines()
+        self.codes = {name: code for code, name in enumerate(self.names)}
+
+    def encode(self, names):
+        """
+        Codes for a sequence of names, appending unseen ones to the sidecar
+        Returns:
+            int32 array
+        """
+        unique, inverse = np.unique(np.asarray(names, dtype=object), return_inverse=True)
+        new = [name for name in unique.tolist() if name not in self.codes]
+        if new:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(''.join(f"{name}\n" for name in new))
+            for name in new:
+                self.codes[name] = len(self.names)
+                self.names.append(name)
+        return np.array([self.codes[name] for name in unique.tolist()], dtype=np.int32)[inverse]
+
+
+class EventLogWriter:
+    """
+    Appends post batches to a log, creating it if needed
+    Sidecars are flushed before the records that reference them, a torn
+    trailing record is ignored by readers and cut off before the next append,
+    so a crash never corrupts the log.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.topics = Dictionary(f"{path}.topics")
+        self.authors = Dictionary(f"{path}.authors")
+        self._file = open(path, 'ab')
+        size = self._file.tell()
+        if size < HEADER_SIZE:
+            # New file, or a crash while writing the header
+            self._file.truncate(0)
+            self._file.write(MAGIC.ljust(HEADER_SIZE, b'\0'))
+            size = HEADER_SIZE
+        self.count = (size - HEADER_SIZE) // EVENT_DTYPE.itemsize
+        end = HEADER_SIZE + self.count * EVENT_DTYPE.itemsize
+        if size != end:
+            # Appends would land after the partial bytes and misalign every later record
+            self._file.truncate(end)
+
+    def append(self, timestamps, topics, authors, segments, sentiments):
+        """
+        Append a batch of posts (in time order if the log is to be replayed)
+        Args:
+            timestamps: Epoch seconds per post
+            topics, authors: Names per post
+            segments: Segment name per post (see rollups.SEGMENTS)
+            sentiments: Sentiment per post
+        """
+        records = np.zeros(len(timestamps), dtype=EVENT_DTYPE)
+        records['timestamp'] = timestamps
+        records['topic'] = self.topics.encode(topics)
+        records['author'] = self.authors.encode(authors)
+        records['sentiment'] = sentiments
+        segment_codes = {segment: code for code, segment in enumerate(SEGMENTS)}
+        records['segment'] = [segment_codes.get(segment, -1) for segment in segments]
+        self._file.write(records.tobytes())
+        self._file.flush()
+        self.count += len(records)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class EventLog:
+    """A recorded log, memory-mapped read-only"""
+    __slots__ = ('path', 'events', 'topics', 'authors')
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a post log")
+        count = (os.path.getsize(path) - HEADER_SIZE) // EVENT_DTYPE.itemsize
+        self.path = path
+        self.events = (np.memmap(path, dtype=EVENT_DTYPE, mode='r', offset=HEADER_SIZE, shape=(count,))
+                       if count else np.zeros(0, dtype=EVENT_DTYPE))
+        self.topics = Dictionary(f"{path}.topics").names
+        self.authors = Dictionary(f"{path}.authors").names
+
+    def __len__(self):
+        return len(self.events)
+
+
+def record_posts(posts, path, batch_size=1_000_000):
+    """
+    Record a post table (load_posts() columns) to a log in timestamp order
+    Returns:
+        Events in the log afterwards
+    """
+    posts = posts.sort_values('timestamp', kind='stable')
+    with EventLogWriter(path) as writer:
+        for start in range(0, len(posts), batch_size):
+            batch = posts.iloc[start:start + batch_size]
+            writer.append(batch['timestamp'].to_numpy(), batch['topic'].to_numpy(), batch['author'].to_numpy(),
+                          batch['gender'].to_numpy(), batch['sentiment'].to_numpy())
+        return writer.count
+
+
+class LivePipeline:
+    """Incrementally maintained aggregates the Trends tab reads"""
+
+    def __init__(self, topics):
+        self.rollups = RollupStore(topics)
+        self.spikes = SpikeDetector(topics)
+        self.activity = ActivityHistogram(topics)
+
+    def ingest(self, events):
+        """Fold a time-ordered slice of log records into every aggregate"""
+        timestamps = np.asarray(events['timestamp'])
+        topics = np.asarray(events['topic'])
+        segments = np.asarray(events['segment'])
+        known = segments >= 0
+        self.rollups.add(timestamps[known], topics[known], segments[known], events['sentiment'][known])
+        self.spikes.observe(timestamps, topics)
+        self.activity.add(timestamps, topics)
+
+    def publish(self):
+        """Make the new counts visible: rebuild what the tab's window comparisons read"""
+        for tier in self.rollups.tiers.values():
+            if tier.latest is not None:
+                tier.cumulative()
+
+
+class ReplayStats:
+    """Throughput and event-to-publish lag of one replay"""
+
+    def __init__(self):
+        self.events = 0
+        self.publishes = 0
+        self.elapsed = 0.0
+        self.lag_sum = 0.0
+        self.oldest_lags = []   # Per publish: lag of the oldest event it made visible
+
+    def add(self, count, scheduled_first, scheduled_mean, visible):
+        self.events += count
+        self.publishes += 1
+        self.lag_sum += (visible - scheduled_mean) * count
+        self.oldest_lags.append(visible - scheduled_first)
+
+    def summary(self):
+        lags = np.asarray(self.oldest_lags) * 1000
+        p50, p95, p99 = np.percentile(lags, [50, 95, 99]) if len(lags) else (float('nan'),) * 3
+        return {
+            'events': self.events,
+            'publishes': self.publishes,
+            'elapsed_s': round(self.elapsed, 3),
+            'throughput_eps': round(self.events / self.elapsed, 1) if self.elapsed else None,
+            'mean_lag_ms': round(self.lag_sum / self.events * 1000, 3) if self.events else None,
+            'oldest_lag_ms': {'p50': round(float(p50), 3), 'p95': round(float(p95), 3),
+                              'p99': round(float(p99), 3), 'max': round(float(lags.max()), 3) if len(lags) else None},
+        }
+
+
+def replay(log, pipeline, speed=None, duration=None, clock=time.perf_counter, sleep=time.sleep):
+    """
+    Play a log into a pipeline
+    At a fixed speed the stream's first event is mapped to the replay's start
+    and the rest released as their (sped-up) time arrives, one publish per
+    tick. Unpaced replays (speed=None) publish every FAST_BATCH_EVENTS and
+    measure lag from the moment each batch was read.
+    Args:
+        log: EventLog
+        pipeline: LivePipeline (or anything with ingest/publish)
+        speed: Event seconds per wall second (1, 10, 100...) or None for as fast as possible
+        duration: Stop after this many wall seconds
+    Returns:
+        ReplayStats
+    """
+    events = log.events
+    stats = ReplayStats()
+    if len(events) == 0:
+        return stats
+    timestamps = events['timestamp']
+    origin = int(timestamps[0])
+    start = clock()
+    position = 0
+    while position < len(events):
+        now = clock()
+        if duration is not None and now - start >= duration:
+            break
+        if speed is None:
+            end = min(position + FAST_BATCH_EVENTS, len(events))
+            scheduled = None
+        else:
+            due = origin + (now - start) * speed
+            end = int(np.searchsorted(timestamps, due, side='right'))
+            if end <= position:
+                # Nothing due yet: sleep to the next event or tick, whichever comes first
+                wait = (int(timestamps[position]) - origin) / speed - (now - start)
+                sleep(min(max(wait, 0.0), TICK_SECONDS))
+                continue
+        batch = events[position:end]
+        pipeline.ingest(batch)
+        pipeline.publish()
+        visible = clock()
+        if speed is None:
+            stats.add(len(batch), now, now, visible)
+        else:
+            event_times = np.asarray(batch['timestamp'], dtype=np.float64) - origin
+            stats.add(len(batch), start + event_times[0] / speed, start + event_times.mean() / speed, visible)
+        position = end
+        if speed is not None:
+            sleep(max(TICK_SECONDS - (clock() - now), 0.0))
+    stats.elapsed = clock() - start
+    return stats
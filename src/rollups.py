@@ -0,0 +1,230 @@
+"""
+Time Rollups - Hourly, daily and weekly post aggregates per topic and segment
+Every post is added to all three tiers at ingest. Each tier is a fixed-length
+ring of buckets, so older fine-grained buckets are compacted away (their posts
+live on in the coarser tiers) and storage stays bounded. Window comparisons
+read two cumulative sums per cell, independent of window length.
+"""
+import numpy as np
+
+SEGMENTS = ('women', 'men')
+
+# Tier name -> (bucket width in seconds, buckets retained)
+TIERS = {
+    'hour': (3600, 7 * 24),       # 7 days of hours
+    'day': (86400, 2 * 90),       # 180 days, enough to compare two 90-day windows
+    'week': (7 * 86400, 104),     # 2 years of weeks
+}
+
+# Time-window selector options -> (tier, buckets per window)
+WINDOWS = {
+    '24h': ('hour', 24),
+    '7d': ('day', 7),
+    '30d': ('day', 30),
+    '90d': ('day', 90),
+}
+
+
+class RollupTier:
+    """
+    Ring buffer of (count, sentiment sum) buckets for one granularity
+    Bucket ids are absolute (timestamp // width); a bucket's slot is id % length.
+    """
+
+    def __init__(self, width, length, shape):
+        self.width = width
+        self.length = length
+        self.counts = np.zeros(shape + (length,), dtype=np.int64)
+        self.sentiment = np.zeros(shape + (length,), dtype=np.float64)
+        self.latest = None
+        self._cumulative = None
+
+    def _advance(self, bucket):
+        """Move the head forward, clearing slots that fall out of retention"""
+        if self.latest is None or bucket - self.latest >= self.length:
+            self.counts[...] = 0
+            self.sentiment[...] = 0
+        else:
+            stale = np.arange(self.latest + 1, bucket + 1) % self.length
+            self.counts[..., stale] = 0
+            self.sentiment[..., stale] = 0
+        self.latest = bucket
+
+    def add(self, timestamps, cells, sentiments):
+        """
+        Fold a batch into the tier
+        Args:
+            timestamps: Epoch seconds per post
+            cells: Flat (topic, segment) cell index per post
+            sentiments: Sentiment per post
+        """
+        buckets = np.asarray(timestamps, dtype=np.int64) // self.width
+        newest = int(buckets.max())
+        if self.latest is None or newest > self.latest:
+            self._advance(newest)
+        live = buckets > self.latest - self.length
+        slots = cells[live] * self.length + buckets[live] % self.length
+        size = self.counts.size
+        self.counts += np.bincount(slots, minlength=size).reshape(self.counts.shape)
+        self.sentiment += np.bincount(slots, weights=sentiments[live], minlength=size).reshape(self.sentiment.shape)
+        self._cumulative = None
+
+    def cumulative(self):
+        """
+        Chronological cumulative sums, rebuilt lazily after each ingest
+        Returns:
+            (counts, sentiment) with a leading zero bucket; index i covers the
+            oldest i retained buckets
+        """
+        if self._cumulative is None:
+            order = np.arange(self.latest + 1, self.latest + 1 + self.length) % self.length
+            pad = [(0, 0)] * (self.counts.ndim - 1) + [(1, 0)]
+            self._cumulative = (
+                np.pad(np.cumsum(self.counts[..., order], axis=-1), pad),
+                np.pad(np.cumsum(self.sentiment[..., order], axis=-1), pad),
+            )
+        return self._cumulative
+
+    def history(self, buckets, rows=slice(None)):
+        """
+        Newest `buckets` buckets in chronological order
+        Args:
+            buckets: Buckets to return
+            rows: Slice of the leading (topic) axis to return
+        Returns:
+            (counts, sentiment sums) with a trailing time axis
+        """
+        if buckets > self.length:
+            raise ValueError(f"history of {buckets} buckets exceeds retention of {self.length}")
+        order = np.arange(self.latest + 1 - buckets, self.latest + 1) % self.length
+        return self.counts[rows][..., order], self.sentiment[rows][..., order]
+
+    def bucket_starts(self, buckets):
+        """Start (epoch seconds) of each of the newest `buckets` buckets, oldest first"""
+        return (np.arange(self.latest + 1 - buckets, self.latest + 1) * self.width).astype(np.int64)
+
+    def window(self, buckets, offset=0):
+        """
+        Totals over `buckets` buckets ending `offset` buckets before the head
+        Returns:
+            (counts, sentiment sums) shaped like the cell grid
+        """
+        end = self.length - offset
+        start = end - buckets
+        if start < 0:
+            raise ValueError(f"window of {buckets}+{offset} buckets exceeds retention of {self.length}")
+        counts, sentiment = self.cumulative()
+        return counts[..., end] - counts[..., start], sentiment[..., end] - sentiment[..., start]
+
+
+class WindowComparison:
+    """Current vs previous window totals, shaped (topics, segments)"""
+    __slots__ = ('counts', 'sentiment', 'previous_counts', 'previous_sentiment')
+
+    def __init__(self, counts, sentiment, previous_counts, previous_sentiment):
+        self.counts = counts
+        self.sentiment = sentiment
+        self.previous_counts = previous_counts
+        self.previous_sentiment = previous_sentiment
+
+    def volume(self):
+        """Posts per topic in the current window"""
+        return self.counts.sum(axis=1)
+
+    def previous_volume(self):
+        return self.previous_counts.sum(axis=1)
+
+    def growth(self):
+        """Percent change in volume per topic (NaN where the previous window is empty)"""
+        previous = self.previous_volume().astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(previous > 0, (self.volume() - previous) / previous * 100, np.nan)
+
+    def topic_sentiment(self):
+        """Mean sentiment per topic in the current window (NaN where there are no posts)"""
+        volume = self.volume()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(volume > 0, self.sentiment.sum(axis=1) / volume, np.nan)
+
+    def mean_sentiment(self, previous=False):
+        """Post-weighted sentiment across all topics (NaN if the window is empty)"""
+        counts = self.previous_counts if previous else self.counts
+        sentiment = self.previous_sentiment if previous else self.sentiment
+        total = counts.sum()
+        return float(sentiment.sum() / total) if total else float('nan')
+
+
+class RollupStore:
+    """
+    Hourly/daily/weekly rollups for a fixed set of topics and segments
+    """
+
+    def __init__(self, topics, segments=SEGMENTS):
+        self.topics = list(topics)
+        self.segments = tuple(segments)
+        shape = (len(self.topics), len(self.segments))
+        self.tiers = {name: RollupTier(width, length, shape) for name, (width, length) in TIERS.items()}
+
+    def align(self, timestamp):
+        """
+        Move every tier's head to the bucket holding `timestamp`
+        Stores aligned to the same timestamp have matching bucket slots, so
+        their arrays can be summed (see batch.fold_posts).
+        """
+        for tier in self.tiers.values():
+            bucket = timestamp // tier.width
+            if tier.latest is None or bucket > tier.latest:
+                tier._advance(bucket)
+                tier._cumulative = None
+
+    def add(self, timestamps, topic_codes, segment_codes, sentiments):
+        """
+        Fold a batch of posts into every tier
+        Args:
+            timestamps: Epoch seconds per post
+            topic_codes: Topic index per post (position in self.topics)
+            segment_codes: Segment index per post (position in self.segments)
+            sentiments: Sentiment score per post
+        """
+        if len(timestamps) == 0:
+            return
+        cells = np.asarray(topic_codes, dtype=np.int64) * len(self.segments) + np.asarray(segment_codes, dtype=np.int64)
+        sentiments = np.asarray(sentiments, dtype=np.float64)
+        for tier in self.tiers.values():
+            tier.add(timestamps, cells, sentiments)
+
+    def compare(self, window):
+        """
+        Current window vs the window before it
+        Args:
+            window: Key of WINDOWS (e.g., '7d')
+        """
+        tier_name, buckets = WINDOWS[window]
+        tier = self.tiers[tier_name]
+        counts, sentiment = tier.window(buckets)
+        previous_counts, previous_sentiment = tier.window(buckets, offset=buckets)
+        return WindowComparison(counts, sentiment, previous_counts, previous_sentiment)
+
+    def history(self, window, rows=slice(None)):
+        """
+        Per-topic bucket series covering a window, oldest first
+        Args:
+            window: Key of WINDOWS
+            rows: Slice of topics to return (default: all)
+        Returns:
+            (counts, sentiment sums), each shaped (topics, buckets)
+        """
+        tier_name, buckets = WINDOWS[window]
+        counts, sentiment = self.tiers[tier_name].history(buckets, rows)
+        return counts.sum(axis=1), sentiment.sum(axis=1)
+
+    def bucket_starts(self, window):
+        """Start (epoch seconds) of each bucket in history(window)"""
+        tier_name, buckets = WINDOWS[window]
+        return self.tiers[tier_name].bucket_starts(buckets)
+
+    @property
+    def latest(self):
+        """Start (epoch seconds) of the newest hourly bucket"""
+        tier = self.tiers['hour']
+        return None if tier.latest is None else tier.latest * tier.width
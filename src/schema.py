@@ -0,0 +1,209 @@
+"""
+Dataset Schemas - Declarative shapes for the documents under data/
+Schemas are compiled into validator functions once at import time, and each
+document version (identified by its content hash) is validated only once;
+failures are remembered too, so a bad file isn't re-checked until it changes.
+"""
+import math
+from numbers import Real
+
+
+class SchemaError(ValueError):
+    """Raised when a dataset document does not match its schema"""
+
+    def __init__(self, source, errors):
+        self.source = source
+        self.errors = errors
+        lines = '\n'.join(f"  - {error}" for error in errors)
+        super().__init__(f"{source} failed validation ({len(errors)} problem(s)):\n{lines}")
+
+
+class Range:
+    """Numeric field constrained to [low, high]"""
+
+    def __init__(self, low, high, integer=False):
+        self.low = low
+        self.high = high
+        self.integer = integer
+
+
+# Shorthand specs: a type, a Range, a dict of required keys, or [item_spec] for lists
+TEXT = str
+COUNT = Range(0, float('inf'), integer=True)
+PERCENT = Range(0, 100, integer=True)
+SENTIMENT = Range(-1, 1)
+SCORE = Range(0, 10)
+NUMBER = Range(float('-inf'), float('inf'))
+
+SCHEMAS = {
+    'mock_trends': {
+        'trends': [{
+            'topic': TEXT,
+            'volume': COUNT,
+            'sentiment': SENTIMENT,
+            'velocity': NUMBER,
+            'women_interest': PERCENT,
+            'men_interest': PERCENT,
+            'peak_time': TEXT,
+        }],
+        'top_keywords': {
+            'women': [TEXT],
+            'men': [TEXT],
+        },
+        'engagement_stats': {
+            'total_discussions': COUNT,
+            'avg_sentiment': SENTIMENT,
+            'peak_hours': TEXT,
+            'weekly_growth': NUMBER,
+        },
+    },
+    'attraction_research': {
+        'physical_factors': [{
+            'factor': TEXT,
+            'women_preference': TEXT,
+            'men_preference': TEXT,
+            'research': TEXT,
+            'key_finding': TEXT,
+            'practical_tip': TEXT,
+        }],
+        'behavioral_factors': [{
+            'trait': TEXT,
+            'attractiveness_score': SCORE,
+            'gender_difference': TEXT,
+            'how_to_demonstrate': TEXT,
+            'research': TEXT,
+        }],
+        'interaction_patterns': [{
+            'pattern': TEXT,
+            'effectiveness': SCORE,
+            'description': TEXT,
+            'research': TEXT,
+        }],
+        'key_insights': [{
+            'insight': TEXT,
+            'description': TEXT,
+            'implication': TEXT,
+        }],
+    },
+    'social_skills': {
+        'communication_tips': [{
+            'category': TEXT,
+            'do': TEXT,
+            'dont': TEXT,
+            'example_good': TEXT,
+            'example_bad': TEXT,
+            'effectiveness': SCORE,
+            'context': TEXT,
+        }],
+        'body_language': [{
+            'signal': TEXT,
+            'meaning': TEXT,
+            'how_to_use': TEXT,
+            'common_mistake': TEXT,
+        }],
+        'conversation_starters': {
+            'situational': [TEXT],
+            'interest_based': [TEXT],
+            'direct': [TEXT],
+        },
+        'common_mistakes': [{
+            'mistake': TEXT,
+            'why_it_fails': TEXT,
+            'fix': TEXT,
+        }],
+        'escalation_tips': [{
+            'stage': TEXT,
+            'goal': TEXT,
+            'actions': TEXT,
+            'green_lights': TEXT,
+        }],
+    },
+}
+
+
+def _describe(value):
+    return type(value).__name__
+
+
+def compile_schema(spec):
+    """
+    Compile a schema spec into a validator
+    Returns:
+        check(value, path, errors) that appends "path: message" strings to errors
+    """
+    if isinstance(spec, dict):
+        fields = [(key, compile_schema(child)) for key, child in spec.items()]
+
+        def check_object(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append(f"{path}: expected object, got {_describe(value)}")
+                return
+            for key, check in fields:
+                if key not in value:
+                    errors.append(f"{path}.{key}: missing required field")
+                else:
+                    check(value[key], f"{path}.{key}", errors)
+        return check_object
+
+    if isinstance(spec, list):
+        check_item = compile_schema(spec[0])
+
+        def check_list(value, path, errors):
+            if not isinstance(value, list):
+                errors.append(f"{path}: expected list, got {_describe(value)}")
+                return
+            for i, item in enumerate(value):
+                check_item(item, f"{path}[{i}]", errors)
+        return check_list
+
+    if isinstance(spec, Range):
+        def check_number(value, path, errors):
+            if isinstance(value, bool) or not isinstance(value, Real):
+                errors.append(f"{path}: expected number, got {_describe(value)}")
+            elif isinstance(value, float) and not math.isfinite(value):
+                # json.loads accepts NaN and Infinity; int() would raise on them
+                errors.append(f"{path}: expected finite number, got {value}")
+            elif spec.integer and value != int(value):
+                errors.append(f"{path}: expected whole number, got {value}")
+            elif not spec.low <= value <= spec.high:
+                errors.append(f"{path}: {value} outside [{spec.low}, {spec.high}]")
+        return check_number
+
+    def check_type(value, path, errors):
+        if not isinstance(value, spec):
+            errors.append(f"{path}: expected {spec.__name__}, got {_describe(value)}")
+    return check_type
+
+
+VALIDATORS = {name: compile_schema(spec) for name, spec in SCHEMAS.items()}
+
+# (dataset name, content hash) -> problems found (empty if it passed)
+_results = {}
+
+
+def register_schema(name, spec):
+    """Add or replace the schema for a dataset (e.g., a new snapshot format)"""
+    SCHEMAS[name] = spec
+    VALIDATORS[name] = compile_schema(spec)
+    for key in [key for key in _results if key[0] == name]:
+        del _results[key]
+
+
+def validate(name, document, digest, source=None):
+    """
+    Validate a document against its schema, once per content hash
+    Args:
+        name: Dataset name (key in SCHEMAS)
+        document: Parsed document
+        digest: Content hash of the raw document
+        source: Label used in error reports (defaults to name)
+    Raises:
+        SchemaError listing every problem found (again, from the cache, for a known bad version)
+    """
+    errors = _results.get((name, digest))
+    if errors is None:
+        errors = []
+        VALIDATORS[name](document, '$', errors)
+        _results[(name, digest)] = errors
+    if errors:
+        raise SchemaError(source or name, errors)
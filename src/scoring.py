@@ -0,0 +1,108 @@
+"""
+Text Scoring - Lexicon sentiment and keyword mentions over token-ID arrays
+Posts are scored from their encoded IDs (see text.TokenizedCorpus), never
+from strings: a post's sentiment is (positive - negative) / (positive +
+negative) over its lexicon words, 0 if it has none, and a keyword is
+mentioned wherever its token sequence occurs inside one post. Both are a
+handful of vectorized passes, so chunks can be scored in worker processes
+straight out of shared memory (see batch.fold_posts).
+"""
+import numpy as np
+from text import tokenize
+
+POSITIVE_WORDS = ('love', 'great', 'sweet', 'helpful', 'amazing', 'fun', 'happy', 'worth', 'recommend', 'cute', 'nice', 'glad')
+NEGATIVE_WORDS = ('awful', 'awkward', 'annoying', 'boring', 'cringe', 'toxic', 'worst', 'hate', 'sad', 'ugh', 'exhausting', 'confusing')
+
+
+class TextScorer:
+    """
+    Lexicon and keyword tables expressed as vocabulary IDs
+    Lexicon words and keyword tokens are registered in the shared vocabulary
+    up front, so encoding the corpus afterwards never reassigns them.
+    """
+
+    def __init__(self, vocabulary, keywords):
+        self.vocabulary = vocabulary
+        self.keywords = tuple(keywords)
+        vocabulary.extend(POSITIVE_WORDS + NEGATIVE_WORDS)
+        self.positive = vocabulary.encode(list(POSITIVE_WORDS))
+        self.negative = vocabulary.encode(list(NEGATIVE_WORDS))
+        self.sequences = [vocabulary.encode(tokenize(keyword)) for keyword in self.keywords]
+
+    def polarity(self):
+        """+1 / -1 / 0 per vocabulary ID (np.int8); build after encoding so every ID is covered"""
+        table = np.zeros(len(self.vocabulary), dtype=np.int8)
+        table[self.positive] = 1
+        table[self.negative] = -1
+        return table
+
+    def phrases(self):
+        """Keyword token IDs, one row per keyword, padded with -1 (np.int32)"""
+        width = max((len(ids) for ids in self.sequences), default=0)
+        table = np.full((len(self.sequences), width), -1, dtype=np.int32)
+        for row, ids in zip(table, self.sequences):
+            row[:len(ids)] = ids
+        return table
+
+
+def score_chunk(ids, offsets, polarity, phrases):
+    """
+    Sentiment and keyword mentions for a run of encoded posts
+    Args:
+        ids: Flat token IDs of the posts
+        offsets: Post i's IDs are ids[offsets[i] - offsets[0]:offsets[i + 1] - offsets[0]]
+        polarity: TextScorer.polarity()
+        phrases: TextScorer.phrases()
+    Returns:
+        (sentiment per post (float64), mentions as a posts x keywords int64 array)
+    """
+    offsets = np.asarray(offsets, dtype=np.int64) - offsets[0]
+    n_posts = len(offsets) - 1
+    lengths = np.diff(offsets)
+    posts = np.repeat(np.arange(n_posts), lengths)
+
+    signs = polarity[ids]
+    positive = np.bincount(posts, weights=signs > 0, minlength=n_posts)
+    negative = np.bincount(posts, weights=signs < 0, minlength=n_posts)
+    found = positive + negative
+    sentiment = np.divide(positive - negative, found, out=np.zeros(n_posts), where=found > 0)
+
+    mentions = np.zeros((n_posts, len(phrases)), dtype=np.int64)
+    for k, phrase in enumerate(phrases):
+        phrase = phrase[phrase >= 0]
+        starts = len(ids) - len(phrase) + 1
+        if len(phrase) == 0 or starts <= 0:
+            continue
+        match = ids[:starts] == phrase[0]
+        for j in range(1, len(phrase)):
+            match &= ids[j:starts + j] == phrase[j]
+        match &= posts[:starts] == posts[len(phrase) - 1:]    # Don't run across two posts
+        mentions[:, k] = np.bincount(posts[:starts][match], minlength=n_posts)
+    return sentiment, mentions
+
+
+class KeywordMentions:
+    """
+    Keyword mention counts per topic (topics x keywords)
+    Empty (no keywords) when the post log carries no text to score.
+    """
+
+    def __init__(self, topics, keywords=()):
+        self.topics = list(topics)
+        self.keywords = tuple(keywords)
+        self.counts = np.zeros((len(self.topics), len(self.keywords)), dtype=np.int64)
+
+    def add(self, topic_codes, mentions):
+        """Fold per-post mention rows (score_chunk) into their topics"""
+        topic_codes = np.asarray(topic_codes)
+        for k in range(len(self.keywords)):
+            self.counts[:, k] += np.bincount(topic_codes, weights=mentions[:, k],
+                                             minlength=len(self.topics)).astype(np.int64)
+
+    def top(self, indices):
+        """Most-mentioned keyword for each topic index (None without mentions)"""
+        if not self.keywords:
+            return [None] * len(indices)
+        counts = self.counts[np.asarray(indices, dtype=np.int64)]
+        best = counts.argmax(axis=1)
+        return [self.keywords[k] if counts[i, k] else None for i, k in enumerate(best.tolist())]
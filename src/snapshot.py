@@ -0,0 +1,135 @@
+"""
+Snapshots - Versioned binary bundles of everything the dashboard serves
+A snapshot holds the validated documents plus every derived structure
+(trend table, catalogs, rollups, indexes, display labels), built offline by
+scripts/build_snapshot.py. It is pickled with protocol 5 and its NumPy
+buffers are stored out-of-band, 64-byte aligned, so loading is one mmap and
+arrays are views into the file rather than copies.
+
+File layout:
+    MAGIC | header length (u64) | header pickle | buffer count (u64)
+    then per buffer: length (u64), padding to 64 bytes, raw bytes
+Deploys write <version>.snap and then atomically repoint CURRENT at it.
+"""
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import time
+
+MAGIC = b'SIPSNAP1'
+ALIGNMENT = 64
+POINTER_NAME = 'CURRENT'
+
+_U64 = struct.Struct('<Q')
+
+
+class Snapshot:
+    """
+    One build of the serving data
+    `parts` maps loader name -> prepared object (see scripts/build_snapshot.py).
+    """
+    __slots__ = ('version', 'built_at', 'sources', 'parts')
+
+    def __init__(self, version, built_at, sources, parts):
+        self.version = version
+        self.built_at = built_at
+        self.sources = sources      # Source path -> sha256 hex
+        self.parts = parts
+
+    def __getitem__(self, name):
+        return self.parts[name]
+
+    def __contains__(self, name):
+        return name in self.parts
+
+
+def content_version(sources):
+    """Snapshot version: hash over the source digests, in path order"""
+    digest = hashlib.sha256()
+    for path in sorted(sources):
+        digest.update(f"{path}:{sources[path]}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def _padding(offset):
+    return -offset % ALIGNMENT
+
+
+def write_snapshot(snapshot, directory):
+    """
+    Write a snapshot and make it current
+    Both the file and the CURRENT pointer are written to a temp name and
+    os.replace()d, so readers see either the old snapshot or the new one.
+    Returns:
+        Path of the written .snap file
+    """
+    os.makedirs(directory, exist_ok=True)
+    buffers = []
+    header = pickle.dumps(snapshot, protocol=5, buffer_callback=buffers.append)
+
+    path = os.path.join(directory, f"{snapshot.version}.snap")
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_U64.pack(len(header)))
+        f.write(header)
+        f.write(_U64.pack(len(buffers)))
+        for buffer in buffers:
+            raw = buffer.raw()
+            f.write(_U64.pack(raw.nbytes))
+            f.write(b'\0' * _padding(f.tell()))
+            f.write(raw)
+    os.replace(temp, path)
+
+    pointer = os.path.join(directory, POINTER_NAME)
+    with open(f"{pointer}.tmp", 'w') as f:
+        f.write(os.path.basename(path))
+    os.replace(f"{pointer}.tmp", pointer)
+    return path
+
+
+def current_path(directory):
+    """Path of the snapshot CURRENT points at (None if there is none)"""
+    pointer = os.path.join(directory, POINTER_NAME)
+    try:
+        with open(pointer) as f:
+            return os.path.join(directory, f.read().strip())
+    except FileNotFoundError:
+        return None
+
+
+def read_snapshot(path):
+    """
+    Map a snapshot file into memory
+    Arrays in the result are read-only views into the mapping.
+    Raises:
+        ValueError if the file is not a snapshot
+    """
+    with open(path, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(data)
+    if view[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a dashboard snapshot")
+    offset = len(MAGIC)
+    (header_length,) = _U64.unpack_from(view, offset)
+    offset += _U64.size
+    header = view[offset:offset + header_length]
+    offset += header_length
+    (count,) = _U64.unpack_from(view, offset)
+    offset += _U64.size
+
+    buffers = []
+    for _ in range(count):
+        (length,) = _U64.unpack_from(view, offset)
+        offset += _U64.size
+        offset += _padding(offset)
+        buffers.append(view[offset:offset + length])
+        offset += length
+    return pickle.loads(header, buffers=buffers)
+
+
+def new_snapshot(sources, parts):
+    """Snapshot stamped with its content version and build time"""
+    return Snapshot(content_version(sources), time.time(), dict(sources), parts)
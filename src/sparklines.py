@@ -0,0 +1,52 @@
+"""
+Sparklines - Fixed-length per-topic history series for the trends table
+Series are downsampled from the rollups once per post-log version; the table
+only slices out the rows it shows.
+"""
+import numpy as np
+from rollups import WINDOWS
+
+SPARKLINE_POINTS = 24
+
+
+def downsample(series, points):
+    """
+    Sum consecutive buckets into `points` roughly equal bins along the last axis
+    """
+    length = series.shape[-1]
+    points = min(points, length)
+    starts = np.linspace(0, length, points + 1).astype(np.int64)[:-1]
+    return np.add.reduceat(series, starts, axis=-1)
+
+
+def forward_fill(series):
+    """Replace NaNs with the last value before them (0 at the start of a row)"""
+    filled = np.where(np.isnan(series), 0, series)
+    valid = ~np.isnan(series)
+    index = np.where(valid, np.arange(series.shape[-1]), 0)
+    np.maximum.accumulate(index, axis=-1, out=index)
+    return np.where(valid.any(axis=-1, keepdims=True), np.take_along_axis(filled, index, axis=-1), 0)
+
+
+class Sparklines:
+    """
+    Volume and mean-sentiment series per topic for every time window
+    Each window maps to float32 arrays shaped (topics, <= SPARKLINE_POINTS).
+    """
+    __slots__ = ('volume', 'sentiment')
+
+    def __init__(self, rollups, points=SPARKLINE_POINTS):
+        self.volume = {}
+        self.sentiment = {}
+        for window in WINDOWS:
+            counts, sentiment_sums = rollups.history(window)
+            counts = downsample(counts, points)
+            sentiment_sums = downsample(sentiment_sums, points)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                mean = np.where(counts > 0, sentiment_sums / counts, np.nan)
+            self.volume[window] = counts.astype(np.float32)
+            self.sentiment[window] = forward_fill(mean).astype(np.float32)
+
+    def rows(self, window, indices):
+        """Volume and sentiment series for the given topic rows, as lists for st.dataframe"""
+        return self.volume[window][indices].tolist(), self.sentiment[window][indices].round(2).tolist()
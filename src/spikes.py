@@ -0,0 +1,122 @@
+"""
+Spike Detection - Streaming EWMA z-scores to flag surging topics
+State is a handful of floats per topic (open-bucket count, EWMA mean and
+variance), so memory is constant no matter how many posts stream through.
+The open bucket is scored as posts arrive, against the share of the baseline
+expected by the elapsed part of the bucket (so a surge early in the day is
+flagged early); when the bucket closes its count is folded into the baseline.
+"""
+import numpy as np
+
+DEFAULT_BUCKET_SECONDS = 86400   # Daily buckets sidestep the diurnal cycle
+DEFAULT_ALPHA = 0.2              # EWMA weight of the newest bucket (~5-bucket memory)
+DEFAULT_THRESHOLD = 2.0          # z-score that counts as a surge
+DEFAULT_MIN_COUNT = 5            # Ignore "surges" of a handful of posts
+DEFAULT_WARMUP = 7               # Closed buckets needed before a topic can be flagged
+
+# Zero-count gaps longer than this are folded in as a single decay step
+MAX_GAP_STEPS = 64
+
+
+class SpikeDetector:
+    """
+    Per-topic EWMA mean/variance of post counts per bucket
+    """
+
+    def __init__(self, topics, bucket_seconds=DEFAULT_BUCKET_SECONDS, alpha=DEFAULT_ALPHA,
+                 threshold=DEFAULT_THRESHOLD, min_count=DEFAULT_MIN_COUNT, warmup=DEFAULT_WARMUP):
+        self.topics = list(topics)
+        self.bucket_seconds = bucket_seconds
+        self.alpha = alpha
+        self.threshold = threshold
+        self.min_count = min_count
+        self.warmup = warmup
+
+        n = len(self.topics)
+        self.current = np.zeros(n, dtype=np.float64)    # Posts in the open bucket
+        self.mean = np.zeros(n, dtype=np.float64)
+        self.var = np.zeros(n, dtype=np.float64)
+        self.closed = 0                                  # Buckets folded into the baseline
+        self.bucket = None                               # Id of the open bucket
+        self.latest = None                               # Newest timestamp seen ("now" for scoring)
+
+    def _close_bucket(self):
+        """Fold the open bucket into the EWMA baseline (vectorized over topics)"""
+        if self.closed == 0:
+            self.mean[:] = self.current
+        else:
+            delta = self.current - self.mean
+            self.mean += self.alpha * delta
+            self.var = (1 - self.alpha) * (self.var + self.alpha * delta * delta)
+        self.closed += 1
+        self.current[:] = 0
+
+    def _advance(self, bucket):
+        """Close the open bucket and any empty buckets up to `bucket`"""
+        if self.bucket is not None:
+            for _ in range(min(bucket - self.bucket, MAX_GAP_STEPS)):
+                self._close_bucket()
+        self.bucket = bucket
+
+    def observe(self, timestamps, topic_codes):
+        """
+        Feed a batch of posts
+        Posts older than the open bucket are counted toward it.
+        Args:
+            timestamps: Epoch seconds per post (roughly time-ordered)
+            topic_codes: Topic index per post (position in self.topics)
+        """
+        if len(timestamps) == 0:
+            return
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        newest = int(timestamps.max())
+        self.latest = newest if self.latest is None else max(self.latest, newest)
+        buckets = timestamps // self.bucket_seconds
+        codes = np.asarray(topic_codes, dtype=np.int64)
+        n = len(self.topics)
+        if self.bucket is not None:
+            buckets = np.maximum(buckets, self.bucket)
+
+        # One bincount per distinct bucket in the batch; usually one or two
+        if (np.diff(buckets) < 0).any():
+            order = np.argsort(buckets, kind='stable')
+            buckets, codes = buckets[order], codes[order]
+        boundaries = np.flatnonzero(np.diff(buckets)) + 1
+        for chunk_buckets, chunk_codes in zip(np.split(buckets, boundaries), np.split(codes, boundaries)):
+            bucket = int(chunk_buckets[0])
+            if self.bucket is None or bucket > self.bucket:
+                self._advance(bucket)
+            self.current += np.bincount(chunk_codes, minlength=n)
+
+    def elapsed(self, now=None):
+        """Fraction of the open bucket that has passed at `now` (default: the newest post seen)"""
+        if self.bucket is None:
+            return 1.0
+        now = self.latest if now is None else now
+        return float(np.clip((now + 1) / self.bucket_seconds - self.bucket, 0.0, 1.0))
+
+    def scores(self, now=None):
+        """
+        z-score of each topic's open-bucket count against its baseline
+        The baseline mean and variance are scaled by the elapsed fraction of
+        the bucket (Poisson arrivals), and the variance is floored at the
+        expected count so quiet topics don't flag on a single extra post.
+        """
+        fraction = self.elapsed(now)
+        expected = self.mean * fraction
+        std = np.sqrt(np.maximum(np.maximum(self.var * fraction, expected), 1.0))
+        return (self.current - expected) / std
+
+    def emerging(self, limit=5, now=None):
+        """
+        Topics currently surging, strongest first
+        Returns:
+            List of (topic, z-score, posts in open bucket, posts expected by now)
+        """
+        if self.closed < self.warmup:
+            return []
+        z = self.scores(now)
+        flagged = np.flatnonzero((z >= self.threshold) & (self.current >= self.min_count))
+        flagged = flagged[np.argsort(-z[flagged])][:limit]
+        fraction = self.elapsed(now)
+        return [(self.topics[i], float(z[i]), int(self.current[i]), float(self.mean[i] * fraction)) for i in flagged]
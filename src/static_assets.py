@@ -0,0 +1,157 @@
+"""
+Static Assets - Minify and fingerprint the files under assets/
+Each asset is written once to src/static/ as <name>.<hash><ext>, which
+Streamlit serves at /app/static/ (server.enableStaticServing). URLs carry the
+hash as ?v=, so browsers cache them indefinitely and a deploy that changes a
+file changes its URL.
+"""
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+import streamlit as st
+
+ASSETS_DIR = Path('assets')
+STATIC_DIR = Path(__file__).parent / 'static'
+STATIC_URL = '/app/static'
+MANIFEST_NAME = 'manifest.json'
+
+HASH_LENGTH = 12
+FINGERPRINTED = re.compile(r'^(?P<stem>.+)\.(?P<hash>[0-9a-f]{%d})(?P<suffix>\.[^.]+)$' % HASH_LENGTH)
+
+# Quoted strings (kept verbatim) or comments (dropped), whichever starts first
+_CSS_STRINGS_OR_COMMENTS = re.compile(r'("(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\')|/\*.*?\*/', re.S)
+_CSS_STRING_SLOT = re.compile(r'\x00(\d+)\x00')
+_CSS_SPACE = re.compile(r'\s+')
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+# A declaration's colon: the next brace or semicolon closes the value, not a selector's block
+_CSS_DECLARATION_COLON = re.compile(r'\s*:\s*(?=[^{};]*[;}])')
+_CSS_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+
+def minify_css(css):
+    """
+    Strip comments and redundant whitespace from a stylesheet
+    Quoted strings are set aside first and restored untouched, and space
+    around ':' is only removed in declarations (`.a :hover` keeps its space).
+    """
+    strings = []
+
+    def set_aside(match):
+        if match.group(1) is None:
+            return ''
+        strings.append(match.group(1))
+        return f'\x00{len(strings) - 1}\x00'
+
+    css = _CSS_STRINGS_OR_COMMENTS.sub(set_aside, css)
+    css = _CSS_SPACE.sub(' ', css)
+    css = _CSS_PUNCTUATION.sub(r'\1', css)
+    css = _CSS_DECLARATION_COLON.sub(':', css)
+    css = css.replace(';}', '}')
+    return _CSS_STRING_SLOT.sub(lambda match: strings[int(match.group(1))], css).strip()
+
+
+def fingerprint(content):
+    return hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+
+
+def asset_url(hashed_name):
+    """Long-cacheable URL for a fingerprinted file in the static dir"""
+    digest = FINGERPRINTED.match(hashed_name).group('hash')
+    return f"{STATIC_URL}/{hashed_name}?v={digest}"
+
+
+def _write_once(path, content):
+    """Write atomically, skipping files that already exist (same name = same content)"""
+    if path.exists():
+        return
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(content)
+    os.replace(tmp, path)
+
+
+def build_assets(source_dir=ASSETS_DIR, output_dir=STATIC_DIR):
+    """
+    Fingerprint every asset and minify stylesheets
+    Binary assets (fonts, icons) are processed first so url() references in
+    stylesheets can be rewritten to their hashed URLs. Fingerprinted files no
+    longer in the manifest are removed.
+    Returns:
+        Manifest dict of source name -> fingerprinted file name
+    """
+    source_dir, output_dir = Path(source_dir), Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+
+    files = sorted(p for p in source_dir.rglob('*') if p.is_file()) if source_dir.is_dir() else []
+    stylesheets = [p for p in files if p.suffix == '.css']
+
+    def emit(path, content):
+        name = path.relative_to(source_dir).as_posix()
+        hashed = f"{path.stem}.{fingerprint(content)}{path.suffix}"
+        _write_once(output_dir / hashed, content)
+        manifest[name] = hashed
+
+    for path in files:
+        if path.suffix != '.css':
+            emit(path, path.read_bytes())
+
+    for path in stylesheets:
+        def rewrite(match):
+            target = (path.parent / match.group(2)).resolve()
+            for name, hashed in manifest.items():
+                if (source_dir / name).resolve() == target:
+                    return f'url("{asset_url(hashed)}")'
+            return match.group(0)
+
+        css = _CSS_URL.sub(rewrite, minify_css(path.read_text()))
+        emit(path, css.encode())
+
+    live = set(manifest.values())
+    for stale in output_dir.iterdir():
+        if FINGERPRINTED.match(stale.name) and stale.name not in live:
+            stale.unlink(missing_ok=True)
+
+    _write_manifest(output_dir / MANIFEST_NAME, manifest)
+    return manifest
+
+
+def _write_manifest(path, manifest):
+    content = json.dumps(manifest, indent=2, sort_keys=True).encode()
+    if not path.exists() or path.read_bytes() != content:
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(content)
+        os.replace(tmp, path)
+
+
+def _assets_version(source_dir=ASSETS_DIR):
+    """Cheap change detector: (name, mtime, size) of every source asset"""
+    if not source_dir.is_dir():
+        return ()
+    return tuple(
+        (p.as_posix(), p.stat().st_mtime_ns, p.stat().st_size)
+        for p in sorted(source_dir.rglob('*')) if p.is_file()
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def _build_stylesheet_tag(version):
+    manifest = build_assets()
+    hashed = manifest.get('custom.css')
+    if hashed is None:
+        return ''
+    css = (STATIC_DIR / hashed).read_text()
+    return f'<style data-asset="{hashed}">{css}</style>'
+
+
+def stylesheet_tag():
+    """
+    <style> tag for the app stylesheet, built once per asset version
+    Streamlit serves non-image static files as text/plain with nosniff, so
+    browsers won't apply a <link>ed stylesheet from /app/static; the minified
+    CSS is inlined instead and shared across sessions. Fonts and icons it
+    references load from fingerprinted, long-cached URLs.
+    """
+    return _build_stylesheet_tag(_assets_version())
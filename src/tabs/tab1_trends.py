@@ -2,85 +2,221 @@
 Tab 1: Social Trends Monitor
 Displays curated trending topics with sentiment analysis and gender comparisons
 """
+import time
 import streamlit as st
-import json
-import pandas as pd
-from components import metric_card, gender_comparison_chart, sentiment_indicator
+import numpy as np
+from activity import peak_hours
+from components import (
+    metric_card, gender_comparison_chart, sentiment_indicator, activity_heatmap,
+    topic_landscape_chart, topic_landscape_density, export_panel, sentiment_call, inline_html, SENTIMENT_STYLES
+)
+from datasets import (
+    load_activity, load_cube, load_dataset, load_export_jobs, load_intervals, load_landscape_grid,
+    load_post_index, load_related, load_spike_detector, load_trend_export, load_trends, query_trends_view
+)
+from cube import DIMENSIONS
 from design_system import COLORS
+from intervals import ALL_TIME, CONFIDENCE
+from landscape import SENTIMENT_RANGE, WEBGL_POINT_LIMIT, gender_skew, in_view, volume_stops
+from post_index import SORTS
+from rollups import SEGMENTS, WINDOWS
+from schema import SchemaError
+
+PEAK_WINDOW_HOURS = 3
+SLICE_LABELS = {
+    'gender_skew': "Gender skew",
+    'peak_time': "Peak time",
+    'sentiment': "Sentiment",
+    'velocity': "Velocity",
+}
+EMERGING_LIMIT = 3
+RELATED_LIMIT = 5
+DRILLDOWN_PAGE_SIZE = 10
+DEFAULT_WINDOW = '7d'
+TOP_TOPICS = 15
+
+
+def format_count(n):
+    """Compact count for metric cards (e.g., 2400 -> "2.4K")"""
+    return f"{n / 1000:.1f}K" if n >= 1000 else str(n)
+
+
+def _drilldown_pages(view):
+    """Cursor stack of the drill-down view (None = first page), reset when the topic or sort changes"""
+    pages = st.session_state.get('drilldown')
+    if pages is None or pages['view'] != view:
+        pages = {'view': view, 'cursors': [None], 'next': None}
+        st.session_state['drilldown'] = pages
+    return pages
+
+
+def _next_drilldown_page():
+    pages = st.session_state['drilldown']
+    pages['cursors'].append(pages['next'])
+
+
+def _previous_drilldown_page():
+    st.session_state['drilldown']['cursors'].pop()
 
 
 def render():
     """Render the Social Trends Monitor tab"""
+    # Load and validate before emitting anything, so a bad file can't half-render the tab
+    try:
+        data = load_dataset('mock_trends')
+        trends = load_trends()
+    except SchemaError as e:
+        st.header("🔥 Social Trends Monitor")
+        st.error(f"❌ Trends data failed to load.\n\n```\n{e}\n```")
+        return
+    
     st.header("🔥 Social Trends Monitor")
     st.caption("Curated trending topics in dating & relationships")
     
-    # Load mock data
-    with open('data/mock_trends.json', 'r') as f:
-        data = json.load(f)
+    # Hour-of-week activity derived from the post log
+    activity = load_activity(tuple(trends.topics))
+    
+    window = st.radio(
+        "Time window",
+        list(WINDOWS),
+        index=list(WINDOWS).index(DEFAULT_WINDOW),
+        horizontal=True,
+        key="trends_window"
+    )
+    
+    # Cross-filters; every view below reads the same pre-aggregated cube
+    cube = load_cube(tuple(trends.topics), window)
+    current = {name: st.session_state.get(f"trends_slice_{name}", []) for name in DIMENSIONS}
+    selection = {}
+    for col, (name, labels) in zip(st.columns(len(DIMENSIONS)), DIMENSIONS.items()):
+        # Option counts honour the other dimensions' filters
+        counts = dict(zip(labels, cube.marginal(name, selection=current).astype(int)))
+        with col:
+            selection[name] = st.multiselect(
+                SLICE_LABELS[name],
+                labels,
+                format_func=lambda label, counts=counts: f"{label} ({counts[label]})",
+                placeholder="All",
+                key=f"trends_slice_{name}"
+            )
+    view = query_trends_view(window, selection, TOP_TOPICS)
+    totals = view['totals']
+    participants = view['participants']
     
     # Top metrics row
     st.markdown("### Key Metrics")
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
+        active = int(totals['active'])
+        active_change = active - int(totals['previous_active'])
         metric_card(
             "Active Topics",
-            str(data['engagement_stats']['total_discussions']),
-            f"+{data['engagement_stats']['weekly_growth']}",
-            "vs last week",
-            True
+            str(active),
+            f"{active_change:+d}",
+            f"vs prior {window}",
+            active_change >= 0
         )
     
     with col2:
-        avg_sent = data['engagement_stats']['avg_sentiment']
+        avg_sent = totals['sentiment_sum'] / totals['volume'] if totals['volume'] else float('nan')
+        prev_sent = totals['previous_sentiment_sum'] / totals['previous_volume'] if totals['previous_volume'] else float('nan')
+        has_prev = not np.isnan(prev_sent)
         metric_card(
             "Avg Sentiment",
-            f"{avg_sent:+.2f}",
-            f"{abs(avg_sent - 0.25):.2f}",
-            "vs baseline",
-            avg_sent > 0.25
+            f"{avg_sent:+.2f}" if not np.isnan(avg_sent) else "—",
+            f"{abs(avg_sent - prev_sent):.2f}" if has_prev else "—",
+            f"vs prior {window}",
+            not has_prev or avg_sent >= prev_sent
         )
     
     with col3:
         metric_card(
             "Peak Activity",
-            data['engagement_stats']['peak_hours'],
-            "2 hrs",
+            peak_hours(view['activity'], PEAK_WINDOW_HOURS) if view['activity'].sum() else "—",
+            f"{PEAK_WINDOW_HOURS} hrs",
             "window",
             True
         )
     
     with col4:
+        # Distinct authors across the filtered topics (HyperLogLog union, not a sum)
+        authors, previous_authors = participants['current'], participants['previous']
+        author_growth = (authors - previous_authors) / previous_authors * 100 if previous_authors else None
         metric_card(
-            "Engagement",
-            "2.4K",
-            "+18%",
-            "comments",
-            True
+            "Participants",
+            f"~{format_count(round(authors))}",
+            f"{author_growth:+.0f}%" if author_growth is not None else "—",
+            f"unique authors vs prior {window}",
+            author_growth is None or author_growth >= 0
         )
     
+    segment_counts = " · ".join(
+        f"{segment} ~{format_count(round(count))}"
+        for segment, count in zip(SEGMENTS, participants['segments'])
+    )
+    st.caption(
+        f"{format_count(int(totals['volume']))} posts over the last {window}. Unique authors by segment: "
+        f"{segment_counts} (estimates, ±{participants['relative_error']:.1%} standard error)"
+    )
+    
+    st.markdown("---")
+    
+    # Emerging topics (today's posts vs each topic's running baseline)
+    st.subheader("⚡ Emerging Now")
+    detector = load_spike_detector(tuple(trends.topics))
+    emerging = detector.emerging(EMERGING_LIMIT)
+    if not emerging:
+        st.caption("No topics are surging above their usual daily volume right now")
+    else:
+        st.caption(f"Topics running at least {detector.threshold:.0f}σ above their usual daily volume")
+        for col, (topic, z, current, expected) in zip(st.columns(EMERGING_LIMIT), emerging):
+            with col:
+                st.markdown(f"""
+                <div style="
+                    background: {COLORS['bg_card']};
+                    border: 1px solid {COLORS['border_default']};
+                    border-left: 3px solid {COLORS['warning']};
+                    border-radius: 8px;
+                    padding: 16px;
+                ">
+                    <div style="color: {COLORS['text_primary']}; font-size: 14px; font-weight: 600;">{topic}</div>
+                    <div style="color: {COLORS['warning']}; font-size: 24px; font-weight: 700; margin: 6px 0;">+{z:.1f}σ</div>
+                    <div style="color: {COLORS['text_secondary']}; font-size: 12px;">{current} posts today vs ~{expected:.0f} expected by now</div>
+                </div>
+                """, unsafe_allow_html=True)
+    
     st.markdown("---")
     
     # Trending topics table
     st.subheader("📊 Top Trending Topics")
-    st.caption("Ranked by discussion volume and velocity")
-    
-    # Prepare data
-    df = pd.DataFrame(data['trends'][:15])
-    
-    # Create display dataframe
-    display_df = pd.DataFrame({
-        'Rank': range(1, len(df) + 1),
-        'Topic': df['topic'],
-        'Volume': df['volume'],
-        'Sentiment': df['sentiment'].apply(lambda x: f"{x:+.2f}"),
-        'Velocity': df['velocity'].apply(lambda x: f"{x:+.1f}%"),
-        'Peak Time': df['peak_time']
-    })
-    
-    # Style the dataframe
+    st.caption(f"Ranked by discussion volume over the last {window}; velocity is the change vs the prior {window}")
+    
+    # Top filtered topics by window volume, ties broken by growth (from the cached view)
+    order, rows = view['order'], view['rows']
+    top = trends.take(order)
+    
+    # Create display columns
+    display_columns = {
+        'Rank': np.arange(1, len(top) + 1),
+        'Topic': top.topics,
+        'Volume': rows['volume'],
+        'Participants': rows['participants'],
+        'Volume Trend': rows['volume_history'],
+        'Sentiment': [
+            "—" if np.isnan(x) else f"{SENTIMENT_STYLES[sentiment_call(x, (low, high))][1]} {x:+.2f} ±{(high - low) / 2:.2f}"
+            for x, low, high in zip(rows['sentiment'], rows['sentiment_low'], rows['sentiment_high'])
+        ],
+        'Sentiment Trend': rows['sentiment_history'],
+        'Velocity': ["—" if np.isnan(x) else f"{x:+.1f}%" for x in rows['growth']],
+        'Peak Time': ["—" if label is None else label for label in rows['peak_time']]
+    }
+    if view['keywords_scored']:
+        display_columns['Top Keyword'] = ["—" if keyword is None else keyword for keyword in rows['keyword']]
+    
+    # Style the table
     st.dataframe(
-        display_df,
+        display_columns,
         use_container_width=True,
         hide_index=True,
         column_config={
@@ -96,8 +232,23 @@ def render():
                 "Volume",
                 format="%d"
             ),
+            "Participants": st.column_config.NumberColumn(
+                "Participants",
+                help="Estimated unique authors in the window",
+                format="~%d"
+            ),
+            "Volume Trend": st.column_config.LineChartColumn(
+                f"Volume ({window})",
+                y_min=0
+            ),
             "Sentiment": st.column_config.TextColumn(
-                "Sentiment"
+                "Sentiment",
+                help=f"Mean sentiment ± half its {CONFIDENCE:.0%} confidence interval; 🤔 when the interval straddles ±0.3"
+            ),
+            "Sentiment Trend": st.column_config.LineChartColumn(
+                f"Sentiment ({window})",
+                y_min=-1,
+                y_max=1
             ),
             "Velocity": st.column_config.TextColumn(
                 "Velocity"
@@ -105,27 +256,199 @@ def render():
             "Peak Time": st.column_config.TextColumn(
                 "Peak Time",
                 width="small"
+            ),
+            "Top Keyword": st.column_config.TextColumn(
+                "Top Keyword",
+                help="Most-mentioned top keyword in the topic's posts"
             )
         }
     )
     
+    # Every topic with its per-segment and bucket history columns, streamed in chunks
+    trend_export, export_version = load_trend_export(window)
+    export_panel(trend_export, export_version, load_export_jobs(), key="trends_export")
+    
+    # Related topics for one table row (precomputed neighbour index, O(k) per lookup)
+    if top.topics:
+        related_topic = st.selectbox(
+            "🔗 Related topics for",
+            top.topics,
+            key="related_topic"
+        )
+        related = load_related(tuple(trends.topics)).related(related_topic, RELATED_LIMIT)
+        if related:
+            chips = "".join(inline_html(f"""
+                <span style="
+                    display: inline-block;
+                    background: {COLORS['bg_card']};
+                    border: 1px solid {COLORS['border_default']};
+                    border-radius: 16px;
+                    padding: 6px 14px;
+                    margin: 4px 6px 4px 0;
+                    color: {COLORS['text_primary']};
+                    font-size: 13px;
+                ">
+                    {topic} <span style="color: {COLORS['text_secondary']};">{score:.0%}</span>
+                </span>
+            """) for topic, score in related)
+            st.markdown(f"<div>{chips}</div>", unsafe_allow_html=True)
+            st.caption("Topics with the most overlapping audience (cosine similarity over shared authors)")
+        else:
+            st.caption("Not enough shared authors to suggest related topics yet")
+    
+    st.markdown("---")
+    
+    # Drill-down into one topic's posts (keyset pages read from a covering index)
+    if top.topics:
+        st.subheader("🔎 Posts Behind a Topic")
+        post_index = load_post_index(tuple(trends.topics))
+        col1, col2 = st.columns([3, 2])
+        with col1:
+            drill_topic = st.selectbox(
+                "Topic",
+                top.topics,
+                key="drilldown_topic"
+            )
+        with col2:
+            drill_sort = st.radio(
+                "Sort by",
+                list(SORTS),
+                horizontal=True,
+                key="drilldown_sort"
+            )
+        
+        pages = _drilldown_pages((drill_topic, drill_sort))
+        page = post_index.page(drill_topic, drill_sort, pages['cursors'][-1], DRILLDOWN_PAGE_SIZE)
+        pages['next'] = page.next_cursor
+        
+        topic_volume = post_index.volume(drill_topic)
+        mean = post_index.mean_sentiment(drill_topic)
+        st.caption(f"{topic_volume:,} posts all time · page {len(pages['cursors'])}")
+        if not np.isnan(mean):
+            low, high = load_intervals(tuple(trends.topics)).sentiment[ALL_TIME]
+            topic = order[top.topics.index(drill_topic)]
+            st.markdown(
+                f"Mean sentiment {inline_html(sentiment_indicator(mean, (float(low[topic]), float(high[topic]))))}",
+                unsafe_allow_html=True
+            )
+        
+        rows = "".join(inline_html(f"""
+            <div style="
+                display: flex;
+                align-items: center;
+                justify-content: space-between;
+                padding: 10px 14px;
+                border-bottom: 1px solid {COLORS['border_default']};
+            ">
+                <span style="color: {COLORS['text_secondary']}; font-size: 13px;">
+                    {time.strftime('%b %d, %H:%M UTC', time.gmtime(post['timestamp']))}
+                    · <span style="color: {COLORS['text_primary']};">{post['author']}</span>
+                    · {post['gender']}
+                </span>
+                {inline_html(sentiment_indicator(post['sentiment']))}
+            </div>
+        """) for post in page.rows)
+        st.markdown(f"""
+        <div style="
+            background: {COLORS['bg_card']};
+            border: 1px solid {COLORS['border_default']};
+            border-radius: 12px;
+            overflow: hidden;
+        ">
+            {rows}
+        </div>
+        """, unsafe_allow_html=True)
+        
+        col1, col2, _ = st.columns([1, 1, 4])
+        with col1:
+            st.button("← Previous", on_click=_previous_drilldown_page, disabled=len(pages['cursors']) == 1,
+                      use_container_width=True, key="drilldown_previous")
+        with col2:
+            st.button("Next →", on_click=_next_drilldown_page, disabled=not page.has_more,
+                      use_container_width=True, key="drilldown_next")
+        
+        st.markdown("---")
+    
+    # Topic landscape (every topic; binned server-side past the WebGL point limit)
+    st.subheader("🗺️ Topic Landscape")
+    st.caption("Every tracked topic by volume and sentiment, colored by gender skew")
+    
+    stops = volume_stops(int(trends['volume'].max()))
+    col1, col2 = st.columns(2)
+    with col1:
+        volume_range = st.select_slider(
+            "Volume range",
+            options=stops,
+            value=(stops[0], stops[-1]),
+            format_func=lambda v: f"{v:,}",
+            key="landscape_volume"
+        )
+    with col2:
+        sentiment_range = st.slider(
+            "Sentiment range",
+            *SENTIMENT_RANGE,
+            value=SENTIMENT_RANGE,
+            step=0.1,
+            key="landscape_sentiment"
+        )
+    
+    visible = in_view(trends['volume'], trends['sentiment'], volume_range, sentiment_range)
+    if visible.sum() <= WEBGL_POINT_LIMIT:
+        indices = np.flatnonzero(visible)
+        fig = topic_landscape_chart(
+            [trends.topics[i] for i in indices],
+            trends['volume'][indices],
+            trends['sentiment'][indices],
+            gender_skew(trends['women_interest'][indices], trends['men_interest'][indices]),
+            f"Topic Landscape - {len(indices):,} topics"
+        )
+    else:
+        grid = load_landscape_grid(volume_range, sentiment_range)
+        fig = topic_landscape_density(grid, f"Topic Density - {grid.total:,} topics")
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.markdown("---")
+    
+    # Activity heatmap
+    st.subheader("🕒 Activity by Hour of Week")
+    st.caption("When discussions happen, bucketed from post timestamps (UTC)")
+    
+    heatmap_topic = st.selectbox(
+        "Topic",
+        ["All topics"] + activity.topics,
+        key="activity_heatmap_topic"
+    )
+    if heatmap_topic == "All topics":
+        week_counts = activity.total
+    else:
+        week_counts = activity.topic_counts(heatmap_topic)
+    
+    fig = activity_heatmap(week_counts, f"Posts per Hour - {heatmap_topic}")
+    st.plotly_chart(fig, use_container_width=True)
+    
     st.markdown("---")
     
     # Gender interest comparison
     st.subheader("⚖️ Gender Interest Comparison")
-    st.caption("Which topics resonate more with women vs men")
+    st.caption(
+        f"Which topics resonate more with women vs men; error bars are {CONFIDENCE:.0%} intervals "
+        "given each segment's posts on the topic"
+    )
     
     # Select top 8 topics for visualization
-    topics_sample = df.iloc[:8]
-    topics = [t[:30] + '...' if len(t) > 30 else t for t in topics_sample['topic']]
+    topics_sample = trends.take(order[:8])
+    topics = [t[:30] + '...' if len(t) > 30 else t for t in topics_sample.topics]
     women = topics_sample['women_interest'].tolist()
     men = topics_sample['men_interest'].tolist()
+    interest = load_intervals(tuple(trends.topics)).interest
     
     fig = gender_comparison_chart(
         topics,
         women,
         men,
-        "Interest Level by Gender (%)"
+        "Interest Level by Gender (%)",
+        women_intervals=tuple(bound[order[:8]] for bound in interest['women']),
+        men_intervals=tuple(bound[order[:8]] for bound in interest['men'])
     )
     st.plotly_chart(fig, use_container_width=True)
     
@@ -3,68 +3,79 @@ Tab 2: Attraction Science Hub
 Research-backed insights on physical and behavioral attraction factors
 """
 import streamlit as st
-import json
-import plotly.graph_objects as go
-from design_system import COLORS, get_plotly_layout
+from components import disclosure_list, export_panel, trait_radar_chart
+from datasets import load_catalog, load_catalog_export, load_export_jobs
+from design_system import COLORS
+from records import CATALOG_RECORDS
+from schema import SchemaError
 
 
 def render():
     """Render the Attraction Science Hub tab"""
+    # Load and validate before emitting anything, so a bad file can't half-render the tab
+    try:
+        data = load_catalog('attraction_research')
+    except SchemaError as e:
+        st.header("💡 Attraction Science Hub")
+        st.error(f"❌ Research data failed to load.\n\n```\n{e}\n```")
+        return
+    
     st.header("💡 Attraction Science Hub")
     st.caption("Research-backed insights on what drives attraction")
     
-    # Load research data
-    with open('data/attraction_research.json', 'r') as f:
-        data = json.load(f)
-    
     # Physical factors section
     st.subheader("📏 Physical Attraction Factors")
     st.markdown("*Based on peer-reviewed research*")
     st.markdown("")
     
-    for factor in data['physical_factors']:
-        with st.expander(f"**{factor['factor']}**", expanded=False):
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown(f"""
-                <div style="
-                    background: {COLORS['women_blue']}15;
-                    border-left: 3px solid {COLORS['women_blue']};
-                    padding: 15px;
-                    border-radius: 6px;
-                    margin-bottom: 10px;
-                ">
-                    <p style="color: {COLORS['women_blue']}; font-size: 12px; font-weight: 600; text-transform: uppercase; margin-bottom: 5px;">
-                        👩 Women Prefer
-                    </p>
-                    <p style="color: {COLORS['text_primary']}; font-size: 14px; margin: 0;">
-                        {factor['women_preference']}
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown(f"""
-                <div style="
-                    background: {COLORS['men_red']}15;
-                    border-left: 3px solid {COLORS['men_red']};
-                    padding: 15px;
-                    border-radius: 6px;
-                    margin-bottom: 10px;
-                ">
-                    <p style="color: {COLORS['men_red']}; font-size: 12px; font-weight: 600; text-transform: uppercase; margin-bottom: 5px;">
-                        👨 Men Prefer
-                    </p>
-                    <p style="color: {COLORS['text_primary']}; font-size: 14px; margin: 0;">
-                        {factor['men_preference']}
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown(f"**📚 Research:** {factor['research']}")
-            st.markdown(f"**🔍 Key Finding:** {factor['key_finding']}")
-            st.info(f"💡 **Practical Tip:** {factor['practical_tip']}")
+    # Only the opened factors' detail bodies are built and sent
+    physical_factors = disclosure_list(
+        data['physical_factors'],
+        title=lambda factor: f"**{factor.factor}**",
+        summary=lambda factor: f"🔍 {factor.key_finding}",
+        key="physical_factor"
+    )
+    for factor in physical_factors:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown(f"""
+            <div style="
+                background: {COLORS['women_blue']}15;
+                border-left: 3px solid {COLORS['women_blue']};
+                padding: 15px;
+                border-radius: 6px;
+                margin-bottom: 10px;
+            ">
+                <p style="color: {COLORS['women_blue']}; font-size: 12px; font-weight: 600; text-transform: uppercase; margin-bottom: 5px;">
+                    👩 Women Prefer
+                </p>
+                <p style="color: {COLORS['text_primary']}; font-size: 14px; margin: 0;">
+                    {factor.women_preference}
+                </p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown(f"""
+            <div style="
+                background: {COLORS['men_red']}15;
+                border-left: 3px solid {COLORS['men_red']};
+                padding: 15px;
+                border-radius: 6px;
+                margin-bottom: 10px;
+            ">
+                <p style="color: {COLORS['men_red']}; font-size: 12px; font-weight: 600; text-transform: uppercase; margin-bottom: 5px;">
+                    👨 Men Prefer
+                </p>
+                <p style="color: {COLORS['text_primary']}; font-size: 14px; margin: 0;">
+                    {factor.men_preference}
+                </p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        st.markdown(f"**📚 Research:** {factor.research}")
+        st.info(f"💡 **Practical Tip:** {factor.practical_tip}")
     
     st.markdown("---")
     
@@ -74,48 +85,11 @@ def render():
     st.markdown("")
     
     # Create radar chart
-    traits = [item['trait'] for item in data['behavioral_factors']]
-    scores = [item['attractiveness_score'] for item in data['behavioral_factors']]
-    
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatterpolar(
-        r=scores,
-        theta=traits,
-        fill='toself',
-        fillcolor=f"rgba(0, 230, 118, 0.15)",
-        line=dict(color=COLORS['green_primary'], width=3),
-        marker=dict(size=8, color=COLORS['green_primary']),
-        name='Attractiveness Score',
-        hovertemplate='<b>%{theta}</b><br>Score: %{r}/10<extra></extra>'
-    ))
-    
-    layout = get_plotly_layout()
-    layout.update({
-        'polar': {
-            'bgcolor': COLORS['bg_card'],
-            'radialaxis': {
-                'visible': True,
-                'range': [0, 10],
-                'gridcolor': COLORS['border_default'],
-                'tickfont': {'color': COLORS['text_secondary'], 'size': 10}
-            },
-            'angularaxis': {
-                'gridcolor': COLORS['border_default'],
-                'tickfont': {'color': COLORS['text_primary'], 'size': 11}
-            }
-        },
-        'showlegend': False,
-        'title': {
-            'text': 'Attractiveness Ratings by Trait (0-10 scale)',
-            'font': {'size': 18, 'color': COLORS['text_primary']},
-            'x': 0.5,
-            'xanchor': 'center'
-        },
-        'height': 500
-    })
-    
-    fig.update_layout(**layout)
+    fig = trait_radar_chart(
+        [item.trait for item in data['behavioral_factors']],
+        [item.attractiveness_score for item in data['behavioral_factors']],
+        'Attractiveness Ratings by Trait (0-10 scale)'
+    )
     st.plotly_chart(fig, use_container_width=True)
     
     # Behavioral traits details
@@ -133,7 +107,7 @@ def render():
         ">
             <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
                 <h4 style="color: {COLORS['text_primary']}; margin: 0;">
-                    {trait_data['trait']}
+                    {trait_data.trait}
                 </h4>
                 <span style="
                     background: {COLORS['green_primary']}20;
@@ -143,14 +117,14 @@ def render():
                     font-size: 13px;
                     font-weight: 600;
                 ">
-                    {trait_data['attractiveness_score']}/10
+                    {trait_data.attractiveness_score}/10
                 </span>
             </div>
             <p style="color: {COLORS['text_secondary']}; font-size: 13px; margin-bottom: 8px;">
-                <strong>How to demonstrate:</strong> {trait_data['how_to_demonstrate']}
+                <strong>How to demonstrate:</strong> {trait_data.how_to_demonstrate}
             </p>
             <p style="color: {COLORS['text_muted']}; font-size: 12px; margin: 0;">
-                <em>{trait_data['gender_difference']}</em>
+                <em>{trait_data.gender_difference}</em>
             </p>
         </div>
         """, unsafe_allow_html=True)
@@ -172,10 +146,10 @@ def render():
             border-radius: 0 8px 8px 0;
         ">
             <h4 style="color: {COLORS['text_primary']}; margin-top: 0; margin-bottom: 8px;">
-                {insight['insight']}
+                {insight.insight}
             </h4>
             <p style="color: {COLORS['text_secondary']}; font-size: 14px; margin-bottom: 10px;">
-                {insight['description']}
+                {insight.description}
             </p>
             <div style="
                 background: {COLORS['bg_primary']};
@@ -183,7 +157,7 @@ def render():
                 border-radius: 6px;
             ">
                 <p style="color: {COLORS['green_primary']}; font-size: 13px; margin: 0;">
-                    <strong>💡 Implication:</strong> {insight['implication']}
+                    <strong>💡 Implication:</strong> {insight.implication}
                 </p>
             </div>
         </div>
@@ -191,5 +165,18 @@ def render():
     
     st.markdown("---")
     
+    # Export one research section as CSV/Parquet
+    st.subheader("⬇️ Export")
+    export_section = st.selectbox(
+        "Section",
+        list(CATALOG_RECORDS['attraction_research']),
+        format_func=lambda section: section.replace('_', ' ').capitalize(),
+        key="research_export_section"
+    )
+    section_export, export_version = load_catalog_export('attraction_research', export_section)
+    export_panel(section_export, export_version, load_export_jobs(), key="research_export")
+    
+    st.markdown("---")
+    
     # Bottom info
     st.info("📖 All insights are based on peer-reviewed research in psychology and behavioral science. Individual experiences may vary.")
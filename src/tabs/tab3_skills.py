@@ -3,105 +3,129 @@ Tab 3: Social Skills Lab
 Actionable communication guidance and body language decoding
 """
 import streamlit as st
-import json
-from components import probability_bar
+from components import disclosure_list, export_panel, probability_bar
+from datasets import load_catalog, load_catalog_export, load_export_jobs, load_tip_rankers
 from design_system import COLORS
+from ranking import SCENARIOS
+from records import CATALOG_RECORDS
+from schema import SchemaError
 
 
 def render():
     """Render the Social Skills Lab tab"""
+    # Load and validate before emitting anything, so a bad file can't half-render the tab
+    try:
+        data = load_catalog('social_skills')
+    except SchemaError as e:
+        st.header("🎭 Social Skills Lab")
+        st.error(f"❌ Skills data failed to load.\n\n```\n{e}\n```")
+        return
+    
     st.header("🎭 Social Skills Lab")
     st.caption("Actionable guidance for better communication and connection")
     
-    # Load skills data
-    with open('data/social_skills.json', 'r') as f:
-        data = json.load(f)
+    # Scenario picker; tips and signals below are ranked for it
+    col1, col2 = st.columns(2)
+    with col1:
+        scenario = st.selectbox(
+            "🎯 Your scenario",
+            ["All scenarios"] + list(SCENARIOS),
+            key="skills_scenario"
+        )
+    with col2:
+        situation = st.text_input(
+            "Or describe your situation",
+            placeholder="e.g., meeting someone at a friend's party",
+            key="skills_situation"
+        )
+    query = situation.strip() or SCENARIOS.get(scenario, "")
+    if query:
+        rankers = load_tip_rankers()
+        tip_order = rankers['communication_tips'].rank(query)
+        signals = [data['body_language'][i] for i in rankers['body_language'].rank(query)]
+    else:
+        tip_order = range(len(data['communication_tips']))
+        signals = data['body_language']
+    tips = [data['communication_tips'][i] for i in tip_order]
     
     # Communication tips section
     st.subheader("💬 Communication Effectiveness Guide")
-    st.markdown("*Practical do's and don'ts for various dating scenarios*")
+    st.markdown("*Most relevant to your scenario first*" if query else "*Practical do's and don'ts for various dating scenarios*")
     st.markdown("")
     
-    for tip in data['communication_tips']:
-        with st.expander(f"**{tip['category']}** - Effectiveness: {tip['effectiveness']}/10", expanded=False):
-            # Context info
+    # Only the opened tips' detail bodies are built and sent
+    communication_tips = disclosure_list(
+        tips,
+        title=lambda tip: f"**{tip.category}** - Effectiveness: {tip.effectiveness}/10",
+        summary=lambda tip: f"📍 {tip.context}",
+        key="communication_tip",
+        item_keys=tip_order     # Catalog index, so an opened tip stays open as the ranking changes
+    )
+    for tip in communication_tips:
+        col1, col2 = st.columns(2)
+        
+        with col1:
             st.markdown(f"""
             <div style="
-                background: {COLORS['bg_secondary']};
-                padding: 8px 12px;
-                border-radius: 6px;
-                margin-bottom: 15px;
+                background: {COLORS['green_primary']}10;
+                border: 2px solid {COLORS['green_primary']};
+                border-radius: 8px;
+                padding: 15px;
             ">
-                <span style="color: {COLORS['text_secondary']}; font-size: 12px;">
-                    📍 <strong>Best Context:</strong> {tip['context']}
-                </span>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown(f"""
+                <h4 style="color: {COLORS['green_primary']}; margin-top: 0; margin-bottom: 10px;">
+                    ✅ DO
+                </h4>
+                <p style="color: {COLORS['text_primary']}; font-size: 14px; margin-bottom: 15px;">
+                    {tip.do}
+                </p>
                 <div style="
-                    background: {COLORS['green_primary']}10;
-                    border: 2px solid {COLORS['green_primary']};
-                    border-radius: 8px;
-                    padding: 15px;
+                    background: {COLORS['bg_primary']};
+                    padding: 12px;
+                    border-radius: 6px;
+                    font-family: monospace;
+                    font-size: 13px;
+                    color: {COLORS['text_secondary']};
+                    line-height: 1.5;
                 ">
-                    <h4 style="color: {COLORS['green_primary']}; margin-top: 0; margin-bottom: 10px;">
-                        ✅ DO
-                    </h4>
-                    <p style="color: {COLORS['text_primary']}; font-size: 14px; margin-bottom: 15px;">
-                        {tip['do']}
-                    </p>
-                    <div style="
-                        background: {COLORS['bg_primary']};
-                        padding: 12px;
-                        border-radius: 6px;
-                        font-family: monospace;
-                        font-size: 13px;
-                        color: {COLORS['text_secondary']};
-                        line-height: 1.5;
-                    ">
-                        "{tip['example_good']}"
-                    </div>
+                    "{tip.example_good}"
                 </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown(f"""
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown(f"""
+            <div style="
+                background: {COLORS['red_primary']}10;
+                border: 2px solid {COLORS['red_primary']};
+                border-radius: 8px;
+                padding: 15px;
+            ">
+                <h4 style="color: {COLORS['red_primary']}; margin-top: 0; margin-bottom: 10px;">
+                    ❌ DON'T
+                </h4>
+                <p style="color: {COLORS['text_primary']}; font-size: 14px; margin-bottom: 15px;">
+                    {tip.dont}
+                </p>
                 <div style="
-                    background: {COLORS['red_primary']}10;
-                    border: 2px solid {COLORS['red_primary']};
-                    border-radius: 8px;
-                    padding: 15px;
+                    background: {COLORS['bg_primary']};
+                    padding: 12px;
+                    border-radius: 6px;
+                    font-family: monospace;
+                    font-size: 13px;
+                    color: {COLORS['text_secondary']};
+                    line-height: 1.5;
                 ">
-                    <h4 style="color: {COLORS['red_primary']}; margin-top: 0; margin-bottom: 10px;">
-                        ❌ DON'T
-                    </h4>
-                    <p style="color: {COLORS['text_primary']}; font-size: 14px; margin-bottom: 15px;">
-                        {tip['dont']}
-                    </p>
-                    <div style="
-                        background: {COLORS['bg_primary']};
-                        padding: 12px;
-                        border-radius: 6px;
-                        font-family: monospace;
-                        font-size: 13px;
-                        color: {COLORS['text_secondary']};
-                        line-height: 1.5;
-                    ">
-                        "{tip['example_bad']}"
-                    </div>
+                    "{tip.example_bad}"
                 </div>
-                """, unsafe_allow_html=True)
-            
-            # Effectiveness bar
-            st.markdown("<br>", unsafe_allow_html=True)
-            probability_bar(
-                "Effectiveness Rating",
-                int(tip['effectiveness'] * 10)
-            )
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Effectiveness bar
+        st.markdown("<br>", unsafe_allow_html=True)
+        probability_bar(
+            "Effectiveness Rating",
+            int(tip.effectiveness * 10)
+        )
     
     st.markdown("---")
     
@@ -110,21 +134,21 @@ def render():
     st.markdown("*Understanding and using non-verbal communication*")
     st.markdown("")
     
-    for signal in data['body_language']:
+    for signal in signals:
         with st.container():
             # Use native Streamlit components instead of complex HTML
-            st.markdown(f"### {signal['signal']}")
+            st.markdown(f"### {signal.signal}")
             
             # Meaning section
             st.markdown(f"**📍 Meaning**")
-            st.write(signal['meaning'])
+            st.write(signal.meaning)
             
             # How to use section
             st.markdown(f"**✅ How to Use**")
-            st.write(signal['how_to_use'])
+            st.write(signal.how_to_use)
             
             # Common mistake section
-            st.warning(f"**⚠️ Common Mistake:** {signal['common_mistake']}")
+            st.warning(f"**⚠️ Common Mistake:** {signal.common_mistake}")
             
             st.markdown("---")
     
@@ -235,10 +259,10 @@ def render():
             margin: 12px 0;
         ">
             <h4 style="color: {COLORS['red_primary']}; margin-top: 0; margin-bottom: 10px;">
-                ❌ {mistake['mistake']}
+                ❌ {mistake.mistake}
             </h4>
             <p style="color: {COLORS['text_secondary']}; font-size: 14px; margin-bottom: 10px;">
-                <strong>Why it fails:</strong> {mistake['why_it_fails']}
+                <strong>Why it fails:</strong> {mistake.why_it_fails}
             </p>
             <div style="
                 background: {COLORS['green_primary']}10;
@@ -247,7 +271,7 @@ def render():
                 border-radius: 4px;
             ">
                 <p style="color: {COLORS['text_primary']}; font-size: 13px; margin: 0;">
-                    <strong>✅ Fix:</strong> {mistake['fix']}
+                    <strong>✅ Fix:</strong> {mistake.fix}
                 </p>
             </div>
         </div>
@@ -255,5 +279,18 @@ def render():
     
     st.markdown("---")
     
+    # Export one skills section as CSV/Parquet
+    st.subheader("⬇️ Export")
+    export_section = st.selectbox(
+        "Section",
+        list(CATALOG_RECORDS['social_skills']),
+        format_func=lambda section: section.replace('_', ' ').capitalize(),
+        key="skills_export_section"
+    )
+    section_export, export_version = load_catalog_export('social_skills', export_section)
+    export_panel(section_export, export_version, load_export_jobs(), key="skills_export")
+    
+    st.markdown("---")
+    
     # Bottom note
     st.success("💪 Remember: Social skills improve with practice. Start with one or two techniques and gradually expand your toolkit.")
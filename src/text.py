@@ -0,0 +1,212 @@
+"""
+Text Processing - Shared normalizer, tokenizer and vocabulary for post text
+Text is normalized (Unicode NFKC, case, curly quotes, URLs, emoji modifiers)
+and split with precompiled patterns; elongated words are canonicalized per
+distinct token. Tokens map to integer IDs through one shared Vocabulary, and
+encoded arrays are cached by content hash, so a post is tokenized once and
+every downstream stage reuses its ID array.
+"""
+import functools
+import hashlib
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+URL_TOKEN = '<url>'
+
+# Emoji and pictographs; each one becomes its own token
+EMOJI = (
+    '\U0001F300-\U0001F5FF\U0001F600-\U0001F64F\U0001F680-\U0001F6FF'
+    '\U0001F900-\U0001F9FF\U0001FA70-\U0001FAFF\u2600-\u27BF'
+)
+
+URL_RE = re.compile(r'(?:https?://|www\.)\S+')
+MODIFIER_RE = re.compile('[\ufe0e\ufe0f\u200d\U0001F3FB-\U0001F3FF]')  # Variation selectors, ZWJ, skin tones
+ELONGATED_RE = re.compile(r'([^\W\d_])\1\1+')   # "soooo" -> "soo"
+TOKEN_RE = re.compile(
+    r"\w+(?:['.,]\w+)*"      # Words, contractions ("don't") and numbers ("10,000")
+    r"|<url>"
+    rf"|[{EMOJI}]"
+)
+
+QUOTES = (('\u2018', "'"), ('\u2019', "'"), ('\u201c', '"'), ('\u201d', '"'))
+
+DEFAULT_CACHE_SIZE = 100_000
+
+
+def normalize(text):
+    """
+    Canonical form of a piece of text
+    Elongated words are canonicalized per token (see canonical_token), which
+    costs one regex call per distinct token instead of a scan of every character.
+    Args:
+        text: Raw post or catalog text
+    Returns:
+        Lowercased NFKC text with URLs replaced by <url> and emoji modifiers stripped
+    """
+    ascii_only = text.isascii()
+    if not ascii_only:
+        text = unicodedata.normalize('NFKC', text)
+        for curly, straight in QUOTES:
+            text = text.replace(curly, straight)
+        text = MODIFIER_RE.sub('', text)
+    text = text.lower()
+    if '://' in text or 'www.' in text:
+        text = URL_RE.sub(f' {URL_TOKEN} ', text)
+    return text
+
+
+@functools.lru_cache(maxsize=65536)
+def canonical_token(token):
+    """Collapse letter runs of three or more to two ("yesss" -> "yess")"""
+    return ELONGATED_RE.sub(r'\1\1', token)
+
+
+def tokenize(text):
+    """Normalize then split into canonical token strings"""
+    return [canonical_token(token) for token in TOKEN_RE.findall(normalize(text))]
+
+
+def content_hash(text):
+    """Cache key for a text (16-byte BLAKE2b digest of its UTF-8 bytes)"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+class Vocabulary:
+    """
+    Append-only token <-> integer ID mapping
+    IDs are dense and never reassigned, so arrays encoded earlier stay valid
+    as the vocabulary grows. Surface forms ("sooo", "soo") are remembered
+    alongside canonical tokens so each spelling is canonicalized only once.
+    Safe to share across sessions.
+    """
+
+    def __init__(self, tokens=()):
+        self.ids = {}          # Canonical token -> ID
+        self.tokens = []       # ID -> canonical token
+        self.surface = {}      # Surface form -> ID
+        self._lock = threading.Lock()
+        self.extend(tokens)
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def __contains__(self, token):
+        return token in self.ids
+
+    def extend(self, surface_tokens):
+        """Register unseen surface forms, adding their canonical tokens as needed"""
+        with self._lock:
+            for surface in surface_tokens:
+                if surface in self.surface:
+                    continue
+                token = canonical_token(surface)
+                if token not in self.ids:
+                    self.ids[token] = len(self.tokens)
+                    self.tokens.append(token)
+                self.surface[surface] = self.ids[token]
+
+    def encode(self, surface_tokens):
+        """
+        ID array for a list of surface tokens, adding unseen ones
+        Returns:
+            np.int32 array
+        """
+        try:
+            return np.fromiter(map(self.surface.__getitem__, surface_tokens), dtype=np.int32, count=len(surface_tokens))
+        except KeyError:
+            self.extend(surface_tokens)
+            return np.fromiter(map(self.surface.__getitem__, surface_tokens), dtype=np.int32, count=len(surface_tokens))
+
+    def decode(self, ids):
+        return [self.tokens[i] for i in ids]
+
+
+class TokenizedCorpus:
+    """
+    Ragged batch of encoded texts stored as one flat ID array plus offsets
+    Text i's IDs are ids[offsets[i]:offsets[i + 1]]. The flat layout is what
+    downstream stages (counting, vectorizing, shared memory) consume directly.
+    """
+    __slots__ = ('ids', 'offsets')
+
+    def __init__(self, ids, offsets):
+        self.ids = ids
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.ids[self.offsets[i]:self.offsets[i + 1]]
+
+    def lengths(self):
+        """Tokens per text"""
+        return np.diff(self.offsets)
+
+    def document_ids(self):
+        """Index of the text each token in `ids` belongs to"""
+        return np.repeat(np.arange(len(self), dtype=np.int32), self.lengths())
+
+
+class Tokenizer:
+    """
+    Normalize, tokenize and encode text with a content-hash cache
+    Cached arrays are read-only and shared; a repeated text costs one hash
+    and one dict lookup.
+    """
+
+    def __init__(self, vocabulary=None, cache_size=DEFAULT_CACHE_SIZE):
+        self.vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key):
+        with self._lock:
+            ids = self._cache.get(key)
+            if ids is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+            return ids
+
+    def _store(self, key, ids):
+        ids.flags.writeable = False
+        with self._lock:
+            self._cache[key] = ids
+            self.misses += 1
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return ids
+
+    def encode(self, text):
+        """
+        Token IDs for one text
+        Returns:
+            Read-only np.int32 array
+        """
+        key = content_hash(text)
+        ids = self._lookup(key)
+        if ids is None:
+            ids = self._store(key, self.vocabulary.encode(TOKEN_RE.findall(normalize(text))))
+        return ids
+
+    def encode_batch(self, texts):
+        """
+        Token IDs for many texts
+        Returns:
+            TokenizedCorpus aligned with `texts`
+        """
+        encoded = [self.encode(text) for text in texts]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(ids) for ids in encoded], out=offsets[1:])
+        ids = np.concatenate(encoded) if encoded else np.empty(0, dtype=np.int32)
+        return TokenizedCorpus(ids, offsets)
+
+    def cache_info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._cache), 'vocabulary': len(self.vocabulary)}
@@ -0,0 +1,209 @@
+"""
+Warm-up - Pay a process's first-request costs before it takes traffic
+Imports the heavy modules, loads and validates the current datasets, builds
+every shared aggregate the tabs and the API read and, for the dashboard,
+primes the query cache with the Trends tab's default view and builds the
+common figures once (Plotly loads its validators lazily, on the first
+figure of each kind).
+
+Readiness reports "ready" only after every step has finished; a load
+balancer polling ReadinessHandler can hold traffic until then. Aggregates
+live in process-wide st.cache_resource caches, so warming them from a
+background thread (given a cache context, see datasets.attach_cache_context)
+serves every later session.
+"""
+import importlib
+import logging
+import threading
+import time
+import tornado.web
+
+# Imported up front so the first request doesn't pay for them
+MODULES = (
+    'numpy',
+    'pandas',
+    'pyarrow.parquet',
+    'datasets',
+)
+
+# Only the dashboard needs these
+UI_MODULES = (
+    'plotly.graph_objects',
+    'plotly.io',
+    'components',
+    'tabs.tab1_trends',
+    'tabs.tab2_attraction',
+    'tabs.tab3_skills',
+)
+
+
+class Readiness:
+    """Warm-up progress of this process (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.status = 'starting'    # starting -> warming -> ready | failed
+        self.steps = {}             # Finished step -> seconds
+        self.error = None
+        self.started = time.time()
+        self.finished = None
+
+    @property
+    def ready(self):
+        return self.status == 'ready'
+
+    def begin(self):
+        with self._lock:
+            self.status = 'warming'
+
+    def step_done(self, step, seconds):
+        with self._lock:
+            self.steps[step] = seconds
+
+    def finish(self, error=None):
+        """Mark warm-up complete, or failed with `error`"""
+        with self._lock:
+            self.status = 'ready' if error is None else 'failed'
+            self.error = error
+            self.finished = time.time()
+
+    def report(self):
+        """JSON-ready status for the readiness endpoint"""
+        with self._lock:
+            return {
+                'status': self.status,
+                'steps': {step: round(seconds, 3) for step, seconds in self.steps.items()},
+                'error': self.error,
+                'uptime_s': round(time.time() - self.started, 1),
+                'warmup_s': round(self.finished - self.started, 3) if self.finished else None,
+            }
+
+
+def _import_modules(names):
+    for name in names:
+        importlib.import_module(name)
+
+
+def _load_datasets():
+    import datasets
+    for name in datasets.DATASET_PATHS:
+        datasets.load_dataset(name)
+    for name in ('attraction_research', 'social_skills'):
+        datasets.load_catalog(name)
+    datasets.load_trends()
+    datasets.load_tokenizer()
+    datasets.load_tip_rankers()
+
+
+def _build_aggregates():
+    import datasets
+    from rollups import WINDOWS
+    topics = tuple(datasets.load_trends().topics)
+    datasets.load_activity(topics)
+    datasets.load_keywords(topics)
+    datasets.load_peak_times(topics)
+    datasets.load_sparklines(topics)
+    datasets.load_spike_detector(topics)
+    datasets.load_related(topics)
+    datasets.load_participants(topics)
+    datasets.load_intervals(topics)
+    datasets.load_post_index(topics)
+    for window in WINDOWS:
+        datasets.load_cube(topics, window)
+
+
+def _prime_views():
+    """What the Trends tab asks for before any filter is touched"""
+    import datasets
+    from tabs.tab1_trends import DEFAULT_WINDOW, TOP_TOPICS
+    datasets.query_trends_view(DEFAULT_WINDOW, {}, TOP_TOPICS)
+
+
+def _build_figures():
+    import plotly.io
+    import datasets
+    from components import activity_heatmap, gender_comparison_chart, trait_radar_chart
+    trends = datasets.load_trends()
+    topics = tuple(trends.topics)
+    sample = trends.head(8)
+    interest = datasets.load_intervals(topics).interest
+    research = datasets.load_catalog('attraction_research')
+    figures = (
+        gender_comparison_chart(
+            sample.topics, sample['women_interest'].tolist(), sample['men_interest'].tolist(), "Warm-up",
+            women_intervals=tuple(bound[:8] for bound in interest['women']),
+            men_intervals=tuple(bound[:8] for bound in interest['men'])
+        ),
+        trait_radar_chart(
+            [item.trait for item in research['behavioral_factors']],
+            [item.attractiveness_score for item in research['behavioral_factors']],
+            "Warm-up"
+        ),
+        activity_heatmap(datasets.load_activity(topics).total, "Warm-up"),
+    )
+    for figure in figures:
+        plotly.io.to_json(figure)     # What st.plotly_chart does with a figure
+
+
+def warm_up(readiness, ui=True):
+    """
+    Run every warm-up step, recording progress in `readiness`
+    Args:
+        readiness: Readiness to update
+        ui: Also import the tabs, prime their default views and build the
+            common figures (False for the JSON API)
+    Raises:
+        Whatever a step raised; readiness is then 'failed'
+    """
+    steps = [
+        ('modules', lambda: _import_modules(MODULES)),
+        ('datasets', _load_datasets),
+        ('aggregates', _build_aggregates),
+    ]
+    if ui:
+        steps += [
+            ('ui_modules', lambda: _import_modules(UI_MODULES)),
+            ('views', _prime_views),
+            ('figures', _build_figures),
+        ]
+    readiness.begin()
+    try:
+        for name, step in steps:
+            start = time.perf_counter()
+            step()
+            readiness.step_done(name, time.perf_counter() - start)
+    except Exception as e:
+        readiness.finish(error=f"{type(e).__name__}: {e}")
+        raise
+    readiness.finish()
+
+
+def start_warm_up(readiness, ui=True):
+    """Warm up on a daemon thread; returns the thread"""
+    def run():
+        try:
+            from datasets import attach_cache_context
+            attach_cache_context()
+            warm_up(readiness, ui)
+        except Exception:
+            # Also recorded in readiness, so the endpoint keeps answering 503 with the error
+            logging.getLogger(__name__).exception("Warm-up failed")
+    thread = threading.Thread(target=run, name='warm-up', daemon=True)
+    thread.start()
+    return thread
+
+
+class ReadinessHandler(tornado.web.RequestHandler):
+    """200 once the process is warm, 503 (with progress) until then"""
+
+    def initialize(self, readiness):
+        self.readiness = readiness
+
+    def get(self):
+        self.set_header('Cache-Control', 'no-store')
+        self.set_status(200 if self.readiness.ready else 503)
+        self.finish(self.readiness.report())
+
+    def head(self):
+        self.set_header('Cache-Control', 'no-store')
+        self.set_status(200 if self.readiness.ready else 503)
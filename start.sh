@@ -38,10 +38,11 @@ fi
 echo ""
 echo "🎯 Launching dashboard..."
 echo "📍 Access URL: http://localhost:8501"
+echo "🩺 Readiness: http://localhost:8503/ready"
 echo "🔑 Access Code: vyudu2024"
 echo ""
 echo "Press Ctrl+C to stop the server"
 echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
 echo ""
 
-streamlit run src/app.py
+python scripts/serve.py
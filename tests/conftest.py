@@ -0,0 +1,8 @@
+"""
+Test setup - Put src/ on the import path, as the app and scripts do
+"""
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'src'))
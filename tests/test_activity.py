@@ -0,0 +1,14 @@
+import numpy as np
+from activity import HOURS_PER_WEEK, peak_day_part
+from cube import DIMENSIONS, NO_POSTS, peak_time_band
+
+
+def test_no_posts_has_no_peak_day_part():
+    assert peak_day_part(np.zeros(HOURS_PER_WEEK)) is None
+    assert peak_time_band([None]).tolist() == [DIMENSIONS['peak_time'].index(NO_POSTS)]
+
+
+def test_peak_day_part_of_evening_posts():
+    counts = np.zeros(HOURS_PER_WEEK)
+    counts[20::24] = 5      # 8 PM every day
+    assert peak_day_part(counts) == 'Evening'
@@ -0,0 +1,59 @@
+import numpy as np
+import batch
+from batch import fold_posts
+from scoring import NEGATIVE_WORDS, POSITIVE_WORDS, TextScorer, score_chunk
+from text import Tokenizer
+
+KEYWORDS = ('Communication', 'Direct communication', 'Humor')
+
+
+def make_posts(count, seed=3):
+    rng = np.random.default_rng(seed)
+    topics = rng.integers(0, 4, count)
+    texts = []
+    for i in range(count):
+        words = list(rng.choice(POSITIVE_WORDS, rng.integers(0, 4))) + list(rng.choice(NEGATIVE_WORDS, rng.integers(0, 4)))
+        keyword = KEYWORDS[i % 4] if i % 4 < 3 else ""
+        texts.append(f"post {i}: {' '.join(words)} {keyword}")
+    return (
+        1_700_000_000 + rng.integers(0, 30 * 86400, count),
+        topics,
+        rng.integers(-1, 2, count),
+        texts,
+    )
+
+
+def test_sentiment_and_keywords_from_token_ids():
+    tokenizer = Tokenizer()
+    scorer = TextScorer(tokenizer.vocabulary, KEYWORDS)
+    tokens = tokenizer.encode_batch([
+        "Love it, so helpful - direct communication!",
+        "ugh, awkward and boring... still fun",
+        "direct",
+        "communication about nothing in particular",
+    ])
+    sentiment, mentions = score_chunk(tokens.ids, tokens.offsets, scorer.polarity(), scorer.phrases())
+    assert sentiment.tolist() == [1.0, -0.5, 0.0, 0.0]
+    # "direct" ends post 2 and "communication" starts post 3: not a mention across posts
+    assert mentions.tolist() == [[1, 1, 0], [0, 0, 0], [0, 0, 0], [1, 0, 0]]
+
+
+def test_pool_matches_single_process(monkeypatch):
+    monkeypatch.setattr(batch, 'MIN_POSTS_PER_WORKER', 1)
+    timestamps, topic_codes, segment_codes, texts = make_posts(2_000)
+    topics = [f"topic-{i}" for i in range(4)]
+    tokenizer = Tokenizer()
+    scorer = TextScorer(tokenizer.vocabulary, KEYWORDS)
+    tokens = tokenizer.encode_batch(texts)
+
+    results = [fold_posts(timestamps, topic_codes, segment_codes, None, topics, workers=workers,
+                          tokens=tokens, scorer=scorer)
+               for workers in (1, 3)]
+    (store_a, activity_a, keywords_a), (store_b, activity_b, keywords_b) = results
+    for name, tier in store_a.tiers.items():
+        assert np.array_equal(tier.counts, store_b.tiers[name].counts)
+        assert np.allclose(tier.sentiment, store_b.tiers[name].sentiment)
+    assert np.array_equal(activity_a.counts, activity_b.counts)
+    assert np.array_equal(keywords_a.counts, keywords_b.counts)
+    # Posts i % 4 == 0 and 1 both say "communication"; 1 also says "direct communication"
+    assert keywords_b.counts.sum(axis=0).tolist() == [1_000, 500, 500]
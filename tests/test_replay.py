@@ -0,0 +1,29 @@
+import numpy as np
+from replay import EVENT_DTYPE, HEADER_SIZE, EventLog, EventLogWriter
+
+
+def append_posts(path, timestamps):
+    n = len(timestamps)
+    with EventLogWriter(path) as writer:
+        writer.append(np.asarray(timestamps), ['topic'] * n, ['author'] * n, ['women'] * n, np.full(n, 0.5))
+
+
+def test_torn_trailing_record_is_cut_before_appending(tmp_path):
+    path = str(tmp_path / 'posts.log')
+    append_posts(path, [100, 200])
+    with open(path, 'ab') as f:
+        f.write(b'\x01' * 10)       # A crash part-way through the next record
+    append_posts(path, [300])
+
+    log = EventLog(path)
+    assert log.events['timestamp'].tolist() == [100, 200, 300]
+    assert log.events['sentiment'].tolist() == [0.5, 0.5, 0.5]
+    assert (tmp_path / 'posts.log').stat().st_size == HEADER_SIZE + 3 * EVENT_DTYPE.itemsize
+
+
+def test_torn_header_is_rewritten(tmp_path):
+    path = str(tmp_path / 'posts.log')
+    with open(path, 'wb') as f:
+        f.write(b'SIP')
+    append_posts(path, [100])
+    assert EventLog(path).events['timestamp'].tolist() == [100]
@@ -0,0 +1,25 @@
+import json
+import pytest
+from schema import SchemaError, validate
+
+
+def trends_document(volume, sentiment):
+    return json.loads(f'''{{
+        "trends": [{{"topic": "t", "volume": {volume}, "sentiment": {sentiment}, "velocity": 1.5,
+                     "women_interest": 50, "men_interest": 50, "peak_time": "8-11 PM"}}],
+        "top_keywords": {{"women": [], "men": []}},
+        "engagement_stats": {{"total_discussions": 1, "avg_sentiment": 0.1, "peak_hours": "8-11 PM",
+                              "weekly_growth": 2.0}}
+    }}''')
+
+
+@pytest.mark.parametrize('literal', ['NaN', 'Infinity', '-Infinity'])
+def test_non_finite_numbers_are_schema_errors(literal):
+    # Whole-number field (int() would raise) and a bounded float field
+    for volume, sentiment in ((literal, 0.5), (10, literal)):
+        with pytest.raises(SchemaError, match='expected finite number'):
+            validate('mock_trends', trends_document(volume, sentiment), f'{literal}-{volume}-{sentiment}')
+
+
+def test_valid_document_passes():
+    validate('mock_trends', trends_document(10, 0.5), 'valid')
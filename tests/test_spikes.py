@@ -0,0 +1,29 @@
+import numpy as np
+from spikes import DEFAULT_BUCKET_SECONDS as DAY, SpikeDetector
+
+HOUR = 3600
+
+
+def steady_days(detector, days, per_day=24):
+    """`per_day` posts spread evenly over each of `days` days, for topic 0"""
+    for day in range(days):
+        timestamps = day * DAY + np.arange(per_day) * (DAY // per_day)
+        detector.observe(timestamps, np.zeros(per_day, dtype=np.int64))
+
+
+def test_surge_early_in_a_bucket_is_flagged():
+    detector = SpikeDetector(['topic'])
+    steady_days(detector, 10)
+    # 30 posts in the first two hours of day 10, against ~2 expected by then (24 a day)
+    detector.observe(10 * DAY + np.arange(30) * (2 * HOUR // 30), np.zeros(30, dtype=np.int64))
+    emerging = detector.emerging()
+    assert [topic for topic, *_ in emerging] == ['topic']
+    assert emerging[0][3] < 3      # Expected by now, not a whole day's worth
+
+
+def test_steady_pace_part_way_through_a_bucket_is_not_flagged():
+    detector = SpikeDetector(['topic'])
+    steady_days(detector, 10)
+    detector.observe(10 * DAY + np.arange(12) * HOUR, np.zeros(12, dtype=np.int64))
+    assert detector.emerging() == []
+    assert abs(detector.scores()[0]) < 1
@@ -0,0 +1,16 @@
+from static_assets import minify_css
+
+
+def test_descendant_pseudo_class_keeps_its_space():
+    assert minify_css('.a :hover { color : red; }') == '.a :hover{color:red}'
+
+
+def test_quoted_strings_are_untouched():
+    css = '.a::after { content: "a: b,  c > d /* not a comment */"; } /* comment */'
+    assert minify_css(css) == '.a::after{content:"a: b,  c > d /* not a comment */"}'
+    assert minify_css(".b { font-family: 'My  Font: Bold'; }") == ".b{font-family:'My  Font: Bold'}"
+
+
+def test_declarations_in_at_rules_are_minified():
+    css = '@media (min-width: 600px) {\n  .c p:first-child { margin : 0 ; }\n}'
+    assert minify_css(css) == '@media (min-width: 600px){.c p:first-child{margin:0}}'